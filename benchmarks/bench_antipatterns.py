@@ -0,0 +1,51 @@
+"""
+Anti-pattern linting benchmark: lints the packaged corpus in this process
+and in process pools of increasing size, and reports findings per rule.
+Rules run in one traversal per tree, so linting costs about one parse.
+
+    python benchmarks/bench_antipatterns.py --processes 1 2 4
+"""
+import os
+import json
+import time
+import logging
+import argparse
+
+from sqlflow.antipatterns import lint_corpus
+from sqlflow.replay import load_corpus_queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the anti-pattern linter.")
+    parser.add_argument("--processes", type=int, nargs="*", default=[1, 2, 4], help="Pool sizes to try")
+    parser.add_argument("--chunk-size", type=int, default=32, help="Queries per worker task")
+    parser.add_argument("--logging", action="store_true", help="Keep sqlflow's default DEBUG logging enabled")
+    args = parser.parse_args()
+
+    if not args.logging:
+        logging.disable(logging.CRITICAL)
+    queries = load_corpus_queries()
+
+    start = time.perf_counter()
+    report = lint_corpus(queries, processes=0)
+    baseline = time.perf_counter() - start
+
+    pools = {}
+    for processes in args.processes:
+        start = time.perf_counter()
+        lint_corpus(queries, processes=processes, chunk_size=args.chunk_size)
+        elapsed = time.perf_counter() - start
+        pools[processes] = {"s": round(elapsed, 3), "speedup": round(baseline / elapsed, 2)}
+
+    print(json.dumps({
+        "queries": len(queries),
+        "cpus": os.cpu_count(),
+        "in_process_s": round(baseline, 3),
+        "pools": pools,
+        "findings": len(report.findings),
+        "by_rule": report.by_rule()
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Compressed store benchmark: writes the packaged corpus to a store with a
+trained preset dictionary and to one without, then reports compression
+ratios, dictionary training time and decode throughput (sequential and
+random access) against slicing statements from the mmap'd plain files.
+
+    python benchmarks/bench_compressed.py --passes 20
+"""
+import json
+import time
+import random
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+
+from sqlflow.compressed import CompressedStore, build_store, train_dictionary
+from sqlflow.corpus import packaged_corpus
+
+
+def decode_rate(store, ids, passes):
+    start = time.perf_counter()
+    size = 0
+    for _ in range(passes):
+        for statement_id in ids:
+            size += len(store[statement_id])
+    elapsed = time.perf_counter() - start
+    return {"statements_per_s": round(passes * len(ids) / elapsed), "mb_per_s": round(size / elapsed / 2 ** 20, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dictionary-compressed statement store.")
+    parser.add_argument("--passes", type=int, default=20, help="Decode passes over the corpus")
+    parser.add_argument("--dictionary-size", type=int, default=32768, help="Preset dictionary size in bytes")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--logging", action="store_true", help="Keep sqlflow's default DEBUG logging enabled")
+    args = parser.parse_args()
+
+    if not args.logging:
+        logging.disable(logging.CRITICAL)
+
+    result = {}
+    with packaged_corpus() as corpus, tempfile.TemporaryDirectory() as directory:
+        statements = list(corpus)
+        ids = list(range(len(statements)))
+        shuffled = random.Random(args.seed).sample(ids, len(ids))
+
+        start = time.perf_counter()
+        dictionary = train_dictionary(statements[::max(1, len(statements) // 2000)], args.dictionary_size)
+        result["train_s"] = round(time.perf_counter() - start, 3)
+
+        result["plain_files"] = {"random": decode_rate(corpus, shuffled, args.passes)}
+        for name, preset in (("no_dictionary", b""), ("dictionary", dictionary)):
+            path = Path(directory) / f"{name}.sqlz"
+            start = time.perf_counter()
+            build_store(statements, path, dictionary=preset)
+            write_s = time.perf_counter() - start
+            with CompressedStore(path) as store:
+                assert store[shuffled[0]] == statements[shuffled[0]]
+                result[name] = dict(
+                    store.stats(),
+                    write_s=round(write_s, 3),
+                    sequential=decode_rate(store, ids, args.passes),
+                    random=decode_rate(store, shuffled, args.passes)
+                )
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
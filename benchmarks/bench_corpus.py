@@ -0,0 +1,55 @@
+"""
+Statement random access benchmark: fetching statement (file, i) by reading and
+splitting the whole file with sqlparse versus the offset index + mmap store.
+
+    python benchmarks/bench_corpus.py --lookups 200
+"""
+import json
+import time
+import random
+import logging
+import argparse
+
+import sqlparse
+
+from sqlflow.corpus import StatementIndex, packaged_corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark indexed statement lookups.")
+    parser.add_argument("--lookups", type=int, default=200, help="Random statements to fetch")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the lookup sequence")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    with packaged_corpus() as store:
+        index = store.index
+        rng = random.Random(args.seed)
+        targets = [index.locate(rng.randrange(len(index))) for _ in range(args.lookups)]
+
+        start = time.perf_counter()
+        StatementIndex.build(index.root)
+        build_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for path, i in targets:
+            [q for q in sqlparse.split((index.root / path).read_text()) if q.strip()][i]
+        split_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for path, i in targets:
+            store.get(path, i)
+        indexed_s = time.perf_counter() - start
+
+    print(json.dumps({
+        "statements": len(index),
+        "files": len(index.files),
+        "index_build_ms": round(build_s * 1000, 2),
+        "split_lookup_us": round(split_s / args.lookups * 1e6, 1),
+        "indexed_lookup_us": round(indexed_s / args.lookups * 1e6, 1),
+        "speedup": round(split_s / indexed_s, 1)
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+dbt ingest benchmark: writes a synthetic dbt project whose models are the
+packaged corpus queries, then times a full parse, a no-op re-run and a
+re-run after editing a few models. Unchanged models are reused from the
+saved state by compiled-SQL checksum.
+
+    python benchmarks/bench_dbt.py --models 2000 --changed 5
+"""
+import json
+import time
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+
+from sqlflow.dbt import ingest_project
+from sqlflow.replay import load_corpus_queries
+
+
+def write_project(root, queries, n_models):
+    nodes = {}
+    for i in range(n_models):
+        path = f"models/model_{i:05d}.sql"
+        compiled = root / "target" / "compiled" / "bench" / path
+        compiled.parent.mkdir(parents=True, exist_ok=True)
+        # the suffix keeps each model's SQL (and checksum) distinct
+        compiled.write_text(f"{queries[i % len(queries)]}\n-- model {i}\n")
+        nodes[f"model.bench.model_{i:05d}"] = {
+            "resource_type": "model", "name": f"model_{i:05d}", "package_name": "bench",
+            "original_file_path": path, "depends_on": {"nodes": [f"model.bench.model_{i // 2:05d}"] if i else []}
+        }
+    (root / "target" / "manifest.json").write_text(json.dumps({"nodes": nodes}))
+
+
+def timed(project, **options):
+    start = time.perf_counter()
+    ingest = ingest_project(project, **options)
+    return {"s": round(time.perf_counter() - start, 3), "parsed": ingest.stats["parsed"], "reused": ingest.stats["reused"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark incremental dbt ingest.")
+    parser.add_argument("--models", type=int, default=2000, help="Models in the synthetic project")
+    parser.add_argument("--changed", type=int, default=5, help="Models edited before the incremental run")
+    parser.add_argument("--logging", action="store_true", help="Keep sqlflow's default DEBUG logging enabled")
+    args = parser.parse_args()
+
+    if not args.logging:
+        logging.disable(logging.CRITICAL)
+    queries = load_corpus_queries()
+
+    with tempfile.TemporaryDirectory() as directory:
+        project = Path(directory)
+        write_project(project, queries, args.models)
+        full = timed(project, full_refresh=True)
+        noop = timed(project)
+        for i in range(args.changed):
+            compiled = project / "target" / "compiled" / "bench" / "models" / f"model_{i * 7:05d}.sql"
+            compiled.write_text(compiled.read_text() + "-- edited\n")
+        incremental = timed(project)
+        state_mb = (project / "target" / "sqlflow_state.json").stat().st_size / 2 ** 20
+
+    print(json.dumps({
+        "models": args.models,
+        "full": full,
+        "no_change": noop,
+        "incremental": incremental,
+        "speedup": round(full["s"] / incremental["s"], 1),
+        "state_mb": round(state_mb, 2)
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Event parsing benchmark: tree-building time over the packaged corpus for
+parse_statement vs EventTree (statements tokenized once up front), and the
+peak memory of the handler phase as a generated query grows.
+
+    python benchmarks/bench_events.py --repeat 3
+"""
+import json
+import time
+import logging
+import argparse
+import tracemalloc
+
+import sqlparse
+
+from sqlflow.context import ParsingContext
+from sqlflow.events import EventTree
+from sqlflow.parser import is_empty_statement, parse_statement
+from sqlflow.replay import load_corpus_queries
+from sqlflow.synthetic import TemplateQueryGenerator
+
+
+def ignore(event):
+    pass
+
+
+def parse_tree(statement):
+    return parse_statement(statement)
+
+
+def parse_events(statement):
+    tree = EventTree(statement, on_node=ignore)
+    tree.parse_tokens(statement.tokens, tree.root, ParsingContext(collect_triples=False))
+
+
+def best_time(parse, statements, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for statement in statements:
+            parse(statement)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(parse, statement):
+    tracemalloc.start()
+    result = parse(statement)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SAX-style event parsing against tree building.")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per measurement (best is reported)")
+    parser.add_argument("--logging", action="store_true", help="Keep sqlflow's default DEBUG logging enabled")
+    args = parser.parse_args()
+
+    if not args.logging:
+        logging.disable(logging.CRITICAL)
+    statements = [s for sql in load_corpus_queries() for s in sqlparse.parse(sql) if not is_empty_statement(s)]
+    tree_s = best_time(parse_tree, statements, args.repeat)
+    events_s = best_time(parse_events, statements, args.repeat)
+
+    generator, memory = TemplateQueryGenerator(seed=0), []
+    for width in (10, 40, 160, 640):
+        statement = sqlparse.parse(generator.generate(0, joins=4, ctes=2, depth=2, width=width))[0]
+        memory.append({
+            "width": width,
+            "tree_peak_kb": round(peak_memory(parse_tree, statement) / 1024, 1),
+            "events_peak_kb": round(peak_memory(parse_events, statement) / 1024, 1)
+        })
+
+    print(json.dumps({
+        "statements": len(statements),
+        "tree_s": round(tree_s, 3),
+        "events_s": round(events_s, 3),
+        "speedup": round(tree_s / events_s, 2),
+        "peak_memory": memory
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Literal-heavy / very wide statement benchmark: parse time, node count and
+triple count for the default parser versus `parse_sql(..., fast=True)`.
+The default parser cannot tokenize statements past sqlparse's grouping
+limit at all; those are reported as errors.
+
+    python benchmarks/bench_fastpath.py --sizes 100 1000 10000
+"""
+import json
+import time
+import logging
+import argparse
+
+from sqlflow.parser import parse_sql
+
+
+def make_statements(size):
+    return {
+        "in_list": "SELECT a FROM t WHERE id IN (" + ", ".join(str(i) for i in range(size)) + ")",
+        "values_rows": "INSERT INTO t (a, b) VALUES " + ", ".join(f"({i}, 'v{i}')" for i in range(size)),
+        "wide_select": "SELECT " + ", ".join(f"t.c{i}" for i in range(size)) + " FROM t"
+    }
+
+
+def count_nodes(node):
+    return 1 + sum(count_nodes(child) for child in node.children)
+
+
+def bench(sql, fast, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            parsed = parse_sql(sql, fast=fast)
+        except Exception as e:
+            return {"error": type(e).__name__}
+        best = min(best, time.perf_counter() - start)
+    return {
+        "ms": round(best * 1000, 2),
+        "nodes": sum(count_nodes(tree.root) for tree, _ in parsed),
+        "triples": sum(len(context.triples) for _, context in parsed)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the literal-list / wide-select fast path.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000], help="List lengths to test")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per measurement (best is reported)")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    results = {}
+    for size in args.sizes:
+        for name, sql in make_statements(size).items():
+            results[f"{name}[{size}]"] = {
+                "default": bench(sql, False, args.repeat),
+                "fast": bench(sql, True, args.repeat)
+            }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Lazy parsing benchmark: a shallow consumer (the outermost query's tables)
+and a full walk over the packaged corpus, eager vs `lazy=True`. Statements
+are tokenized once up front so the numbers isolate tree building.
+
+    python benchmarks/bench_lazy.py --repeat 5
+"""
+import gc
+import json
+import time
+import logging
+import argparse
+
+import sqlparse
+
+from sqlflow.context import ParsingContext
+from sqlflow.nodes import SQLNode
+from sqlflow.parser import is_empty_statement, parse_statement
+from sqlflow.replay import load_corpus_queries
+
+
+def top_level_tables(tree, context):
+    return [node.name for node in tree.root.children if node.type == "SQLTable"]
+
+
+def full_walk(tree, context):
+    tree.expand()
+    return len(context.triples)
+
+
+def live_nodes():
+    gc.collect()
+    return sum(isinstance(obj, SQLNode) for obj in gc.get_objects())
+
+
+def bench(statements, consumer, lazy, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [parse_statement(statement, ParsingContext(lazy=lazy)) for statement in statements]
+        for tree, context in results:
+            consumer(tree, context)
+        best = min(best, time.perf_counter() - start)
+        nodes = live_nodes()
+        del results
+    return best, nodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark lazy subtree expansion.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per configuration (best is reported)")
+    parser.add_argument("--logging", action="store_true", help="Keep sqlflow's default DEBUG logging enabled")
+    args = parser.parse_args()
+
+    if not args.logging:
+        logging.disable(logging.CRITICAL)
+    statements = [s for sql in load_corpus_queries() for s in sqlparse.parse(sql) if not is_empty_statement(s)]
+
+    baseline = live_nodes()
+    result = {"statements": len(statements)}
+    for name, consumer in (("top_level_tables", top_level_tables), ("full_walk", full_walk)):
+        eager_s, eager_nodes = bench(statements, consumer, False, args.repeat)
+        lazy_s, lazy_nodes = bench(statements, consumer, True, args.repeat)
+        result[name] = {
+            "eager_s": round(eager_s, 3),
+            "lazy_s": round(lazy_s, 3),
+            "speedup": round(eager_s / lazy_s, 2),
+            "eager_nodes": eager_nodes - baseline,
+            "lazy_nodes": lazy_nodes - baseline
+        }
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
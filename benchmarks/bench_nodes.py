@@ -0,0 +1,108 @@
+"""
+Node construction benchmark: per-node construction cost, per-node memory and
+end-to-end parse time over the packaged healthcare corpus.
+
+    python benchmarks/bench_nodes.py --repeat 5
+"""
+import gc
+import json
+import time
+import logging
+import argparse
+import tracemalloc
+from pathlib import Path
+
+import sqlparse
+
+from sqlflow import nodes as n
+from sqlflow.parser import parse_sql
+
+
+CORPUS_DIR = Path(__file__).parent.parent / "sqlflow" / "data" / "healthcare" / "queries"
+
+
+def load_corpus():
+    return [path.read_text() for path in sorted(CORPUS_DIR.glob("*.sql"))]
+
+
+def collect_node_tokens(corpus):
+    """(node class, token) pairs exactly as a full parse of the corpus creates them"""
+    pairs = []
+    for sql in corpus:
+        for tree, _ in parse_sql(sql):
+            stack = [tree.root]
+            while stack:
+                node = stack.pop()
+                pairs.append((type(node), node.token))
+                stack.extend(node.children)
+    return pairs
+
+
+def bench_construction(pairs, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for node_class, token in pairs:
+            node_class(token)
+        best = min(best, time.perf_counter() - start)
+    return best / len(pairs) * 1e9
+
+
+def bench_triples(pairs, repeat):
+    """Construction plus the uri lookups each add_child performs to emit its triple"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for node_class, token in pairs:
+            node_class(token).uri
+        best = min(best, time.perf_counter() - start)
+    return best / len(pairs) * 1e9
+
+
+def bench_memory(pairs):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    retained = [node_class(token) for node_class, token in pairs]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return allocated / len(retained)
+
+
+def bench_parse(corpus, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for sql in corpus:
+            parse_sql(sql)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SQLNode construction.")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions per measurement (best is reported)")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    corpus = load_corpus()
+    pairs = collect_node_tokens(corpus)
+    by_type = {}
+    for node_class, _ in pairs:
+        by_type[node_class.__name__] = by_type.get(node_class.__name__, 0) + 1
+
+    results = {
+        "nodes": len(pairs),
+        "nodes_by_type": by_type,
+        "construct_ns_per_node": round(bench_construction(pairs, args.repeat), 1),
+        "construct_with_uri_ns_per_node": round(bench_triples(pairs, args.repeat), 1),
+        "bytes_per_node": round(bench_memory(pairs), 1),
+        "corpus_parse_s": round(bench_parse(corpus, args.repeat), 3),
+        "statements": sum(len(sqlparse.split(sql)) for sql in corpus)
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
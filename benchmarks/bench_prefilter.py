@@ -0,0 +1,72 @@
+"""
+Prefilter benchmark: for each table in schema.sql, finds the corpus queries
+referencing it by (a) fully parsing every query and (b) prefiltering
+lexically and parsing only the candidates. Reports candidates, the
+false-positive rate, misses (must be 0) and the end-to-end speedup, both
+including the one-off index build and with a prebuilt index.
+
+    python benchmarks/bench_prefilter.py --tables visits labs
+"""
+import json
+import time
+import logging
+import argparse
+
+from sqlflow.prefilter import PrefilterIndex, confirm, find_references
+from sqlflow.replay import load_corpus_queries
+from sqlflow.schema import load_schema
+
+
+def full_scan(queries, table):
+    start = time.perf_counter()
+    matches = [query_id for query_id, sql in enumerate(queries) if confirm(sql, tables=[table])]
+    return matches, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the lexical prefilter against full parsing.")
+    parser.add_argument("--tables", nargs="*", default=None, help="Tables to look up (default: every table in schema.sql)")
+    parser.add_argument("--logging", action="store_true", help="Keep sqlflow's default DEBUG logging enabled")
+    args = parser.parse_args()
+
+    if not args.logging:
+        logging.disable(logging.CRITICAL)
+    queries = load_corpus_queries()
+    start = time.perf_counter()
+    index = PrefilterIndex.build(queries)
+    index_s = time.perf_counter() - start
+
+    results, totals = {}, {"full_s": 0.0, "prefiltered_s": 0.0, "candidates": 0, "matches": 0}
+    for table in args.tables or sorted(load_schema()):
+        truth, full_s = full_scan(queries, table)
+        matches, stats = find_references(queries, tables=[table], index=index)
+        prefiltered_s = stats["filter_s"] + stats["confirm_s"]
+        results[table] = {
+            "candidates": stats["candidates"],
+            "matches": stats["matches"],
+            "missed": len(set(truth) - set(matches)),
+            "false_positive_rate": round(stats["false_positive_rate"], 3),
+            "full_s": round(full_s, 3),
+            "prefiltered_s": round(prefiltered_s, 3),
+            "speedup": round(full_s / prefiltered_s, 1)
+        }
+        totals["full_s"] += full_s
+        totals["prefiltered_s"] += prefiltered_s
+        totals["candidates"] += stats["candidates"]
+        totals["matches"] += stats["matches"]
+
+    print(json.dumps({
+        "queries": len(queries),
+        "index_s": round(index_s, 3),
+        "index_bytes": index.hashes.itemsize * len(index.hashes) + index.offsets.itemsize * len(index.offsets),
+        "tables": results,
+        "overall": {
+            "false_positive_rate": round(1 - totals["matches"] / totals["candidates"], 3) if totals["candidates"] else 0.0,
+            "speedup_prebuilt_index": round(totals["full_s"] / totals["prefiltered_s"], 1),
+            "speedup_with_index_build": round(totals["full_s"] / (totals["prefiltered_s"] + index_s), 1)
+        }
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Extraction profile benchmark: tree-building time, nodes and triples over the
+packaged corpus per profile. Statements are tokenized once up front so the
+numbers isolate handler work; end-to-end time also includes sqlparse.
+
+    python benchmarks/bench_profiles.py --repeat 3
+"""
+import json
+import time
+import logging
+import argparse
+
+import sqlparse
+
+from sqlflow.context import ParsingContext
+from sqlflow.parser import is_empty_statement, parse_sql, parse_statement
+from sqlflow.profiles import PROFILES, get_profile
+from sqlflow.replay import load_corpus_queries
+
+
+def count_nodes(node):
+    return 1 + sum(count_nodes(child) for child in node.children)
+
+
+def bench_tree(statements, profile, repeat):
+    best, parsed = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parsed = [parse_statement(statement, ParsingContext(profile=profile)) for statement in statements]
+        best = min(best, time.perf_counter() - start)
+    return best, parsed
+
+
+def bench_end_to_end(queries, name):
+    start = time.perf_counter()
+    for sql in queries:
+        parse_sql(sql, profile=name)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extraction profiles.")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per measurement (best is reported)")
+    parser.add_argument("--logging", action="store_true", help="Keep sqlflow's default DEBUG logging enabled")
+    args = parser.parse_args()
+
+    if not args.logging:
+        logging.disable(logging.CRITICAL)
+    queries = load_corpus_queries()
+    statements = [s for sql in queries for s in sqlparse.parse(sql) if not is_empty_statement(s)]
+
+    results, baseline = {}, None
+    for name in PROFILES:
+        elapsed, parsed = bench_tree(statements, get_profile(name), args.repeat)
+        baseline = baseline or elapsed
+        results[name] = {
+            "tree_s": round(elapsed, 3),
+            "tree_speedup": round(baseline / elapsed, 2),
+            "end_to_end_s": round(bench_end_to_end(queries, name), 3),
+            "nodes": sum(count_nodes(tree.root) for tree, _ in parsed),
+            "triples": sum(len(context.triples) for _, context in parsed)
+        }
+    print(json.dumps({"statements": len(statements), "profiles": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
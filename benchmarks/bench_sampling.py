@@ -0,0 +1,66 @@
+"""
+Sampled analysis benchmark: parses the whole packaged corpus once for the
+exact metric values, then runs adaptive sampling at several precisions and
+strata over many seeds, reporting statements parsed, time, and how often
+the confidence intervals covered the exact values.
+
+    python benchmarks/bench_sampling.py --precisions 0.1 0.05 --seeds 10
+"""
+import json
+import time
+import logging
+import argparse
+
+from sqlflow.corpus import packaged_corpus
+from sqlflow.parser import parse_sql
+from sqlflow.sampling import METRICS, sample_analysis
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark adaptive sampled corpus analysis.")
+    parser.add_argument("--precisions", type=float, nargs="*", default=[0.1, 0.05], help="Requested precisions")
+    parser.add_argument("--strata", type=str, nargs="*", default=["none", "size", "file"], help="Strata to compare")
+    parser.add_argument("--seeds", type=int, default=10, help="Runs per configuration")
+    parser.add_argument("--logging", action="store_true", help="Keep sqlflow's default DEBUG logging enabled")
+    args = parser.parse_args()
+
+    if not args.logging:
+        logging.disable(logging.CRITICAL)
+
+    with packaged_corpus() as store:
+        start = time.perf_counter()
+        totals = dict.fromkeys((metric.name for metric in METRICS), 0)
+        for sql in store:
+            trees = [tree for tree, _ in parse_sql(sql)]
+            for metric in METRICS:
+                totals[metric.name] += metric(trees)
+        full_s = time.perf_counter() - start
+        exact = {name: total / len(store) for name, total in totals.items()}
+
+        runs = {}
+        for precision in args.precisions:
+            for strata in args.strata:
+                parsed, elapsed, covered = 0, 0.0, dict.fromkeys(exact, 0)
+                for seed in range(args.seeds):
+                    report = sample_analysis(store, strata=None if strata == "none" else strata, precision=precision, seed=seed)
+                    parsed += report.parsed
+                    elapsed += report.elapsed
+                    for name, value in exact.items():
+                        covered[name] += report[name].low <= value <= report[name].high
+                runs[f"{precision}/{strata}"] = {
+                    "mean_parsed": round(parsed / args.seeds),
+                    "mean_s": round(elapsed / args.seeds, 3),
+                    "speedup": round(full_s * args.seeds / elapsed, 1),
+                    "coverage": {name: count / args.seeds for name, count in covered.items()}
+                }
+
+    print(json.dumps({
+        "statements": len(store),
+        "full_s": round(full_s, 3),
+        "exact": {name: round(value, 4) for name, value in exact.items()},
+        "sampled": runs
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
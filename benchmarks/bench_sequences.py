@@ -0,0 +1,65 @@
+"""
+Sequence shard benchmark: exports the packaged corpus as pre-order
+(type, depth, name) sequences, then compares sampling random training
+batches from the memory-mapped shards with re-parsing the sampled SQL.
+
+    python benchmarks/bench_sequences.py --shard-size 4096 --batch 64
+"""
+import json
+import time
+import random
+import logging
+import argparse
+import tempfile
+
+from sqlflow.parser import parse_sql
+from sqlflow.replay import load_corpus_queries
+from sqlflow.vectorize import SequenceEncoder, SequenceShards, export_sequences
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memory-mapped sequence shards.")
+    parser.add_argument("--shard-size", type=int, default=4096, help="Rows (nodes) per shard")
+    parser.add_argument("--batch", type=int, default=64, help="Sequences per sampled batch")
+    parser.add_argument("--batches", type=int, default=20, help="Batches to sample")
+    parser.add_argument("--logging", action="store_true", help="Keep sqlflow's default DEBUG logging enabled")
+    args = parser.parse_args()
+
+    if not args.logging:
+        logging.disable(logging.CRITICAL)
+    queries = load_corpus_queries()
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        export_sequences(queries, directory, shard_size=args.shard_size)
+        export_s = time.perf_counter() - start
+
+        shards = SequenceShards(directory)
+        start = time.perf_counter()
+        for batch in range(args.batches):
+            rows = sum(len(sequence) for sequence in shards.sample(args.batch, seed=batch))
+        mmap_s = (time.perf_counter() - start) / args.batches
+
+        encoder, rng = SequenceEncoder(), random.Random(0)
+        start = time.perf_counter()
+        for _ in range(args.batches):
+            for sql in rng.sample(queries, args.batch):
+                for tree, _ in parse_sql(sql):
+                    encoder.encode(tree)
+        reparse_s = (time.perf_counter() - start) / args.batches
+
+        print(json.dumps({
+            "queries": len(queries),
+            "sequences": len(shards),
+            "shards": len(shards.manifest["shards"]),
+            "nodes": int(shards.index[:, 3].sum()),
+            "export_s": round(export_s, 3),
+            "batch_mmap_ms": round(mmap_s * 1000, 3),
+            "batch_reparse_ms": round(reparse_s * 1000, 1),
+            "speedup": round(reparse_s / mmap_s),
+            "last_batch_rows": rows
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Thread scaling benchmark for `parse_many`: corpus throughput with 1..N
+threads. On a GIL build throughput stays flat; on a free-threaded build
+(python3.13t, `sys._is_gil_enabled()` False) it should scale with cores.
+
+    python3.13t benchmarks/bench_threads.py --threads 1 2 4 8 --copies 2
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlflow.parser import parse_many
+from sqlflow.replay import load_corpus_queries
+
+
+def gil_enabled():
+    check = getattr(sys, "_is_gil_enabled", None)
+    return True if check is None else check()
+
+
+def bench(queries, threads, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            start = time.perf_counter()
+            parse_many(queries, executor=pool)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Benchmark parse_many thread scaling.")
+    parser.add_argument("--threads", type=int, nargs="+", default=sorted({1, 2, 4, cores}), help="Thread counts to test")
+    parser.add_argument("--copies", type=int, default=1, help="Times to repeat the corpus")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per measurement (best is reported)")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    queries = load_corpus_queries() * args.copies
+    parse_many(queries[:50], max_workers=1)  # warm imports and flyweights
+
+    results, baseline = [], None
+    for threads in args.threads:
+        elapsed = bench(queries, threads, args.repeat)
+        baseline = baseline or elapsed
+        results.append({
+            "threads": threads,
+            "seconds": round(elapsed, 3),
+            "queries_per_s": round(len(queries) / elapsed, 1),
+            "speedup": round(baseline / elapsed, 2)
+        })
+
+    print(json.dumps({
+        "python": sys.version.split()[0],
+        "gil_enabled": gil_enabled(),
+        "cores": cores,
+        "queries": len(queries),
+        "results": results
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
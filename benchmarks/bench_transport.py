@@ -0,0 +1,93 @@
+"""
+IPC benchmark: shared-memory transport vs pickling (SQLTree, ParsingContext)
+results back from a process pool, over the packaged healthcare corpus.
+
+    python benchmarks/bench_transport.py --processes 4 --chunk-size 16 --copies 4
+"""
+import json
+import time
+import pickle
+import logging
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlflow.transport import (
+    SharedParseResult,
+    chunked,
+    parse_chunk,
+    parse_chunk_pickled,
+    parse_many_shared,
+    quiet_worker,
+    write_segment
+)
+
+
+CORPUS_DIR = Path(__file__).parent.parent / "sqlflow" / "data" / "healthcare" / "queries"
+
+
+def load_queries(copies):
+    return [path.read_text() for path in sorted(CORPUS_DIR.glob("*.sql"))] * copies
+
+
+def bench_ipc_only(queries, chunk_size):
+    """Transport cost per chunk once parsing is done, measured in a single process"""
+    pickle_s = shared_s = 0.0
+    pickle_bytes = descriptor_bytes = 0
+    for chunk in chunked(queries, chunk_size):
+        parsed, errors = parse_chunk(chunk)
+
+        start = time.perf_counter()
+        payload = pickle.dumps(parsed, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.loads(payload)
+        pickle_s += time.perf_counter() - start
+        pickle_bytes += len(payload)
+
+        start = time.perf_counter()
+        descriptor = pickle.dumps(write_segment(parsed, len(chunk), errors), protocol=pickle.HIGHEST_PROTOCOL)
+        with SharedParseResult(pickle.loads(descriptor)) as result:
+            result.materialize()
+        shared_s += time.perf_counter() - start
+        descriptor_bytes += len(descriptor)
+
+    return {
+        "pickle_s": round(pickle_s, 3),
+        "shared_memory_s": round(shared_s, 3),
+        "pickle_bytes": pickle_bytes,
+        "descriptor_bytes": descriptor_bytes
+    }
+
+
+def bench_pool(queries, processes, chunk_size):
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processes, initializer=quiet_worker) as pool:
+        for _ in pool.map(parse_chunk_pickled, chunked(queries, chunk_size)):
+            pass
+    pickled = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for result in parse_many_shared(queries, processes=processes, chunk_size=chunk_size):
+        result.materialize()
+    shared = time.perf_counter() - start
+    return {"pickle_s": round(pickled, 3), "shared_memory_s": round(shared, 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark result transport for multiprocess parsing.")
+    parser.add_argument("--processes", type=int, default=4, help="Worker processes")
+    parser.add_argument("--chunk-size", type=int, default=16, help="Corpus files per pool task")
+    parser.add_argument("--copies", type=int, default=2, help="Times to repeat the corpus")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    queries = load_queries(args.copies)
+    results = {
+        "files": len(queries),
+        "ipc_only": bench_ipc_only(queries, args.chunk_size),
+        "end_to_end": bench_pool(queries, args.processes, args.chunk_size)
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Structural diff benchmark: a generated query of 1,000+ lines (many CTEs
+joined at the end) and a copy with a few edits. The Merkle diff is compared
+with a flat diff that aligns every node of both trees in pre-order.
+Parsing is timed separately, since it dominates either diff.
+
+    python benchmarks/bench_treediff.py --ctes 70 --repeat 5
+"""
+import json
+import time
+import logging
+import argparse
+from difflib import SequenceMatcher
+
+from sqlparse.engine import grouping
+
+from sqlflow.parser import parse_sql
+from sqlflow.treediff import collapse, diff_trees
+
+
+def cte(i):
+    return f"""cte_{i} AS (
+    SELECT
+        v.patient_id,
+        v.visit_date,
+        p.birth_date,
+        d.specialty,
+        COUNT(l.id) AS labs_{i}
+    FROM visits v
+    JOIN patients p ON v.patient_id = p.patient_id
+    JOIN doctors d ON v.doctor_id = d.doctor_id
+    LEFT JOIN lab_results l ON l.visit_id = v.visit_id
+    WHERE v.visit_date > '2020-01-{1 + i % 28:02d}'
+      AND d.specialty = 'specialty_{i % 7}'
+    GROUP BY v.patient_id, v.visit_date, p.birth_date, d.specialty
+)"""
+
+
+def generate(n):
+    ctes = ",\n".join(cte(i) for i in range(n))
+    joins = "\n".join(f"JOIN cte_{i} c{i} ON c{i}.patient_id = c0.patient_id" for i in range(1, n))
+    return f"WITH {ctes}\nSELECT c0.patient_id, c0.visit_date\nFROM cte_0 c0\n{joins}\nWHERE c0.visit_date > '2021-01-01'"
+
+
+def edit(sql, n):
+    """A changed join condition, a changed filter and a changed table, in three different CTEs"""
+    parts = sql.split("cte_")
+    edits = {
+        n // 4 + 1: ("v.doctor_id = d.doctor_id", "v.referrer_id = d.doctor_id"),
+        n // 2 + 1: ("'specialty_", "'department_"),
+        3 * n // 4 + 1: ("lab_results l", "lab_orders l"),
+    }
+    for index, (old, new) in edits.items():
+        parts[index] = parts[index].replace(old, new, 1)
+    return "cte_".join(parts)
+
+
+def flat_diff(old, new):
+    """Baseline without subtree hashes: aligns the pre-order (class, text) lists of both trees"""
+    def flatten(tree):
+        stack, items = [tree.root], []
+        while stack:
+            node = stack.pop()
+            items.append((node.type, collapse(node.token.value)))
+            stack.extend(reversed(node.children))
+        return items
+    matcher = SequenceMatcher(None, flatten(old), flatten(new), autojunk=False)
+    return [opcode for opcode in matcher.get_opcodes() if opcode[0] != "equal"]
+
+
+def iter_nodes(tree):
+    stack = [tree.root]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(node.children)
+
+
+def best_of(repeat, function, *args):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Merkle structural diffs on a large query.")
+    parser.add_argument("--ctes", type=int, default=70, help="CTEs in the generated query (16 lines each)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is reported)")
+    parser.add_argument("--logging", action="store_true", help="Keep sqlflow's default DEBUG logging enabled")
+    args = parser.parse_args()
+
+    if not args.logging:
+        logging.disable(logging.CRITICAL)
+    # sqlparse caps tokens per group (10,000) against pathological input; a 1,000-line statement is over it
+    grouping.MAX_GROUPING_TOKENS = None
+    old_sql = generate(args.ctes)
+    new_sql = edit(old_sql, args.ctes)
+    parse_s, (old, new) = best_of(args.repeat, lambda: (parse_sql(old_sql)[0], parse_sql(new_sql)[0]))
+    (old_tree, old_context), (new_tree, new_context) = old, new
+
+    merkle_s, result = best_of(args.repeat, diff_trees, old_tree, new_tree, old_context.triples, new_context.triples)
+    structure_s, _ = best_of(args.repeat, diff_trees, old_tree, new_tree)
+    flat_s, opcodes = best_of(args.repeat, flat_diff, old_tree, new_tree)
+    print(json.dumps({
+        "lines": old_sql.count("\n") + 1,
+        "nodes": sum(1 for _ in iter_nodes(old_tree)),
+        "parse_both_s": round(parse_s, 3),
+        "merkle_diff_s": round(merkle_s, 4),
+        "merkle_diff_without_triples_s": round(structure_s, 4),
+        "flat_diff_s": round(flat_s, 4),
+        "speedup_vs_flat": round(flat_s / structure_s, 1),
+        "nodes_visited": result.visited,
+        "nodes_skipped": result.skipped,
+        "changes": [str(change) for change in result.changes],
+        "flat_diff_blocks": len(opcodes)
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
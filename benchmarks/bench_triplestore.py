@@ -0,0 +1,102 @@
+"""
+Triple store benchmark: a simulated daily ingest of the packaged corpus's
+triples (one batch per day, node uuids made unique per day). Compares
+adding a day's batch (flush plus any compaction it triggers) with rewriting
+the whole triple set as one segment, then times subject and predicate
+lookups across the resulting segments, with the share of segments the
+Bloom filters rule out. Parsing, the same for both approaches, is timed once.
+
+    python benchmarks/bench_triplestore.py --days 30 --fanout 4
+"""
+import re
+import json
+import time
+import random
+import logging
+import argparse
+import tempfile
+
+from sqlflow.parser import parse_sql
+from sqlflow.replay import load_corpus_queries
+from sqlflow.triplestore import TripleStore, subject_key, write_segment
+
+UUID_PATTERN = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+
+def corpus_triples():
+    triples = set()
+    for sql in load_corpus_queries():
+        for _, context in parse_sql(sql):
+            triples |= context.triples
+    return triples
+
+
+def day_batch(triples, day):
+    def rename(part):
+        return UUID_PATTERN.sub(lambda match: f"{day:04d}{match.group(0)[4:]}", part)
+    return {tuple(rename(part) for part in triple) for triple in triples}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the segmented triple store.")
+    parser.add_argument("--days", type=int, default=30, help="Daily batches to ingest")
+    parser.add_argument("--fanout", type=int, default=4, help="Segments per level before a merge")
+    parser.add_argument("--lookups", type=int, default=2000, help="Subject lookups to time")
+    parser.add_argument("--logging", action="store_true", help="Keep sqlflow's default DEBUG logging enabled")
+    args = parser.parse_args()
+
+    if not args.logging:
+        logging.disable(logging.CRITICAL)
+    start = time.perf_counter()
+    base = corpus_triples()
+    parse_s = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as directory:
+        add_s, everything = [], set()
+        with TripleStore(f"{directory}/store", fanout=args.fanout, background=False) as store:
+            for day in range(args.days):
+                batch = day_batch(base, day)
+                everything |= batch
+                start = time.perf_counter()
+                store.add(batch)
+                add_s.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            write_segment(f"{directory}/rebuild.seg", sorted(everything))
+            rebuild_write_s = time.perf_counter() - start
+
+            rng = random.Random(0)
+            segments = store.snapshot()
+            subjects = rng.sample(sorted({s for s, _, _ in everything}), min(args.lookups, len(everything)))
+            missing = [f"{subject}-missing" for subject in subjects]
+            results = {}
+            for name, keys in (("present", subjects), ("missing", missing)):
+                start = time.perf_counter()
+                found = sum(len(store.by_subject(key)) for key in keys)
+                elapsed = time.perf_counter() - start
+                probed = sum(subject_key(key) in segment.bloom for key in keys for segment in segments)
+                results[name] = {
+                    "us_per_lookup": round(1e6 * elapsed / len(keys), 1),
+                    "triples_found": found,
+                    "segments_probed_share": round(probed / (len(keys) * len(segments)), 3)
+                }
+            start = time.perf_counter()
+            by_predicate = len(store.by_predicate("has_SQLTable"))
+            predicate_s = time.perf_counter() - start
+            stats = store.stats()
+
+    print(json.dumps({
+        "triples_per_day": len(base),
+        "days": args.days,
+        "parse_one_day_s": round(parse_s, 2),
+        "add_day_s": {"mean": round(sum(add_s) / len(add_s), 3), "max": round(max(add_s), 3), "last": round(add_s[-1], 3)},
+        "rebuild_write_s": round(rebuild_write_s, 2),
+        "rebuild_with_parsing_s": round(rebuild_write_s + parse_s * args.days, 1),
+        "store": stats,
+        "by_subject": results,
+        "by_predicate": {"triples": by_predicate, "s": round(predicate_s, 3)}
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Materialized view mining benchmark: streams a log built by replaying the
+packaged corpus many times, then mines frequent join subgraphs at several
+support thresholds. Identical join graphs are merged before mining, so
+mining time depends on distinct graphs, not on the number of queries.
+
+    python benchmarks/bench_views.py --repeat 400
+"""
+import json
+import time
+import logging
+import argparse
+
+from sqlflow.replay import load_corpus_queries
+from sqlflow.views import JoinGraphMiner
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark frequent join-subgraph mining.")
+    parser.add_argument("--repeat", type=int, default=400, help="Times the corpus is replayed into the log")
+    parser.add_argument("--supports", type=float, nargs="*", default=[0.001, 0.01, 0.05], help="Minimum support as a share of queries")
+    parser.add_argument("--logging", action="store_true", help="Keep sqlflow's default DEBUG logging enabled")
+    args = parser.parse_args()
+
+    if not args.logging:
+        logging.disable(logging.CRITICAL)
+    queries = load_corpus_queries()
+
+    miner = JoinGraphMiner()
+    start = time.perf_counter()
+    miner.add_many(sql for _ in range(args.repeat) for sql in queries)
+    ingest = time.perf_counter() - start
+
+    mining = {}
+    for share in args.supports:
+        min_support = max(1, int(share * miner.queries))
+        start = time.perf_counter()
+        patterns = miner.mine(min_support)
+        candidates = miner.candidates(min_support)
+        mining[share] = {
+            "min_support": min_support,
+            "s": round(time.perf_counter() - start, 4),
+            "patterns": len(patterns),
+            "largest": max((len(p.edges) for p in patterns), default=0),
+            "candidates": len(candidates),
+            "top": [repr(c) for c in candidates[:3]]
+        }
+
+    print(json.dumps({
+        "queries": miner.queries,
+        "distinct_shapes": len(miner._shapes),
+        "distinct_join_graphs": len(miner.graphs),
+        "ingest_s": round(ingest, 2),
+        "ingest_queries_per_s": round(miner.queries / ingest),
+        "mining": mining
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
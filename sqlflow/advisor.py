@@ -0,0 +1,215 @@
+import heapq
+
+from sqlparse.sql import Comparison, Identifier
+from sqlparse.tokens import Comparison as ComparisonOperator
+
+from sqlflow.fingerprint import ShapeAggregator
+from sqlflow.schema import load_schema
+
+
+CLAUSE_KEYWORDS = {"WHERE": "where", "ON": "on", "HAVING": "having"}
+CONTINUATION_KEYWORDS = frozenset(["AND", "OR", "NOT", "IN", "IS", "BETWEEN", "LIKE", "ILIKE", "EXISTS"])
+EQUALITY_OPERATORS = frozenset(["=", "IN", "IS", "<=>"])
+KINDS = ("join", "equality", "range")
+SUPPORT_SIZE = 5
+CACHE_SIZE = 100000
+
+
+def operator_kind(operator):
+    return "equality" if operator.upper() in EQUALITY_OPERATORS else "range"
+
+
+def comparison_operator(token):
+    return next((t.value for t in token.tokens if t.ttype in ComparisonOperator), "=")
+
+
+class ColumnResolver:
+    """Maps a statement's column references to schema tables through its FROM/JOIN aliases"""
+
+    def __init__(self, tables):
+        self.tables = tables
+
+    def scope(self, root):
+        """{alias or table name: schema table} for every SQLTable in a statement"""
+        aliases, stack = {}, [root]
+        while stack:
+            node = stack.pop()
+            stack.extend(node.children)
+            if node.type == "SQLTable" and isinstance(node.token, Identifier):
+                table = (node.token.get_real_name() or "").lower()
+                if table in self.tables:
+                    aliases[table] = table
+                    if node.token.get_alias():
+                        aliases[node.token.get_alias().lower()] = table
+        return aliases
+
+    def resolve(self, token, aliases):
+        """(table, column) of an Identifier token, or None if unknown or ambiguous"""
+        column = (token.get_real_name() or "").lower()
+        qualifier = token.get_parent_name()
+        if qualifier:
+            table = aliases.get(qualifier.lower())
+            return (table, column) if table and column in self.tables[table].columns else None
+        owners = {table for table in aliases.values() if column in self.tables[table].columns}
+        return (owners.pop(), column) if len(owners) == 1 else None
+
+
+def column_uses(tree, resolver):
+    """
+    {(table, column, kind)} for the join and filter columns of one statement:
+    `join` for columns compared to another column in an ON clause,
+    `equality`/`range` for columns filtered against values in ON/WHERE/HAVING.
+    """
+    aliases = resolver.scope(tree.root)
+    uses = set()
+
+    def add(token, kind):
+        resolved = resolver.resolve(token, aliases) if isinstance(token, Identifier) else None
+        if resolved:
+            uses.add(resolved + (kind,))
+
+    stack = [tree.root]
+    while stack:
+        node = stack.pop()
+        clause = None
+        for position, child in enumerate(node.children):
+            if child.type == "SQLKeyword":
+                keyword = child.token.normalized.upper()
+                if keyword in CLAUSE_KEYWORDS:
+                    clause = CLAUSE_KEYWORDS[keyword]
+                elif keyword not in CONTINUATION_KEYWORDS:
+                    clause = None
+            elif isinstance(child.token, Comparison) and child.type in ("SQLRelationship", "SQLSegment"):
+                sides = [t for t in (child.token.left, child.token.right) if isinstance(t, Identifier)]
+                if len(sides) == 2 and child.type == "SQLRelationship":
+                    add(sides[0], "join")
+                    add(sides[1], "join")
+                else:
+                    for side in sides:
+                        add(side, operator_kind(comparison_operator(child.token)))
+            elif clause and isinstance(child.token, Identifier) and not child.children:
+                following = node.children[position + 1] if position + 1 < len(node.children) else None
+                add(child.token, operator_kind(following.token.value if following else "="))
+            stack.extend(child.children)
+    return uses
+
+
+class Recommendation:
+    """An index or cluster key suggestion for one table, with the queries that motivate it"""
+
+    __slots__ = ["table", "kind", "columns", "score", "share", "reason", "queries"]
+
+    def __init__(self, table, kind, columns, score, share, reason, queries):
+        self.table = table
+        self.kind = kind
+        self.columns = columns
+        self.score = score
+        self.share = share
+        self.reason = reason
+        self.queries = queries
+
+    def to_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __repr__(self):
+        return f"Recommendation({self.kind} {self.table}({', '.join(self.columns)}), share={self.share:.3f})"
+
+
+class IndexAdvisor(ShapeAggregator):
+    """
+    Streaming join/filter column statistics for index and cluster-key advice.
+
+    `add` parses one query (or reuses the result for an already seen query
+    shape, see `fingerprint.ShapeAggregator`) and folds its weighted column
+    uses into running totals. State is proportional to the number of distinct
+    columns and cached shapes, not to the number of queries, and each column
+    keeps only its `support_size` heaviest supporting query ids.
+    """
+
+    def __init__(self, tables=None, support_size=SUPPORT_SIZE, cache_size=CACHE_SIZE):
+        super().__init__(cache_size)
+        self.tables = tables or load_schema()
+        self.resolver = ColumnResolver(self.tables)
+        self.support_size = support_size
+        self.weights = {}  # (table, column, kind) -> weighted query count
+        self.support = {}  # (table, column) -> min-heap of (weight, query id)
+        self.total_weight = 0
+
+    def summarize(self, trees):
+        uses = set()
+        for tree in trees:
+            uses |= column_uses(tree, self.resolver)
+        return uses
+
+    def add(self, sql, weight=1, query=None):
+        self.total_weight += weight
+        super().add(sql, weight, query)
+
+    def fold(self, uses, weight, query):
+        for table, column, kind in uses:
+            self.weights[(table, column, kind)] = self.weights.get((table, column, kind), 0) + weight
+        for table, column in {(table, column) for table, column, _ in uses}:
+            heap = self.support.setdefault((table, column), [])
+            if len(heap) < self.support_size:
+                heapq.heappush(heap, (weight, query))
+            elif weight > heap[0][0]:
+                heapq.heapreplace(heap, (weight, query))
+
+    def column_weights(self, table):
+        """{column: {kind: weight}} for one table"""
+        result = {}
+        for (owner, column, kind), weight in self.weights.items():
+            if owner == table:
+                result.setdefault(column, dict.fromkeys(KINDS, 0))[kind] += weight
+        return result
+
+    def supporting_queries(self, table, column):
+        return [query for _, query in sorted(self.support.get((table, column), []), reverse=True)]
+
+    def recommend(self, top=3, min_share=0.01):
+        """
+        Per table: up to `top` single-column indexes on the heaviest join and
+        equality-filter columns (primary keys are skipped as already indexed),
+        and one cluster key favoring range-filtered columns, then join
+        columns. Columns used by less than `min_share` of the total query
+        weight are ignored.
+        """
+        recommendations = []
+        threshold = min_share * self.total_weight
+        for table in sorted({table for table, _, _ in self.weights}):
+            columns = self.column_weights(table)
+            primary_key = self.tables[table].primary_key
+
+            indexed = sorted(
+                ((weights["join"] + weights["equality"], column) for column, weights in columns.items()
+                 if (column,) != primary_key and weights["join"] + weights["equality"] >= threshold),
+                reverse=True
+            )
+            for score, column in indexed[:top]:
+                weights = columns[column]
+                reason = f"join weight {weights['join']}, equality filter weight {weights['equality']}"
+                recommendations.append(self._recommendation(table, "index", column, score, reason))
+
+            clustered = max(
+                ((weights["range"], weights["join"] + weights["equality"], column) for column, weights in columns.items()),
+                default=None
+            )
+            if clustered and clustered[0] + clustered[1] >= threshold:
+                range_weight, point_weight, column = clustered
+                reason = f"range filter weight {range_weight}" if range_weight else f"join/equality weight {point_weight}"
+                recommendations.append(self._recommendation(table, "cluster", column, range_weight or point_weight, reason))
+
+        return sorted(recommendations, key=lambda r: (-r.share, r.table, r.kind))
+
+    def _recommendation(self, table, kind, column, score, reason):
+        share = score / self.total_weight if self.total_weight else 0.0
+        return Recommendation(table, kind, [column], score, share, reason, self.supporting_queries(table, column))
+
+    def to_dict(self, top=3, min_share=0.01):
+        return {
+            "queries": self.queries,
+            "total_weight": self.total_weight,
+            "errors": self.errors,
+            "distinct_shapes": len(self._shapes),
+            "recommendations": [r.to_dict() for r in self.recommend(top, min_share)]
+        }
@@ -0,0 +1,301 @@
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+
+import sqlparse
+from sqlparse.sql import Function, Identifier, Parenthesis, Where
+from sqlparse.tokens import Keyword, Name, String, Wildcard
+
+from sqlflow.parser import is_empty_statement, parse_statement
+from sqlflow.prefilter import is_select
+from sqlflow.transport import chunked, quiet_worker
+from sqlflow.utils import AGGREGATE_FUNCTIONS
+
+
+SEVERITY = {"high": 3, "medium": 2, "low": 1}
+SCOPE_TYPES = frozenset(["SQLQuery", "SQLSubquery", "SQLCTE"])
+OR_CHAIN_THRESHOLD = 3  # disjuncts in one WHERE clause
+DATE_PARTS = frozenset(["YEAR", "QUARTER", "MONTH", "WEEK", "DAY", "DOW", "DOY", "HOUR", "MINUTE", "SECOND", "EPOCH"])
+
+
+def walk(token, into_subqueries=False):
+    """Every token beneath `token`, groups included, optionally skipping nested SELECTs"""
+    stack = [token]
+    while stack:
+        current = stack.pop()
+        yield current
+        if current.is_group and (into_subqueries or current is token or not is_select(current)):
+            stack.extend(reversed(current.tokens))
+
+
+def defined_names(token):
+    """Names and aliases of the relations defined in FROM/JOIN clauses anywhere in a (sub)query"""
+    names, after_from = set(), False
+    for current in walk(token, into_subqueries=True):
+        if current.ttype in Keyword:
+            after_from = current.normalized in ("FROM", "UPDATE", "INTO") or "JOIN" in current.normalized
+        elif isinstance(current, Identifier) and after_from:
+            names.update(name.lower() for name in (current.get_real_name(), current.get_alias()) if name)
+            after_from = False
+    return names
+
+
+def qualifiers(token):
+    """Table qualifiers used by column references (`p` in `p.patient_id`)"""
+    return {current.get_parent_name().lower() for current in walk(token, into_subqueries=True)
+            if isinstance(current, Identifier) and current.get_parent_name()}
+
+
+def column_names(function):
+    """Column references inside a function call's arguments, leaving out function names and date parts"""
+    function_names = {id(next(token.flatten())) for token in walk(function) if isinstance(token, Function)}
+    names = []
+    for leaf in function.flatten():
+        # exact ttypes: Name.Builtin covers type names and INTERVAL
+        if leaf.ttype in (Name, String.Symbol) and id(leaf) not in function_names and leaf.value.upper() not in DATE_PARTS:
+            name = leaf.parent.value if isinstance(leaf.parent, Identifier) else leaf.value
+            if name not in names:
+                names.append(name)
+    return names
+
+
+def is_cte_definition(node):
+    """`name AS (...)` nodes: SQLCTE, or the SQLSubquery a lone CTE is parsed as"""
+    return node.type == "SQLCTE" or (
+        node.type == "SQLSubquery" and isinstance(node.token, Identifier)
+        and not isinstance(node.token.token_first(skip_cm=True), Parenthesis)
+    )
+
+
+class Finding:
+    """One rule violation: which rule, how bad, where, and why"""
+
+    __slots__ = ["rule", "severity", "message", "query", "statement", "line", "snippet"]
+
+    def __init__(self, rule, severity, message, query=None, statement=0, line=None, snippet=""):
+        self.rule = rule
+        self.severity = severity
+        self.message = message
+        self.query = query
+        self.statement = statement
+        self.line = line
+        self.snippet = snippet
+
+    def to_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __repr__(self):
+        return f"Finding({self.rule}, {self.severity}, query={self.query}, line={self.line})"
+
+
+class Rule(ABC):
+    """
+    Base anti-pattern rule. The engine calls `check(node, ancestors)` for
+    every node whose type is in `node_types` (ancestors run root -> parent);
+    it returns a message when the node violates the rule, else None.
+    """
+
+    name = "rule"
+    severity = "low"
+    node_types = frozenset()
+
+    @abstractmethod
+    def check(self, node, ancestors):
+        pass
+
+
+class CorrelatedScalarSubquery(Rule):
+    """A subquery in the select list that references the outer query runs once per output row"""
+
+    name = "correlated-scalar-subquery"
+    severity = "high"
+    node_types = frozenset(["SQLColumn", "SQLFeature"])
+
+    def check(self, node, ancestors):
+        for subquery in (token for token in walk(node.token) if is_select(token)):
+            outer = qualifiers(subquery) - defined_names(subquery)
+            if outer:
+                return f"Select-list subquery is correlated on {', '.join(sorted(outer))}; rewrite it as a JOIN with GROUP BY"
+        return None
+
+
+class SelectStarInSubquery(Rule):
+    """`SELECT *` inside a CTE or derived table materializes every column of its sources"""
+
+    name = "select-star-in-subquery"
+    severity = "medium"
+    node_types = frozenset(["SQLColumn"])
+
+    def check(self, node, ancestors):
+        if not (node.token.ttype in Wildcard or node.token.value.endswith(".*")):
+            return None
+        scopes = [ancestor for ancestor in ancestors if ancestor.type in SCOPE_TYPES]
+        if len(scopes) < 2:
+            return None
+        where = "a CTE" if is_cte_definition(scopes[-2]) else "a subquery"
+        return f"SELECT * inside {where}; list only the columns the outer query uses"
+
+
+class FunctionOnFilterColumn(Rule):
+    """Wrapping a filtered column in a function prevents index and partition pruning"""
+
+    name = "function-on-filter-column"
+    severity = "medium"
+    node_types = frozenset(["SQLColumn", "SQLFeature"])
+
+    def check(self, node, ancestors):
+        if not (ancestors and ancestors[-1].type == "SQLSegment" and isinstance(node.token, Function)):
+            return None
+        function = (node.token.get_name() or "").upper()
+        if function in AGGREGATE_FUNCTIONS:
+            return None
+        columns = column_names(node.token)
+        if columns:
+            return f"{function}() wraps filtered column {', '.join(columns)}; compare the bare column to a transformed constant instead"
+        return None
+
+
+class OrChain(Rule):
+    """Long OR chains in one WHERE clause usually force a full scan"""
+
+    name = "or-chain"
+    severity = "medium"
+    node_types = SCOPE_TYPES
+
+    def check(self, node, ancestors):
+        token = node.token
+        where = next((t for t in token.tokens if isinstance(t, Where)), None) if token.is_group else None
+        if where is None:
+            return None
+        disjuncts = 1 + sum(1 for t in walk(where) if t.ttype in Keyword and t.normalized == "OR")
+        if disjuncts >= OR_CHAIN_THRESHOLD:
+            return f"WHERE clause ORs {disjuncts} conditions; use IN (...) or split into UNION ALL branches"
+        return None
+
+
+RULES = [CorrelatedScalarSubquery(), SelectStarInSubquery(), FunctionOnFilterColumn(), OrChain()]
+
+
+class Linter:
+    """
+    Runs a set of rules over parsed trees in a single pre-order traversal,
+    dispatching each node only to the rules registered for its type.
+    """
+
+    def __init__(self, rules=None):
+        self.rules = list(RULES if rules is None else rules)
+        self.dispatch = {}
+        for rule in self.rules:
+            for node_type in rule.node_types:
+                self.dispatch.setdefault(node_type, []).append(rule)
+
+    def lint_tree(self, tree):
+        """[(rule, message, node)] for one tree"""
+        hits, stack = [], [(tree.root, 0)]
+        ancestors = []
+        while stack:
+            node, depth = stack.pop()
+            del ancestors[depth:]
+            for rule in self.dispatch.get(node.type, ()):
+                message = rule.check(node, ancestors)
+                if message:
+                    hits.append((rule, message, node))
+            ancestors.append(node)
+            stack.extend((child, depth + 1) for child in reversed(node.children))
+        return hits
+
+    def lint_sql(self, sql, query=None):
+        """Findings for every statement of a SQL string, located by line in `sql`"""
+        findings, offset = [], 0
+        for statement_index, statement in enumerate(s for s in sqlparse.parse(sql) if not is_empty_statement(s)):
+            tree, _ = parse_statement(statement)
+            hits = self.lint_tree(tree)
+            if hits:
+                start = sql.find(str(statement).strip(), offset)
+                offsets = token_offsets(statement, max(start, 0))
+                for rule, message, node in hits:
+                    position = offsets.get(id(next(node.token.flatten(), node.token)), start)
+                    findings.append(Finding(
+                        rule.name, rule.severity, message, query, statement_index,
+                        sql.count("\n", 0, position) + 1, node.name
+                    ))
+            offset += len(str(statement))
+        return findings
+
+
+def token_offsets(statement, base=0):
+    """{id(leaf token): character offset} for a statement starting at `base`"""
+    offsets, position = {}, base
+    for leaf in statement.flatten():
+        offsets[id(leaf)] = position
+        position += len(leaf.value)
+    return offsets
+
+
+class LintReport:
+    """
+    Findings ranked by severity, plus totals per rule and a per-query score
+    (sum of severity weights) to prioritize which queries to rewrite first.
+    """
+
+    def __init__(self, findings, errors=None, n_queries=0):
+        self.findings = sorted(findings, key=lambda f: (-SEVERITY[f.severity], f.rule, f.query or 0, f.statement, f.line or 0))
+        self.errors = errors or {}
+        self.n_queries = n_queries
+
+    def by_rule(self):
+        counts = {}
+        for finding in self.findings:
+            counts[finding.rule] = counts.get(finding.rule, 0) + 1
+        return counts
+
+    def ranked_queries(self):
+        """[(query, score, finding count)] with the costliest queries first"""
+        scores = {}
+        for finding in self.findings:
+            score, count = scores.get(finding.query, (0, 0))
+            scores[finding.query] = (score + SEVERITY[finding.severity], count + 1)
+        return sorted(((query, score, count) for query, (score, count) in scores.items()), key=lambda row: (-row[1], row[0]))
+
+    def to_dict(self, top=None):
+        return {
+            "queries": self.n_queries,
+            "findings": len(self.findings),
+            "errors": len(self.errors),
+            "by_rule": self.by_rule(),
+            "ranked_queries": [
+                {"query": query, "score": score, "findings": count}
+                for query, score, count in self.ranked_queries()[:top]
+            ],
+            "details": [finding.to_dict() for finding in self.findings[:top]]
+        }
+
+
+def lint_chunk(items):
+    """Worker side: [(query id, sql)] -> (findings, {query id: error})"""
+    linter, findings, errors = Linter(), [], {}
+    for query, sql in items:
+        try:
+            findings.extend(linter.lint_sql(sql, query))
+        except Exception as e:
+            errors[query] = f"{type(e).__name__}: {e}"
+    return findings, errors
+
+
+def lint_corpus(queries, processes=None, chunk_size=32):
+    """
+    Lints many queries in a process pool (queries are independent) and
+    returns a LintReport; query ids are positions in `queries`.
+    `processes=0` lints in this process.
+    """
+    items = list(enumerate(queries))
+    if processes == 0:
+        results = [lint_chunk(items)]
+    else:
+        with ProcessPoolExecutor(max_workers=processes, initializer=quiet_worker) as pool:
+            results = list(pool.map(lint_chunk, chunked(items, chunk_size)))
+
+    findings, errors = [], {}
+    for chunk_findings, chunk_errors in results:
+        findings.extend(chunk_findings)
+        errors.update(chunk_errors)
+    return LintReport(findings, errors, len(items))
@@ -0,0 +1,46 @@
+import json
+import logging
+import argparse
+
+from sqlflow.advisor import IndexAdvisor
+from sqlflow.corpus import open_corpus, packaged_corpus
+from sqlflow.schema import load_schema
+
+
+def read_log(path):
+    """Streams (sql, weight) from a JSON-lines query log with `sql` and optional `weight` fields"""
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield record["sql"], record.get("weight", 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="sqlflow advise", description="Recommend index and cluster keys from join and filter columns.")
+    parser.add_argument("directory", type=str, nargs="?", default=None, help="Directory of SQL files (default: the packaged corpus)")
+    parser.add_argument("--pattern", type=str, default="*.sql", help="Glob of files to read")
+    parser.add_argument("--log", type=str, default=None, help="JSON-lines query log ({\"sql\": ..., \"weight\": ...}) to read instead")
+    parser.add_argument("--schema", type=str, default=None, help="Schema DDL file (default: the packaged schema.sql)")
+    parser.add_argument("--top", type=int, default=3, help="Index recommendations per table")
+    parser.add_argument("--min-share", type=float, default=0.01, help="Ignore columns used by less than this share of the query weight")
+
+    args = parser.parse_args(argv)
+    logging.getLogger("sqlflow").setLevel(logging.WARNING)
+
+    advisor = IndexAdvisor(load_schema(args.schema))
+    if args.log:
+        advisor.add_many(read_log(args.log))
+        result = advisor.to_dict(args.top, args.min_share)
+    else:
+        with (open_corpus(args.directory, args.pattern) if args.directory else packaged_corpus()) as store:
+            advisor.add_many(store)
+            result = advisor.to_dict(args.top, args.min_share)
+            for recommendation in result["recommendations"]:
+                recommendation["locations"] = ["{}#{}".format(*store.index.locate(query)) for query in recommendation["queries"]]
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
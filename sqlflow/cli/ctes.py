@@ -0,0 +1,34 @@
+import sys
+import json
+import logging
+import argparse
+
+from sqlflow.dependencies import cte_graphs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="sqlflow ctes", description="Print the CTE dependency DAG, parallel stages and critical path of each statement.")
+    parser.add_argument("file", type=str, nargs="?", default="-", help="SQL file (default: stdin)")
+    parser.add_argument("--all", action="store_true", help="Also print statements without CTEs")
+
+    args = parser.parse_args(argv)
+    logging.getLogger("sqlflow").setLevel(logging.WARNING)
+
+    if args.file == "-":
+        sql = sys.stdin.read()
+    else:
+        with open(args.file) as f:
+            sql = f.read()
+
+    report = [
+        dict(statement=statement, **graph.to_dict())
+        for statement, graph in enumerate(cte_graphs(sql))
+        if graph.ctes or args.all
+    ]
+    print(json.dumps(report, indent=2))
+    if any(entry["cycles"] for entry in report):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
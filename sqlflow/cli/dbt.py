@@ -0,0 +1,24 @@
+import json
+import logging
+import argparse
+
+from sqlflow.dbt import ingest_project
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="sqlflow dbt", description="Parse a dbt project's compiled models, re-parsing only changed ones.")
+    parser.add_argument("project", type=str, help="dbt project directory")
+    parser.add_argument("--target", type=str, default=None, help="Target directory with manifest.json and compiled/ (default: PROJECT/target)")
+    parser.add_argument("--state", type=str, default=None, help="State file (default: TARGET/sqlflow_state.json)")
+    parser.add_argument("--full-refresh", action="store_true", help="Re-parse every model, ignoring saved results")
+    parser.add_argument("--processes", type=int, default=0, help="Worker processes (0 parses in this process)")
+
+    args = parser.parse_args(argv)
+    logging.getLogger("sqlflow").setLevel(logging.WARNING)
+
+    ingest = ingest_project(args.project, args.target, args.state, args.full_refresh, args.processes)
+    print(json.dumps(ingest.to_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,9 @@ import time
 import logging
 import argparse
 from pathlib import Path
-from dotenv import load_dotenv
-from openai import OpenAI
+
+from sqlflow.schema import load_schema
+from sqlflow.synthetic import TemplateQueryGenerator, SIZE_PARAMETERS
 
 
 logging.basicConfig(
@@ -41,6 +42,10 @@ def get_prompt(seed_prompt_file=None, input_schema_file=None):
 
 def get_openai_client():
     """Load your OpenAI API key from environment variable"""
+    # imported lazily so the offline `template` backend works without the `synthetic` extra
+    from dotenv import load_dotenv
+    from openai import OpenAI
+
     load_dotenv()
     return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
@@ -101,24 +106,63 @@ def get_synthetic_data(total_queries, max_retries=3):
             logger.error(f"Failed to generate batch {batch_id + 1} after {max_retries} attempts.")
 
 
-def main():
+def get_template_data(total_queries, schema_file, output_directory, seed=0, per_file=1000, **size_parameters):
+    """Generate N queries offline from the schema, streaming them to files of `per_file` queries"""
+    generator = TemplateQueryGenerator(load_schema(schema_file), seed=seed)
+
+    for batch_id, start in enumerate(range(0, total_queries, per_file)):
+        batch_size = min(per_file, total_queries - start)
+        queries = generator.generate_many(batch_size, start=start, **size_parameters)
+        save_results_to_file("\n\n".join(queries) + "\n", batch_id=batch_id, output_directory=output_directory)
+        logger.info(f"Saved batch {batch_id + 1} ({start + batch_size}/{total_queries} queries)")
+
+
+def parse_size(value):
+    """Parses a size parameter given as `N` or an inclusive range `LOW-HIGH`"""
+    low, _, high = value.partition("-")
+    return (int(low), int(high)) if high else int(low)
+
+
+def main(argv=None):
     package_root = Path(__file__).parent.parent
 
-    parser = argparse.ArgumentParser(description="Generate synthetic SQL queries with ChatGPT.")
-    parser.add_argument("--n", type=int, default=50, help="Total number of queries to generate (multiple of 10)")
+    parser = argparse.ArgumentParser(description="Generate synthetic SQL queries with ChatGPT or offline templates.")
+    parser.add_argument("--backend", type=str, choices=["openai", "template"], default="openai", help="Query generation backend")
+    parser.add_argument("--n", type=int, default=50, help="Total number of queries to generate (multiple of 10 for openai)")
     parser.add_argument("--schema", type=str, default=f"{package_root}/data/healthcare/schema.sql", help="Path to schema file")
     parser.add_argument("--prompt", type=str, default=f"{package_root}/data/seed_prompt.txt", help="Path to seed prompt file")
-    parser.add_argument("--outdir", type=str, default=f"{package_root}/data/healthcare/queries", help="Output directory for queries")
+    parser.add_argument("--outdir", type=str, default=None, help="Output directory for queries (template default: ./synthetic_queries)")
     parser.add_argument("--retries", type=int, default=3, help="Max retries per batch")
 
-    args = parser.parse_args()
+    template = parser.add_argument_group("template backend")
+    template.add_argument("--seed", type=int, default=0, help="Seed; the same seed and parameters give the same corpus")
+    template.add_argument("--per-file", type=int, default=1000, help="Queries per output file")
+    template.add_argument("--joins", type=parse_size, default=(0, 3), help="Joins per SELECT (N or LOW-HIGH)")
+    template.add_argument("--ctes", type=parse_size, default=(0, 2), help="CTEs per query (N or LOW-HIGH)")
+    template.add_argument("--depth", type=parse_size, default=(0, 1), help="Subquery nesting depth (N or LOW-HIGH)")
+    template.add_argument("--width", type=parse_size, default=(2, 8), help="Select-list width (N or LOW-HIGH)")
+    template.add_argument("--in-list", type=parse_size, default=0, help="IN-list length, 0 disables (N or LOW-HIGH)")
+    template.add_argument("--unions", type=parse_size, default=0, help="Extra UNION ALL branches (N or LOW-HIGH)")
+
+    args = parser.parse_args(argv)
+
+    if args.backend == "template":
+        get_template_data(
+            total_queries=args.n,
+            schema_file=args.schema,
+            output_directory=args.outdir or "./synthetic_queries",
+            seed=args.seed,
+            per_file=args.per_file,
+            **{name: getattr(args, name) for name in SIZE_PARAMETERS}
+        )
+        return
 
     # Set globals with args
     global SEED_PROMPT_FILE, INPUT_SCHEMA_FILE, OUTPUT_DIRECTORY
 
     SEED_PROMPT_FILE = args.prompt
     INPUT_SCHEMA_FILE = args.schema
-    OUTPUT_DIRECTORY = args.outdir
+    OUTPUT_DIRECTORY = args.outdir or f"{package_root}/data/healthcare/queries"
 
     get_synthetic_data(total_queries=args.n, max_retries=args.retries)
 
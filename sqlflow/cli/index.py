@@ -0,0 +1,36 @@
+import logging
+import argparse
+
+from sqlflow.corpus import INDEX_NAME, StatementIndex, open_corpus
+
+
+logger = logging.getLogger(__name__)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="sqlflow index", description="Build a statement offset index for a directory of SQL files, or fetch statements from it.")
+    parser.add_argument("directory", type=str, help="Directory of SQL files")
+    parser.add_argument("--pattern", type=str, default="*.sql", help="Glob of files to index")
+    parser.add_argument("--out", type=str, default=None, help=f"Index path (default: <directory>/{INDEX_NAME})")
+    parser.add_argument("--get", type=int, default=None, help="Print the statement with this global id")
+    parser.add_argument("--file", type=str, default=None, help="With --index, print statement --index of this file")
+    parser.add_argument("--index", type=int, default=None, help="Statement index within --file")
+
+    args = parser.parse_args(argv)
+    logging.getLogger("sqlflow").setLevel(logging.WARNING)
+
+    if args.get is None and args.file is None:
+        index = StatementIndex.build(args.directory, args.pattern)
+        path = index.save(args.out)
+        logger.warning(f"Indexed {len(index)} statements in {len(index.files)} files -> {path}")
+        return
+
+    with open_corpus(args.directory, args.pattern) as store:
+        if args.get is not None:
+            print(store[args.get])
+        else:
+            print(store.get(args.file, args.index or 0, verify=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import sys
+import json
+import logging
+import argparse
+
+from sqlflow.antipatterns import SEVERITY, lint_corpus
+from sqlflow.corpus import open_corpus, packaged_corpus
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="sqlflow lint", description="Flag warehouse performance anti-patterns and rank queries by severity.")
+    parser.add_argument("directory", type=str, nargs="?", default=None, help="Directory of SQL files (default: the packaged corpus)")
+    parser.add_argument("--pattern", type=str, default="*.sql", help="Glob of files to lint")
+    parser.add_argument("--processes", type=int, default=None, help="Worker processes (0 lints in this process)")
+    parser.add_argument("--top", type=int, default=20, help="Ranked queries and findings to print")
+    parser.add_argument("--fail-on", type=str, choices=sorted(SEVERITY), default=None, help="Exit non-zero on a finding this severe")
+
+    args = parser.parse_args(argv)
+    logging.getLogger("sqlflow").setLevel(logging.WARNING)
+
+    with (open_corpus(args.directory, args.pattern) if args.directory else packaged_corpus()) as store:
+        report = lint_corpus(list(store), processes=args.processes)
+        result = report.to_dict(top=args.top)
+        for entry in result["ranked_queries"] + result["details"]:
+            entry["location"] = "{}#{}".format(*store.index.locate(entry["query"]))
+
+    print(json.dumps(result, indent=2))
+    if args.fail_on and any(SEVERITY[f.severity] >= SEVERITY[args.fail_on] for f in report.findings):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
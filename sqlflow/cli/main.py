@@ -0,0 +1,35 @@
+import logging
+import argparse
+import importlib
+
+
+# subcommand -> module exposing `main(argv)`
+COMMANDS = {
+    "advise": "sqlflow.cli.advise",
+    "ctes": "sqlflow.cli.ctes",
+    "dbt": "sqlflow.cli.dbt",
+    "generate": "sqlflow.cli.generate_queries",
+    "index": "sqlflow.cli.index",
+    "lint": "sqlflow.cli.lint",
+    "replay": "sqlflow.cli.replay",
+    "serve": "sqlflow.cli.serve",
+    "triples": "sqlflow.cli.triples",
+    "views": "sqlflow.cli.views",
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="sqlflow", description="SQLFlow command line tools.")
+    parser.add_argument("command", choices=sorted(COMMANDS), help="Subcommand to run")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="Arguments passed to the subcommand")
+    args = parser.parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S"
+    )
+    importlib.import_module(COMMANDS[args.command]).main(args.args)
+
+
+if __name__ == "__main__":
+    main()
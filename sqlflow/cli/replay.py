@@ -0,0 +1,59 @@
+import json
+import logging
+import argparse
+
+from sqlflow.replay import (
+    HttpTarget,
+    InProcessTarget,
+    load_corpus_queries,
+    load_log,
+    run_replay,
+    synthetic_arrivals
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="sqlflow replay", description="Replay a query workload open-loop and report latency percentiles.")
+    parser.add_argument("--log", type=str, default=None, help="JSON-lines log with `ts` and `sql`; defaults to the bundled corpus")
+    parser.add_argument("--qps", type=float, default=None, help="Target arrival rate (required without --log; rescales a log)")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed multiplier for --log when --qps is not given")
+    parser.add_argument("--count", type=int, default=1000, help="Requests to send when replaying the corpus")
+    parser.add_argument("--arrivals", type=str, choices=["poisson", "uniform"], default="poisson", help="Synthetic arrival process")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for synthetic arrivals")
+    parser.add_argument("--target", type=str, default="inprocess", help="`inprocess` or an endpoint as HOST:PORT")
+    parser.add_argument("--concurrency", type=int, default=4, help="Parser threads for the in-process target")
+    parser.add_argument("--sample-interval", type=float, default=0.1, help="Seconds between queue depth samples")
+    parser.add_argument("--out", type=str, default=None, help="Write the JSON report here instead of stdout")
+
+    args = parser.parse_args(argv)
+    logging.getLogger("sqlflow").setLevel(logging.WARNING)
+
+    if args.log:
+        arrivals = load_log(args.log, speed=args.speed, target_qps=args.qps)
+    else:
+        if not args.qps:
+            parser.error("--qps is required when replaying the bundled corpus")
+        arrivals = synthetic_arrivals(load_corpus_queries(), args.qps, args.count, seed=args.seed, process=args.arrivals)
+
+    if args.target == "inprocess":
+        target = InProcessTarget(concurrency=args.concurrency)
+    else:
+        host, _, port = args.target.rpartition(":")
+        target = HttpTarget(host=host or "127.0.0.1", port=int(port))
+
+    report = run_replay(arrivals, target, sample_interval=args.sample_interval)
+    report["target"] = args.target
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output)
+        logger.warning(f"Report written to {args.out}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import asyncio
+import logging
+import argparse
+
+from sqlflow.server import ParseServer
+
+
+logger = logging.getLogger(__name__)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="sqlflow serve", description="Serve SQL parsing over HTTP from a warm worker pool.")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8080, help="TCP port to bind (0 picks a free port)")
+    parser.add_argument("--unix", type=str, default=None, help="Serve on a Unix socket at this path instead of TCP")
+    parser.add_argument("--workers", type=int, default=2, help="Number of pre-forked parser processes")
+    parser.add_argument("--batch-size", type=int, default=16, help="Max queries per micro-batch")
+    parser.add_argument("--batch-timeout", type=float, default=0.005, help="Max seconds to wait while filling a micro-batch")
+    parser.add_argument("--queue-size", type=int, default=1024, help="Bounded queue length; requests beyond it get 503")
+    parser.add_argument("--log-level", type=str, default="WARNING", help="Log level inside parser workers")
+
+    args = parser.parse_args(argv)
+
+    server = ParseServer(
+        host=args.host,
+        port=args.port,
+        unix_path=args.unix,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        batch_timeout=args.batch_timeout,
+        queue_size=args.queue_size,
+        log_level=getattr(logging, args.log_level.upper())
+    )
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        logger.info("sqlflow serve stopped")
+
+
+if __name__ == "__main__":
+    main()
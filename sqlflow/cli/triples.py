@@ -0,0 +1,43 @@
+import json
+import logging
+import argparse
+
+from sqlflow.cli.advise import read_log
+from sqlflow.corpus import open_corpus
+from sqlflow.triplestore import FANOUT, TripleStore
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="sqlflow triples", description="Add query triples to a segmented triple store, compact it, or look triples up.")
+    parser.add_argument("store", type=str, help="Triple store directory (created if missing)")
+    parser.add_argument("--add", type=str, default=None, help="Directory of SQL files to parse and add as one batch")
+    parser.add_argument("--pattern", type=str, default="*.sql", help="Glob of files to read with --add")
+    parser.add_argument("--log", type=str, default=None, help="JSON-lines query log ({\"sql\": ...}) to parse and add as one batch")
+    parser.add_argument("--fanout", type=int, default=FANOUT, help="Segments per level before they are merged")
+    parser.add_argument("--compact", action="store_true", help="Merge every segment into one")
+    parser.add_argument("--subject", type=str, default=None, help="Print the triples with this subject")
+    parser.add_argument("--predicate", type=str, default=None, help="Print the triples with this predicate")
+
+    args = parser.parse_args(argv)
+    logging.getLogger("sqlflow").setLevel(logging.WARNING)
+
+    result = {}
+    with TripleStore(args.store, fanout=args.fanout, background=False) as store:
+        if args.add:
+            with open_corpus(args.add, args.pattern) as corpus:
+                result["added"], result["errors"] = store.add_queries(corpus)
+        if args.log:
+            result["added"], result["errors"] = store.add_queries(sql for sql, _ in read_log(args.log))
+        if args.compact:
+            store.compact(full=True)
+        if args.subject is not None:
+            result["by_subject"] = store.by_subject(args.subject)
+        if args.predicate is not None:
+            result["by_predicate"] = store.by_predicate(args.predicate)
+        result["stats"] = store.stats()
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
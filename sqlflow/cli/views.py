@@ -0,0 +1,41 @@
+import json
+import logging
+import argparse
+
+from sqlflow.cli.advise import read_log
+from sqlflow.corpus import open_corpus, packaged_corpus
+from sqlflow.schema import load_schema
+from sqlflow.views import MAX_EDGES, JoinGraphMiner
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="sqlflow views", description="Mine frequent join subgraphs and propose materialized views.")
+    parser.add_argument("directory", type=str, nargs="?", default=None, help="Directory of SQL files (default: the packaged corpus)")
+    parser.add_argument("--pattern", type=str, default="*.sql", help="Glob of files to read")
+    parser.add_argument("--log", type=str, default=None, help="JSON-lines query log ({\"sql\": ..., \"weight\": ...}) to read instead")
+    parser.add_argument("--schema", type=str, default=None, help="Schema DDL file (default: the packaged schema.sql)")
+    parser.add_argument("--min-support", type=int, default=5, help="Minimum weighted number of queries sharing a join pattern")
+    parser.add_argument("--min-tables", type=int, default=2, help="Minimum tables joined by a proposed view")
+    parser.add_argument("--max-edges", type=int, default=MAX_EDGES, help="Largest join pattern mined, in join conditions")
+    parser.add_argument("--top", type=int, default=10, help="View candidates to print")
+
+    args = parser.parse_args(argv)
+    logging.getLogger("sqlflow").setLevel(logging.WARNING)
+
+    miner = JoinGraphMiner(load_schema(args.schema))
+    options = (args.min_support, args.min_tables, args.max_edges, args.top)
+    if args.log:
+        miner.add_many(read_log(args.log))
+        result = miner.to_dict(*options)
+    else:
+        with (open_corpus(args.directory, args.pattern) if args.directory else packaged_corpus()) as store:
+            miner.add_many(store)
+            result = miner.to_dict(*options)
+            for candidate in result["candidates"]:
+                candidate["locations"] = ["{}#{}".format(*store.index.locate(query)) for query in candidate["queries"]]
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import re
+import mmap
+import zlib
+import itertools
+from array import array
+from collections import Counter
+
+from sqlflow.parser import parse_sql
+
+
+STORE_MAGIC = b"SQLFZS01"
+DICTIONARY_SIZE = 32768  # zlib's window: dictionary bytes beyond this are never referenced
+SAMPLE_SIZE = 2000
+MAX_FRAGMENT_WORDS = 8
+WORD_PATTERN = re.compile(r"\s*\S+")
+WBITS = -15  # raw deflate: no per-statement zlib header or checksum
+
+
+def train_dictionary(samples, size=DICTIONARY_SIZE, max_words=MAX_FRAGMENT_WORDS):
+    """
+    Preset dictionary from sample statements: runs of up to `max_words`
+    whitespace-delimited words (with their leading whitespace) that occur
+    more than once, scored by occurrences x length and picked greedily,
+    skipping fragments already contained in a picked one. The best
+    fragments go last, closest to the data, where deflate's distance
+    codes are cheapest.
+    """
+    counts = Counter()
+    for sample in samples:
+        words = WORD_PATTERN.findall(sample)
+        for start in range(len(words)):
+            fragment = ""
+            for word in words[start:start + max_words]:
+                fragment += word
+                counts[fragment] += 1
+
+    chosen, total = [], 0
+    for fragment, count in sorted(counts.items(), key=lambda item: -item[1] * len(item[0])):
+        if count < 2:
+            continue
+        if total + len(fragment) > size:
+            if total >= size - 16:
+                break
+            continue
+        if any(fragment in picked for picked in chosen[-64:]):
+            continue
+        chosen.append(fragment)
+        total += len(fragment)
+    return "".join(reversed(chosen)).encode("utf-8")
+
+
+class CompressedStoreWriter:
+    """
+    Streams statements into a compressed store file:
+
+        magic | dictionary length | dictionary | deflate blobs ... | padding
+        | blob offsets (n + 1) | raw lengths (n) | n, index position
+
+    Each statement is deflated on its own against the shared dictionary, so
+    any one can be decoded without the others.
+    """
+
+    def __init__(self, path, dictionary=b"", level=9):
+        self.path = path
+        self.dictionary = dictionary
+        self.level = level
+        self.file = open(path, "wb")
+        self.file.write(STORE_MAGIC)
+        self.file.write(array("q", [len(dictionary)]).tobytes())
+        self.file.write(dictionary)
+        self.offsets = array("q", [self.file.tell()])
+        self.raw_lengths = array("q")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add(self, statement):
+        data = statement.encode("utf-8")
+        if self.dictionary:
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED, WBITS, zdict=self.dictionary)
+        else:
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED, WBITS)
+        self.file.write(compressor.compress(data) + compressor.flush())
+        self.offsets.append(self.file.tell())
+        self.raw_lengths.append(len(data))
+        return len(self.raw_lengths) - 1
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.file.write(b"\0" * (-self.file.tell() % 8))  # aligns the index for in-place reads
+        position = self.file.tell()
+        self.file.write(self.offsets.tobytes())
+        self.file.write(self.raw_lengths.tobytes())
+        self.file.write(array("q", [len(self.raw_lengths), position]).tobytes())
+        self.file.close()
+
+
+def build_store(statements, path, dictionary=None, sample_size=SAMPLE_SIZE, dictionary_size=DICTIONARY_SIZE, level=9):
+    """
+    Writes `statements` to a compressed store at `path`. Unless a dictionary
+    is given, one is trained on up to `sample_size` statements spread over
+    the input (or its head, for iterators). Returns the statement count.
+    """
+    if dictionary is None:
+        if hasattr(statements, "__len__"):
+            step = max(1, len(statements) // sample_size)
+            sample = [statements[i] for i in range(0, len(statements), step)][:sample_size]
+        else:
+            statements = iter(statements)
+            sample = list(itertools.islice(statements, sample_size))
+            statements = itertools.chain(sample, statements)
+        dictionary = train_dictionary(sample, dictionary_size)
+    with CompressedStoreWriter(path, dictionary, level) as writer:
+        for statement in statements:
+            writer.add(statement)
+    return len(writer.raw_lengths)
+
+
+class CompressedStore:
+    """
+    Random access to a compressed store: the file is memory-mapped, the
+    offset index is read in place, and a statement is inflated from its
+    own blob with the shared dictionary. Interchangeable with
+    `corpus.StatementStore` for iteration and indexing.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(STORE_MAGIC)] != STORE_MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a compressed statement store")
+        view = memoryview(self._map)
+        count, position = view[-16:].cast("q")
+        start = len(STORE_MAGIC)
+        dictionary_length = view[start:start + 8].cast("q")[0]
+        self.dictionary = bytes(view[start + 8:start + 8 + dictionary_length])
+        self._views = [view]
+        self.offsets = self._view(position, count + 1)
+        self.raw_lengths = self._view(position + 8 * (count + 1), count)
+
+    def _view(self, position, count):
+        view = self._views[0][position:position + 8 * count].cast("q")
+        self._views.append(view)
+        return view
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.raw_lengths)
+
+    def __iter__(self):
+        return (self[statement_id] for statement_id in range(len(self)))
+
+    def __getitem__(self, statement_id):
+        if statement_id < 0:
+            statement_id += len(self)
+        if not 0 <= statement_id < len(self):
+            raise IndexError(f"{self.path} has no statement {statement_id}")
+        if self.dictionary:
+            decompressor = zlib.decompressobj(WBITS, zdict=self.dictionary)
+        else:
+            decompressor = zlib.decompressobj(WBITS)
+        blob = self._map[self.offsets[statement_id]:self.offsets[statement_id + 1]]
+        return (decompressor.decompress(blob) + decompressor.flush()).decode("utf-8")
+
+    def parse(self, statement_id, **options):
+        """`parse_sql` on one stored statement; options are passed through"""
+        return parse_sql(self[statement_id], **options)
+
+    def stats(self):
+        raw = sum(self.raw_lengths)
+        compressed = self.offsets[len(self)] - self.offsets[0]
+        size = len(self._map)
+        return {
+            "statements": len(self),
+            "raw_bytes": raw,
+            "compressed_bytes": compressed,
+            "dictionary_bytes": len(self.dictionary),
+            "file_bytes": size,
+            "ratio": round(raw / compressed, 2) if compressed else None,
+            "file_ratio": round(raw / size, 2) if size else None
+        }
+
+    def close(self):
+        if self._map is None:
+            return
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._map.close()
+        self._map = None
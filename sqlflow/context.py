@@ -1,20 +1,28 @@
     
 class ParsingContext:
 
-    __slots__ = ["last_keyword", "depth", "visited", "triples"]
+    __slots__ = ["last_keyword", "depth", "visited", "triples", "collapsed", "profile", "collect_triples", "lazy"]
 
-    def __init__(self, last_keyword=None, depth=0, visited=None, triples=None):
+    def __init__(self, last_keyword=None, depth=0, visited=None, triples=None, collapsed=None, profile=None, collect_triples=True, lazy=False):
         self.last_keyword = last_keyword
         self.depth = depth
         self.visited = visited or set()
         self.triples = triples if triples is not None else set()
+        self.collapsed = collapsed  # fast path placeholders -> LiteralSummary / ColumnBatch
+        self.profile = profile  # ExtractionProfile, or None to build everything
+        self.collect_triples = collect_triples  # False skips building uris and triples (event parsing)
+        self.lazy = lazy  # True defers parsing subquery, CTE and feature bodies until their children are read
 
     def copy(self, **kwargs):
         return ParsingContext(
             last_keyword=kwargs.get('last_keyword', self.last_keyword),
             depth=kwargs.get('depth', self.depth),
             visited=self.visited.copy(),
-            triples=self.triples
+            triples=self.triples,
+            collapsed=self.collapsed,
+            profile=self.profile,
+            collect_triples=self.collect_triples,
+            lazy=self.lazy
         )
 
     def add_triple(self, subject, predicate, object_):
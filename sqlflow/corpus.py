@@ -0,0 +1,224 @@
+import re
+import json
+import mmap
+import hashlib
+import logging
+from array import array
+from pathlib import Path
+from importlib import resources
+from contextlib import contextmanager
+
+from sqlflow import utils as u
+
+
+CORPUS_DIR = "data/healthcare/queries"
+INDEX_NAME = "statements.index.json"
+INDEX_VERSION = 1
+# strings, quoted identifiers and comments are skipped whole so a `;` inside them is not a boundary
+BOUNDARY_PATTERN = re.compile(rb"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|--[^\n]*|/\*.*?\*/|;", re.DOTALL)
+BLANK_PATTERN = re.compile(rb"(?:\s+|--[^\n]*|/\*.*?\*/)*", re.DOTALL)
+WHITESPACE_PATTERN = re.compile(rb"\s*")
+
+logger = logging.getLogger(__name__)
+
+
+def statement_digest(data):
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def scan_statements(data):
+    """
+    One lexical pass over a file's bytes: (start, end) byte offsets of every
+    statement, from its first non-whitespace byte through its `;` (or EOF).
+    Comment/whitespace-only tails are not statements.
+    """
+    spans, start = [], 0
+    for match in BOUNDARY_PATTERN.finditer(data):
+        if match.group() == b";":
+            spans.append((start, match.end()))
+            start = match.end()
+    spans.append((start, len(data)))
+
+    statements = []
+    for start, end in spans:
+        if BLANK_PATTERN.fullmatch(data, start, end) is None:
+            start = WHITESPACE_PATTERN.match(data, start, end).end()
+            while end > start and data[end - 1:end].isspace():  # only the unterminated last statement has a tail
+                end -= 1
+            statements.append((start, end))
+    return statements
+
+
+class StatementIndex:
+    """
+    Byte offsets and content hashes of every statement in a set of SQL files.
+
+    Statements have a global id (their position across files in index order)
+    and a local one (their position within their file). Paths are stored
+    relative to `root`, the directory the index is saved in.
+    """
+
+    def __init__(self, root, files):
+        self.root = Path(root)
+        self.files = files  # [{"path", "size", "mtime_ns", "digest", "statements": [[start, end, digest], ...]}]
+        self.file_ids = {entry["path"]: file_id for file_id, entry in enumerate(files)}
+        self.bases = array("q", [0])
+        self.statement_files, self.starts, self.ends = array("i"), array("q"), array("q")
+        for file_id, entry in enumerate(files):
+            for start, end, _ in entry["statements"]:
+                self.statement_files.append(file_id)
+                self.starts.append(start)
+                self.ends.append(end)
+            self.bases.append(len(self.starts))
+
+    @classmethod
+    def build(cls, root, pattern="*.sql"):
+        root = Path(root)
+        files = []
+        for path in sorted(root.glob(pattern)):
+            data = path.read_bytes()
+            files.append({
+                "path": path.relative_to(root).as_posix(),
+                "size": len(data),
+                "mtime_ns": path.stat().st_mtime_ns,
+                "digest": statement_digest(data),
+                "statements": [[start, end, statement_digest(data[start:end])] for start, end in scan_statements(data)]
+            })
+        return cls(root, files)
+
+    @classmethod
+    def load(cls, path):
+        path = Path(path)
+        with open(path) as f:
+            payload = json.load(f)
+        if payload.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported statement index version: {payload.get('version')}")
+        return cls(path.parent, payload["files"])
+
+    def save(self, path=None):
+        path = Path(path) if path else self.root / INDEX_NAME
+        with open(path, "w") as f:
+            json.dump({"version": INDEX_VERSION, "files": self.files}, f, separators=(",", ":"))
+        return path
+
+    def is_fresh(self, verify=False):
+        """
+        True when every indexed file still exists with its indexed size and
+        modification time. With `verify`, file contents are hashed instead of
+        trusting mtimes, which installing or unpacking data resets.
+        """
+        for entry in self.files:
+            path = self.root / entry["path"]
+            try:
+                stat = path.stat()
+            except OSError:
+                return False
+            if stat.st_size != entry["size"]:
+                return False
+            if verify:
+                if statement_digest(path.read_bytes()) != entry.get("digest"):
+                    return False
+            elif stat.st_mtime_ns != entry.get("mtime_ns"):
+                return False
+        return True
+
+    def __len__(self):
+        return len(self.starts)
+
+    def global_id(self, file, index):
+        file_id = self.file_ids[file] if isinstance(file, str) else file
+        if not 0 <= index < self.bases[file_id + 1] - self.bases[file_id]:
+            raise IndexError(f"{self.files[file_id]['path']} has no statement {index}")
+        return self.bases[file_id] + index
+
+    def locate(self, statement_id):
+        """(file path, index within file) of a global statement id"""
+        file_id = self.statement_files[statement_id]
+        return self.files[file_id]["path"], statement_id - self.bases[file_id]
+
+    def digest(self, statement_id):
+        file_id = self.statement_files[statement_id]
+        return self.files[file_id]["statements"][statement_id - self.bases[file_id]][2]
+
+
+class StatementStore:
+    """
+    Random access to indexed statements: files are memory-mapped on first use
+    and a statement is sliced straight out of the mapping, so fetching one
+    never reads or lexes the rest of its file.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self._maps = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.index)
+
+    def __iter__(self):
+        return (self[statement_id] for statement_id in range(len(self)))
+
+    def __getitem__(self, statement_id):
+        if statement_id < 0:
+            statement_id += len(self)
+        index = self.index
+        mapping = self._mapping(index.statement_files[statement_id])
+        return mapping[index.starts[statement_id]:index.ends[statement_id]].decode("utf-8")
+
+    def get(self, file, index, verify=False):
+        """Statement `index` of `file` (indexed path or file id); `verify` checks its content hash"""
+        statement_id = self.index.global_id(file, index)
+        statement = self[statement_id]
+        if verify and statement_digest(statement.encode("utf-8")) != self.index.digest(statement_id):
+            raise ValueError(f"Statement {index} of {file} changed since it was indexed")
+        return statement
+
+    def _mapping(self, file_id):
+        mapping = self._maps.get(file_id)
+        if mapping is None:
+            with open(self.index.root / self.index.files[file_id]["path"], "rb") as f:
+                mapping = self._maps[file_id] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return mapping
+
+    def close(self):
+        for mapping in self._maps.values():
+            mapping.close()
+        self._maps = {}
+
+
+def open_corpus(root, pattern="*.sql", save=True, verify=False):
+    """
+    StatementStore over the SQL files in `root`, using its sidecar index when
+    present and fresh (see `StatementIndex.is_fresh`); otherwise the index is
+    rebuilt (and saved if `save` and the directory is writable).
+    """
+    root = Path(root)
+    sidecar = root / INDEX_NAME
+    if sidecar.is_file():
+        index = StatementIndex.load(sidecar)
+        if index.is_fresh(verify):
+            return StatementStore(index)
+        logger.warning(f"Statement index {sidecar} is stale; rebuilding")
+
+    index = StatementIndex.build(root, pattern)
+    if save:
+        try:
+            index.save(sidecar)
+        except OSError:
+            logger.warning(f"Could not write statement index to {sidecar}; using it in memory")
+    return StatementStore(index)
+
+
+@contextmanager
+def packaged_corpus():
+    """StatementStore over the healthcare corpus shipped in the package (located via importlib.resources)"""
+    with resources.as_file(u.get_package_file(CORPUS_DIR)) as root:
+        # installed data has no meaningful mtimes, and its sidecar cannot be rewritten
+        with open_corpus(root, save=False, verify=True) as store:
+            yield store
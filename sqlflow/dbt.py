@@ -0,0 +1,250 @@
+import os
+import json
+import time
+import logging
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlflow.corpus import statement_digest
+from sqlflow.parser import parse_sql
+from sqlflow.prefilter import normalize_name, referenced_names
+from sqlflow.transport import chunked, quiet_worker
+
+
+MANIFEST = "manifest.json"
+STATE_NAME = "sqlflow_state.json"
+STATE_VERSION = 2
+MODEL_TYPES = frozenset(["model", "snapshot"])
+
+logger = logging.getLogger(__name__)
+
+
+class DbtModel:
+    """A model from manifest.json: identity, `database.schema.alias` relation, declared upstream nodes and where its compiled SQL is"""
+
+    __slots__ = ["unique_id", "name", "relation", "path", "compiled_path", "compiled_code", "depends_on"]
+
+    def __init__(self, unique_id, name, relation, path, compiled_path, compiled_code, depends_on):
+        self.unique_id = unique_id
+        self.name = name
+        self.relation = relation
+        self.path = path
+        self.compiled_path = compiled_path
+        self.compiled_code = compiled_code
+        self.depends_on = depends_on
+
+    @classmethod
+    def from_manifest(cls, unique_id, node, project_dir, target_path):
+        # dbt >= 1.3 records `compiled_path`; older manifests only give the source path inside the package
+        compiled_path = node.get("compiled_path")
+        if compiled_path:
+            compiled_path = Path(project_dir) / compiled_path
+        else:
+            compiled_path = Path(target_path) / "compiled" / node.get("package_name", "") / node.get("original_file_path", "")
+        return cls(
+            unique_id,
+            node.get("name", unique_id.rsplit(".", 1)[-1]),
+            ".".join(normalize_name(part) for part in (node.get("database"), node.get("schema"), node.get("alias") or node.get("name", "")) if part),
+            node.get("original_file_path", ""),
+            compiled_path,
+            node.get("compiled_code", node.get("compiled_sql")),
+            list(node.get("depends_on", {}).get("nodes", []))
+        )
+
+    def compiled_sql(self):
+        """The compiled SQL, from target/compiled or else inlined in the manifest; None when not compiled"""
+        if self.compiled_path.is_file():
+            return self.compiled_path.read_text()
+        return self.compiled_code
+
+
+def load_models(project_dir, target_path=None):
+    """{unique_id: DbtModel} for every model and snapshot in `target/manifest.json`"""
+    project_dir = Path(project_dir)
+    target_path = Path(target_path) if target_path else project_dir / "target"
+    with open(target_path / MANIFEST) as f:
+        manifest = json.load(f)
+    return {
+        unique_id: DbtModel.from_manifest(unique_id, node, project_dir, target_path)
+        for unique_id, node in manifest.get("nodes", {}).items()
+        if node.get("resource_type") in MODEL_TYPES
+    }
+
+
+def parse_model(sql):
+    """Parse summary persisted per model: statement count, tables (bare and as qualified as written) and columns read, and triples"""
+    tables, relations, columns, triples, statements = set(), set(), set(), set(), 0
+    for tree, context in parse_sql(sql):
+        statement_tables, statement_columns = referenced_names(tree)
+        tables |= statement_tables
+        relations |= referenced_names(tree, qualified=True)[0]
+        columns |= statement_columns
+        triples |= context.triples
+        statements += 1
+    return {
+        "statements": statements,
+        "tables": sorted(tables),
+        "relations": sorted(relations),
+        "columns": sorted(columns),
+        "triples": [list(triple) for triple in sorted(triples)]
+    }
+
+
+def parse_models(items):
+    """Worker side: [(unique_id, sql)] -> {unique_id: result}, errors recorded in the result"""
+    results = {}
+    for unique_id, sql in items:
+        try:
+            results[unique_id] = parse_model(sql)
+        except Exception as e:
+            results[unique_id] = {"error": f"{type(e).__name__}: {e}"}
+    return results
+
+
+class DbtState:
+    """
+    Per-model parse results keyed by unique_id, with the checksum of the
+    compiled SQL they were produced from. Saved as JSON next to the
+    manifest; a missing, unreadable or older-version file is an empty state.
+    """
+
+    def __init__(self, path, models=None):
+        self.path = Path(path)
+        self.models = models or {}
+
+    @classmethod
+    def load(cls, path):
+        path = Path(path)
+        try:
+            with open(path) as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return cls(path)
+        if payload.get("version") != STATE_VERSION:
+            logger.info(f"Ignoring dbt state {path} with version {payload.get('version')}")
+            return cls(path)
+        return cls(path, payload["models"])
+
+    def save(self):
+        # written beside and renamed over, so an interrupted run leaves the previous state intact
+        temporary = self.path.with_name(self.path.name + ".tmp")
+        with open(temporary, "w") as f:
+            json.dump({"version": STATE_VERSION, "models": self.models}, f, separators=(",", ":"))
+        os.replace(temporary, self.path)
+        return self.path
+
+
+class DbtIngest:
+    """Outcome of one ingest run: the model results, model-to-model lineage, and what was (re)parsed"""
+
+    def __init__(self, models, results, stats):
+        self.models = models
+        self.results = results
+        self.stats = stats
+        self.relations = {model.relation: unique_id for unique_id, model in models.items()}
+
+    def lineage(self):
+        """
+        {model unique_id: [upstream model unique_ids]}: the manifest's
+        declared dependencies, plus relations the compiled SQL reads that
+        resolve to another model (see `resolve`).
+        """
+        lineage = {}
+        for unique_id, model in self.models.items():
+            upstream = {node for node in model.depends_on if node in self.models}
+            for relation in self.results.get(unique_id, {}).get("relations", ()):
+                upstream.add(self.resolve(relation))
+            upstream.discard(None)
+            upstream.discard(unique_id)
+            lineage[unique_id] = sorted(upstream)
+        return lineage
+
+    def resolve(self, relation):
+        """
+        unique_id of the model a relation read by SQL refers to, or None.
+        A fully qualified `database.schema.alias` must match exactly; a
+        partly qualified or bare name only resolves when exactly one model
+        matches it on the parts both sides give.
+        """
+        if relation in self.relations:
+            return self.relations[relation]
+        parts = relation.split(".")
+        matches = [
+            unique_id for name, unique_id in self.relations.items()
+            if len(parts) < 3 or name.count(".") < 2
+            if all(a == b for a, b in zip(reversed(parts), reversed(name.split("."))))
+        ]
+        return matches[0] if len(matches) == 1 else None
+
+    def sources(self):
+        """{model unique_id: [source unique_ids]} declared in the manifest"""
+        return {
+            unique_id: sorted(node for node in model.depends_on if node.startswith("source."))
+            for unique_id, model in self.models.items()
+        }
+
+    def errors(self):
+        return {unique_id: result["error"] for unique_id, result in self.results.items() if "error" in result}
+
+    def to_dict(self):
+        return {
+            "stats": self.stats,
+            "lineage": self.lineage(),
+            "sources": self.sources(),
+            "errors": self.errors()
+        }
+
+
+def ingest_project(project_dir, target_path=None, state_path=None, full_refresh=False, processes=0, chunk_size=16):
+    """
+    Parses every compiled model of a dbt project, reusing the persisted
+    result of any model whose compiled SQL checksum is unchanged since the
+    last run (all models are parsed when `full_refresh`). Results for
+    models no longer in the manifest are dropped, and the state is saved
+    back. `processes=0` parses in this process, else in a process pool.
+    """
+    start = time.perf_counter()
+    project_dir = Path(project_dir)
+    target_path = Path(target_path) if target_path else project_dir / "target"
+    models = load_models(project_dir, target_path)
+    state = DbtState.load(state_path or target_path / STATE_NAME)
+    previous = {} if full_refresh else state.models
+
+    results, pending, uncompiled = {}, [], 0
+    for unique_id, model in models.items():
+        sql = model.compiled_sql()
+        if sql is None:
+            results[unique_id] = {"error": "not compiled; run `dbt compile`"}
+            uncompiled += 1
+            continue
+        checksum = statement_digest(sql.encode("utf-8"))
+        cached = previous.get(unique_id)
+        if cached and cached.get("checksum") == checksum:
+            results[unique_id] = cached
+        else:
+            pending.append((unique_id, sql, checksum))
+
+    checksums = {unique_id: checksum for unique_id, _, checksum in pending}
+    items = [(unique_id, sql) for unique_id, sql, _ in pending]
+    if processes == 0 or len(items) <= chunk_size:
+        parsed = [parse_models(items)]
+    else:
+        with ProcessPoolExecutor(max_workers=processes, initializer=quiet_worker) as pool:
+            parsed = list(pool.map(parse_models, chunked(items, chunk_size)))
+    for chunk in parsed:
+        for unique_id, result in chunk.items():
+            result["checksum"] = checksums[unique_id]
+            result["path"] = models[unique_id].path
+            results[unique_id] = result
+
+    state.models = results
+    state.save()
+    stats = {
+        "models": len(models),
+        "parsed": len(pending),
+        "reused": len(models) - len(pending) - uncompiled,
+        "uncompiled": uncompiled,
+        "removed": len(set(previous) - set(models)),
+        "s": round(time.perf_counter() - start, 3)
+    }
+    return DbtIngest(models, results, stats)
@@ -0,0 +1,176 @@
+import sqlparse
+from sqlparse.sql import Identifier, IdentifierList, Parenthesis
+from sqlparse.tokens import CTE, Keyword
+
+from sqlflow.parser import is_empty_statement, parse_sql
+from sqlflow.prefilter import normalize_name, referenced_names
+from sqlflow import utils as u
+
+
+class CTECycleError(ValueError):
+    """Raised when CTE dependencies contain a cycle; `cycles` lists each one as CTE names"""
+
+    def __init__(self, cycles):
+        super().__init__("CTE dependency cycle: " + "; ".join(" -> ".join(cycle + cycle[:1]) for cycle in cycles))
+        self.cycles = cycles
+
+
+def split_with_clause(statement):
+    """
+    (recursive, [(name, body sql)], main query sql) of a sqlparse statement;
+    (False, [], whole statement) when it has no WITH clause.
+    """
+    tokens = list(u.clean_tokens(statement.tokens))
+    if not tokens or not tokens[0].match(CTE, "WITH"):
+        return False, [], str(statement)
+
+    position, recursive = 1, False
+    if position < len(tokens) and tokens[position].match(Keyword, "RECURSIVE"):
+        position, recursive = position + 1, True
+    if position >= len(tokens):
+        return recursive, [], ""
+
+    group = tokens[position]
+    identifiers = group.get_identifiers() if isinstance(group, IdentifierList) else [group]
+    definitions = []
+    for identifier in identifiers:
+        bodies = [t for t in identifier.tokens if isinstance(t, Parenthesis)] if isinstance(identifier, Identifier) else []
+        if bodies:
+            definitions.append((normalize_name(identifier.get_name()), bodies[-1].value[1:-1]))
+
+    main = "".join(str(token) for token in statement.tokens[statement.tokens.index(group) + 1:])
+    return recursive, definitions, main
+
+
+def read_names(sql):
+    """Normalized names of every relation `sql` reads (tables and CTEs alike)"""
+    names = set()
+    for tree, _ in parse_sql(sql):
+        tables, _ = referenced_names(tree)
+        names |= tables
+    return names
+
+
+class CTEGraph:
+    """
+    Dependency DAG of the CTEs in one statement.
+
+    `reads[name]` holds the CTEs a CTE reads, `tables[name]` the base tables
+    it reads, and `main_reads` the CTEs read by the final query. Names are
+    normalized (lowercased, unqualified). A CTE that reads itself is only
+    legal under WITH RECURSIVE; that self-edge is kept in `self_references`
+    and left out of cycles and stages.
+    """
+
+    def __init__(self, definitions, main_sql="", recursive=False):
+        self.recursive = recursive
+        self.ctes = dict(definitions)
+        names = set(self.ctes)
+        self.reads, self.tables, self.self_references = {}, {}, set()
+        for name, body in self.ctes.items():
+            relations = read_names(body)
+            if name in relations and recursive:
+                self.self_references.add(name)
+                relations.discard(name)
+            self.reads[name] = relations & names
+            self.tables[name] = relations - names
+        self.main_reads = read_names(main_sql) & names if main_sql.strip() else set()
+
+    @classmethod
+    def from_statement(cls, statement):
+        recursive, definitions, main_sql = split_with_clause(statement)
+        return cls(definitions, main_sql, recursive)
+
+    def cycles(self):
+        """Every strongly connected group of CTEs that depend on each other (Tarjan), as name lists"""
+        index, low, on_stack, stack, cycles = {}, {}, set(), [], []
+
+        def visit(name):
+            index[name] = low[name] = len(index)
+            stack.append(name)
+            on_stack.add(name)
+            for dependency in sorted(self.reads[name]):
+                if dependency not in index:
+                    visit(dependency)
+                    low[name] = min(low[name], low[dependency])
+                elif dependency in on_stack:
+                    low[name] = min(low[name], index[dependency])
+            if low[name] == index[name]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == name:
+                        break
+                if len(component) > 1 or name in self.reads[name]:
+                    cycles.append(component[::-1])
+
+        for name in self.ctes:
+            if name not in index:
+                visit(name)
+        return cycles
+
+    def stages(self):
+        """
+        Topological stages: every CTE in a stage depends only on CTEs in
+        earlier stages, so each stage can be materialized in parallel.
+        Raises CTECycleError when the dependencies are not a DAG.
+        """
+        cycles = self.cycles()
+        if cycles:
+            raise CTECycleError(cycles)
+        remaining = {name: set(reads) for name, reads in self.reads.items()}
+        stages = []
+        while remaining:
+            ready = [name for name in self.ctes if name in remaining and not remaining[name]]
+            stages.append(ready)
+            for name in ready:
+                del remaining[name]
+            for reads in remaining.values():
+                reads.difference_update(ready)
+        return stages
+
+    def critical_path(self, weights=None):
+        """
+        Heaviest dependency chain ([names], total weight); `weights` maps CTE
+        names to a cost (default 1 each, giving the longest chain). This is
+        the lower bound on wall time however many stages run in parallel.
+        """
+        weights = weights or {}
+        best, previous = {}, {}
+        for stage in self.stages():
+            for name in stage:
+                before = max(self.reads[name], key=lambda dependency: best[dependency], default=None)
+                best[name] = weights.get(name, 1) + (best[before] if before is not None else 0)
+                previous[name] = before
+        if not best:
+            return [], 0
+        name = max(self.ctes, key=lambda cte: best[cte])
+        total, path = best[name], []
+        while name is not None:
+            path.append(name)
+            name = previous[name]
+        return path[::-1], total
+
+    def to_dict(self):
+        cycles = self.cycles()
+        result = {
+            "recursive": self.recursive,
+            "ctes": {
+                name: {"reads": sorted(self.reads[name]), "tables": sorted(self.tables[name])}
+                for name in self.ctes
+            },
+            "main_reads": sorted(self.main_reads),
+            "self_references": sorted(self.self_references),
+            "cycles": cycles
+        }
+        if not cycles:
+            path, total = self.critical_path()
+            result.update(stages=self.stages(), critical_path=path, critical_path_length=total)
+        return result
+
+
+def cte_graphs(sql):
+    """One CTEGraph per statement in a SQL string (statements without a WITH clause give empty graphs)"""
+    return [CTEGraph.from_statement(statement) for statement in sqlparse.parse(sql) if not is_empty_statement(statement)]
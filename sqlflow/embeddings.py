@@ -0,0 +1,194 @@
+import hashlib
+
+import numpy as np
+
+from sqlflow.vectorize import get_token_name
+
+
+# how much each node class's mean vector counts in a query vector; classes not listed are skipped
+TYPE_WEIGHTS = {"SQLTable": 2.0, "SQLColumn": 1.0, "SQLFeature": 0.5}
+FALLBACK_WEIGHT = 0.5  # unseen nodes count less than trained ones
+FALLBACK_CACHE_SIZE = 100000
+
+
+def export_edgelist(triples, path):
+    """Writes triples as a tab-separated `subject object` edge list, the input node2vec tools (e.g. pecanpy) train on"""
+    with open(path, "w") as f:
+        for subject, _, object_ in sorted(triples):
+            f.write(f"{subject}\t{object_}\n")
+    return path
+
+
+class NodeEmbeddings:
+    """Trained vectors keyed by node uri: a (n_nodes, dim) float32 matrix and a uri -> row map"""
+
+    def __init__(self, keys, vectors):
+        self.keys = list(keys)
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if self.vectors.ndim != 2 or len(self.keys) != len(self.vectors):
+            raise ValueError(f"Expected one vector per key, got {len(self.keys)} keys and shape {self.vectors.shape}")
+        self.rows = {key: row for row, key in enumerate(self.keys)}
+
+    @property
+    def dim(self):
+        return self.vectors.shape[1]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return key in self.rows
+
+    def __getitem__(self, key):
+        return self.vectors[self.rows[key]]
+
+    @classmethod
+    def from_dict(cls, vectors):
+        keys = list(vectors)
+        return cls(keys, np.array([vectors[key] for key in keys], dtype=np.float32).reshape(len(keys), -1))
+
+    @classmethod
+    def load(cls, path):
+        """Reads `.npz` (keys, vectors) as written by `save`, or word2vec text format (`n dim` header, then `key v1 ... vdim`)"""
+        path = str(path)
+        if path.endswith(".npz"):
+            with np.load(path, allow_pickle=False) as data:
+                return cls(data["keys"].tolist(), data["vectors"])
+        keys, rows = [], []
+        with open(path) as f:
+            header = f.readline().split()
+            dim = int(header[1])
+            for line in f:
+                parts = line.rstrip("\n").rsplit(" ", dim)
+                if len(parts) == dim + 1:
+                    keys.append(parts[0])
+                    rows.append(parts[1:])
+        return cls(keys, np.array(rows, dtype=np.float32).reshape(len(keys), dim))
+
+    def save(self, path):
+        np.savez(path, keys=np.array(self.keys), vectors=self.vectors)
+
+
+class QueryEmbedder:
+    """
+    Composes a query vector from trained node embeddings, so a freshly
+    parsed query can be compared with the corpus without retraining.
+
+    Nodes of the classes in `weights` are looked up by `SQLNode.uri`
+    (tables and columns resolve to the same uri in every query). A node
+    with no trained vector gets a deterministic hash vector for its class
+    and real name, so an unseen table still matches itself across queries;
+    it is scaled by `fallback_weight`. Each class's vectors are averaged,
+    the class means are summed with their weights, and the result is L2
+    normalized, so dot products are cosine similarities.
+    """
+
+    def __init__(self, embeddings, weights=None, fallback_weight=FALLBACK_WEIGHT, seed=0):
+        self.embeddings = embeddings
+        self.weights = dict(TYPE_WEIGHTS if weights is None else weights)
+        self.fallback_weight = fallback_weight
+        self.seed = seed
+        self._fallbacks = {}
+        self._rows = {}  # (class, parent, alias, token text) -> embedding row or None; skips building uri strings
+
+    @property
+    def dim(self):
+        return self.embeddings.dim
+
+    def fallback(self, node):
+        """Unit vector derived from a hash of the node's class and real name (or text)"""
+        key = f"{node.type}\0{get_token_name(node.token) or node.token.value.strip().lower()}"
+        vector = self._fallbacks.get(key)
+        if vector is None:
+            digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8, salt=self.seed.to_bytes(8, "little")).digest()
+            vector = np.random.default_rng(int.from_bytes(digest, "little")).standard_normal(self.dim).astype(np.float32)
+            vector *= self.fallback_weight / np.linalg.norm(vector)
+            if len(self._fallbacks) < FALLBACK_CACHE_SIZE:
+                self._fallbacks[key] = vector
+        return vector
+
+    def embed(self, tree, out=None):
+        """The (dim,) float32 vector of one SQLTree (or root SQLNode); all zeros when no node has a weight"""
+        found, found_types, unseen, unseen_types, counts = [], [], [], [], {}
+        weights, rows, cache = self.weights, self.embeddings.rows, self._rows
+        stack = [getattr(tree, "root", tree)]
+        while stack:
+            node = stack.pop()
+            stack.extend(node.children)
+            node_type = node.type
+            if node_type not in weights:
+                continue
+            counts[node_type] = counts.get(node_type, 0) + 1
+            # a node's name defaults to (or is resolved from) its token, so this key determines its uri
+            key = (node_type, node.parent, node.alias, node.token.value)
+            row = cache.get(key, -1)
+            if row == -1:
+                row = rows.get(node.uri)
+                if len(cache) < FALLBACK_CACHE_SIZE:
+                    cache[key] = row
+            if row is None:
+                unseen.append(self.fallback(node))
+                unseen_types.append(node_type)
+            else:
+                found.append(row)
+                found_types.append(node_type)
+
+        # one weighted sum per source: each node counts weight / (nodes of its class)
+        vector = np.zeros(self.dim, dtype=np.float32) if out is None else out
+        vector[:] = 0
+        if found:
+            coefficients = np.array([weights[t] / counts[t] for t in found_types], dtype=np.float32)
+            vector += coefficients @ self.embeddings.vectors[found]
+        if unseen:
+            coefficients = np.array([weights[t] / counts[t] for t in unseen_types], dtype=np.float32)
+            vector += coefficients @ np.array(unseen)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+    def embed_many(self, trees):
+        """(len(trees), dim) matrix of query vectors, one row per tree"""
+        trees = list(trees)
+        matrix = np.zeros((len(trees), self.dim), dtype=np.float32)
+        for row, tree in enumerate(trees):
+            self.embed(tree, matrix[row])
+        return matrix
+
+    def coverage(self, tree):
+        """Share of weighted nodes that had a trained vector"""
+        known = total = 0
+        stack = [getattr(tree, "root", tree)]
+        while stack:
+            node = stack.pop()
+            stack.extend(node.children)
+            if node.type in self.weights:
+                total += 1
+                known += node.uri in self.embeddings.rows
+        return known / total if total else 0.0
+
+
+def cosine_scores(queries, corpus):
+    """
+    Cosine similarity of every query vector (n, dim) or (dim,) with every
+    corpus vector (m, dim) as one matrix product; rows of zeros score 0.
+    """
+    queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+    corpus = np.asarray(corpus, dtype=np.float32)
+    query_norms = np.linalg.norm(queries, axis=1, keepdims=True)
+    corpus_norms = np.linalg.norm(corpus, axis=1)
+    scores = queries @ corpus.T
+    np.divide(scores, query_norms * corpus_norms, out=scores, where=(query_norms * corpus_norms) > 0)
+    return scores
+
+
+def top_k(scores, k=10):
+    """(indices, scores) of the `k` best corpus rows for each query row, best first"""
+    scores = np.atleast_2d(scores)
+    k = min(k, scores.shape[1])
+    if k == 0:
+        return np.empty((len(scores), 0), dtype=np.intp), np.empty((len(scores), 0), dtype=scores.dtype)
+    candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=1), np.take_along_axis(candidate_scores, order, axis=1)
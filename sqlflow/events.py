@@ -0,0 +1,128 @@
+import sqlparse
+
+from sqlflow.context import ParsingContext
+from sqlflow.parser import SQLTree, is_empty_statement
+from sqlflow.profiles import get_profile
+from sqlflow.registry import HandlerType
+from sqlflow import fastpath as f
+
+
+class ParseEvent:
+    """
+    What a callback receives: the node's class name, display name, level and
+    sqlparse token, plus the statement's position in the input. Events hold
+    no reference to the SQLNode itself.
+    """
+
+    __slots__ = ["type", "name", "level", "token", "statement"]
+
+    def __init__(self, node, statement):
+        self.type = node.type
+        self.name = node.name
+        self.level = node.level
+        self.token = node.token
+        self.statement = statement
+
+    def __repr__(self):
+        return f"ParseEvent({self.type}, {self.name!r}, level={self.level})"
+
+
+class ChildSink:
+    """
+    Stands in for a node's `children` list: attaching a child fires `on_node`
+    and then forgets it, so nodes are freed as soon as their handler returns.
+    """
+
+    __slots__ = ["tree"]
+
+    def __init__(self, tree):
+        self.tree = tree
+
+    def append(self, node):
+        self.tree.emit(self.tree.on_node, node)
+
+    def extend(self, nodes):
+        for node in nodes:
+            self.tree.emit(self.tree.on_node, node)
+
+    def __iter__(self):
+        return iter(())
+
+    def __len__(self):
+        return 0
+
+
+class EventTree(SQLTree):
+    """
+    Runs the regular handlers but reports nodes through callbacks instead of
+    building a tree. A node is entered the first time a handler passes it to
+    the parser as a parent and exited when that call returns, so for each
+    container the order is on_node, on_enter, (its children's events), on_exit.
+    Only the nodes on the current path are alive at any time.
+    """
+
+    def __init__(self, root_token, on_enter=None, on_exit=None, on_node=None, statement=0):
+        super().__init__(root_token)
+        self.on_enter = on_enter
+        self.on_exit = on_exit
+        self.on_node = on_node
+        self.statement = statement
+        self.open = []
+
+    def emit(self, callback, node):
+        if callback is not None:
+            callback(ParseEvent(node, self.statement))
+
+    def enter(self, parent):
+        """True when `parent` was not already open, i.e. the caller must `exit` it afterwards"""
+        if any(parent is node for node in reversed(self.open)):
+            return False
+        parent.children = ChildSink(self)
+        self.open.append(parent)
+        self.emit(self.on_enter, parent)
+        return True
+
+    def exit(self):
+        self.emit(self.on_exit, self.open.pop())
+
+    def parse_tokens(self, tokens, parent, context=None):
+        entered = self.enter(parent)
+        try:
+            super().parse_tokens(tokens, parent, context)
+        finally:
+            if entered:
+                self.exit()
+
+    def assign_handler(self, token, parent, context, handler_type: HandlerType = HandlerType.UNKNOWN):
+        entered = self.enter(parent)
+        try:
+            super().assign_handler(token, parent, context, handler_type)
+        finally:
+            if entered:
+                self.exit()
+
+
+def parse_events(sql, on_enter=None, on_exit=None, on_node=None, fast=False, profile=None, max_depth=None):
+    """
+    SAX-style parse: drives the same handlers as `parse_sql`, calling
+    `on_node(event)` for every node created, and `on_enter(event)` /
+    `on_exit(event)` around every node that gets children (each statement's
+    SQLQuery root included). No tree or triple set is kept, so memory does
+    not grow with the size of the query. Returns the number of statements.
+
+    The options match `parse_sql`; a profile skips building (and reporting)
+    the node kinds it excludes.
+    """
+    collapsed = None
+    if fast:
+        sql, collapsed = f.collapse_sql(sql)
+    profile = get_profile(profile, max_depth)
+    statements = 0
+    for statement in sqlparse.parse(sql):
+        if is_empty_statement(statement):
+            continue
+        tree = EventTree(statement, on_enter, on_exit, on_node, statements)
+        context = ParsingContext(collapsed=collapsed, profile=profile, collect_triples=False)
+        tree.parse_tokens(statement.tokens, tree.root, context)
+        statements += 1
+    return statements
@@ -0,0 +1,337 @@
+import re
+
+import sqlparse
+from sqlparse.keywords import KEYWORDS, KEYWORDS_COMMON
+from sqlparse.sql import Identifier, IdentifierList, Token
+from sqlparse.tokens import DML, Keyword, Name, Punctuation, Whitespace
+
+from sqlflow.utils import TOKEN_PATTERN, clean_tokens
+
+
+LITERAL_LIST_THRESHOLD = 16   # literals in one `( ... )` list, or rows after VALUES
+WIDE_LIST_THRESHOLD = 256     # items in one SELECT list
+COLUMN_BATCH_SIZE = 128       # select items handed to sqlparse at once
+SAMPLE_SIZE = 5
+PLACEHOLDER = "__sqlflow_list_{}__"
+PLACEHOLDER_TOKEN_PATTERN = re.compile(r"(?:VALUES\s*)?\(?\s*(__sqlflow_list_\d+__)\s*\)?", re.IGNORECASE)
+SELECT_MODIFIERS = frozenset(["DISTINCT", "ALL"])
+SELECT_TERMINATORS = frozenset(["FROM", "INTO", "WHERE", "GROUP", "ORDER", "HAVING", "LIMIT", "UNION", "EXCEPT", "INTERSECT"])
+BOOLEANS = frozenset(["TRUE", "FALSE"])
+SIMPLE_COLUMN_PATTERN = re.compile(r"([A-Za-z_]\w*(?:\.[A-Za-z_]\w*){0,2})(?:\s+(AS\s+)?([A-Za-z_]\w*))?", re.IGNORECASE)
+
+
+class LiteralSummary:
+    """Stands in for a collapsed literal list: how many items, of which type, their range and a sample"""
+
+    __slots__ = ["count", "type", "minimum", "maximum", "nulls", "sample"]
+
+    def __init__(self, count, type, minimum=None, maximum=None, nulls=0, sample=None):
+        self.count = count
+        self.type = type
+        self.minimum = minimum
+        self.maximum = maximum
+        self.nulls = nulls
+        self.sample = sample or []
+
+    def describe(self):
+        if self.type.startswith("("):
+            return f"{self.count} rows of {self.type}"
+        bounds = f" [{self.minimum} .. {self.maximum}]" if self.minimum is not None else ""
+        return f"{self.count} {self.type} literals{bounds}"
+
+    def to_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __repr__(self):
+        return f"LiteralSummary({self.describe()})"
+
+
+class ColumnBatch:
+    """Stands in for a very wide select list; see `tokens`"""
+
+    __slots__ = ["items"]
+
+    def __init__(self, items):
+        self.items = items
+
+    def tokens(self, batch_size=COLUMN_BATCH_SIZE):
+        """
+        One sqlparse token per select item, in order. Plain column references
+        get hand-built Identifiers; only the remaining items go through
+        sqlparse, `batch_size` at a time, so cost stays linear in the width.
+        """
+        tokens = [simple_column_token(item) for item in self.items]
+        pending = [i for i, token in enumerate(tokens) if token is None]
+        for start in range(0, len(pending), batch_size):
+            indices = pending[start:start + batch_size]
+            parsed = parse_select_items([self.items[i] for i in indices])
+            if len(parsed) != len(indices):  # sqlparse grouped the batch unexpectedly; go item by item
+                parsed = [token for i in indices for token in parse_select_items([self.items[i]])]
+            for i, token in zip(indices, parsed):
+                tokens[i] = token
+        return [token for token in tokens if token is not None]
+
+
+def is_keyword_name(word):
+    upper = word.upper()
+    return upper in KEYWORDS or upper in KEYWORDS_COMMON
+
+
+def simple_column_token(item):
+    """Hand-built Identifier for a plain `[schema.][table.]column [[AS] alias]` item, else None"""
+    match = SIMPLE_COLUMN_PATTERN.fullmatch(item)
+    if match is None:
+        return None
+    path, as_keyword, alias = match.groups()
+    names = path.split(".")
+    if any(is_keyword_name(word) for word in names + ([alias] if alias else [])):
+        return None
+
+    tokens = []
+    for i, name in enumerate(names):
+        if i:
+            tokens.append(Token(Punctuation, "."))
+        tokens.append(Token(Name, name))
+    if alias:
+        tokens.append(Token(Whitespace, " "))
+        if as_keyword:
+            tokens.extend([Token(Keyword, as_keyword.strip()), Token(Whitespace, " ")])
+        tokens.append(Identifier([Token(Name, alias)]))
+    return Identifier(tokens)
+
+
+def parse_select_items(items):
+    """Select-list tokens of `SELECT <items>` as grouped by sqlparse"""
+    statement = sqlparse.parse("SELECT " + ", ".join(items))[0]
+    tokens = [token for token in clean_tokens(statement.tokens) if not token.match(DML, ["SELECT"])]
+    if len(tokens) == 1 and isinstance(tokens[0], IdentifierList):
+        return list(clean_tokens(tokens[0].tokens))
+    return tokens
+
+
+def literal_kind(kind, value):
+    if kind == "string":
+        return "string"
+    if kind == "number":
+        return "float" if any(c in value for c in ".eE") else "integer"
+    upper = value.upper()
+    if upper == "NULL":
+        return "null"
+    if upper in BOOLEANS:
+        return "boolean"
+    return None
+
+
+def literal_value(kind, text):
+    if kind == "integer":
+        return int(text)
+    if kind == "float":
+        return float(text)
+    if kind == "string":
+        return text[text.index("'") + 1:-1].replace("''", "'") if text.endswith("'") else text
+    return text
+
+
+def column_type(kinds):
+    """Single type of a homogeneous column of literal kinds (NULLs allowed), else None"""
+    types = set(kinds) - {"null"}
+    if types == {"integer", "float"}:
+        return "float"
+    if len(types) > 1:
+        return None
+    return types.pop() if types else "null"
+
+
+def summarize_literals(literals):
+    """LiteralSummary of [(kind, text)], or None when the list mixes types"""
+    kind = column_type(k for k, _ in literals)
+    if kind is None:
+        return None
+    values = [literal_value(kind if k != "null" else k, text) for k, text in literals if k != "null"]
+    comparable = values and kind in ("integer", "float", "string")
+    return LiteralSummary(
+        count=len(literals),
+        type=kind,
+        minimum=min(values) if comparable else None,
+        maximum=max(values) if comparable else None,
+        nulls=len(literals) - len(values),
+        sample=[text for _, text in literals[:SAMPLE_SIZE]]
+    )
+
+
+def summarize_rows(rows, texts):
+    """LiteralSummary of VALUES rows, or None unless every row has the same arity and column types"""
+    if len({len(row) for row in rows}) != 1:
+        return None
+    types = [column_type(k for k, _ in column) for column in zip(*rows)]
+    if None in types:
+        return None
+    return LiteralSummary(
+        count=len(rows),
+        type="(" + ", ".join(types) + ")",
+        nulls=sum(k == "null" for row in rows for k, _ in row),
+        sample=texts[:SAMPLE_SIZE]
+    )
+
+
+class _Frame:
+    """Lexer state for one parenthesis level"""
+
+    __slots__ = ["start", "in_list", "previous", "literals", "literal_only", "expect_item", "sign", "rows", "rows_start", "rows_end", "select"]
+
+    def __init__(self, start, in_list=False):
+        self.start = start
+        self.in_list = in_list   # opened right after IN, so a literal list here is a set of values, not arguments
+        self.previous = None     # last token seen at this level, uppercased
+        self.literals = []
+        self.literal_only = True
+        self.expect_item = True
+        self.sign = ""
+        self.rows = None         # [(literals, text)] of a VALUES run in progress
+        self.rows_start = self.rows_end = None
+        self.select = None       # [item start offsets] of a SELECT list in progress
+
+
+class Collapser:
+    """
+    One lexical pass over a SQL string that replaces long homogeneous literal
+    lists after IN, long VALUES row lists and very wide SELECT lists with placeholder
+    identifiers, before sqlparse ever sees them. `collapsed` maps each
+    placeholder to the LiteralSummary or ColumnBatch it stands for.
+    """
+
+    def __init__(self, sql, literal_threshold=LITERAL_LIST_THRESHOLD, wide_threshold=WIDE_LIST_THRESHOLD):
+        self.sql = sql
+        self.literal_threshold = literal_threshold
+        self.wide_threshold = wide_threshold
+        self.collapsed = {}
+        self.spans = []  # (start, end, placeholder text), non-overlapping
+
+    def collapse(self):
+        frames = [_Frame(0)]
+        for match in TOKEN_PATTERN.finditer(self.sql):
+            kind, value = match.lastgroup, match.group()
+            if kind in ("space", "comment"):
+                continue
+            frame = frames[-1]
+
+            if value == "(":
+                frame.literal_only = False
+                frames.append(_Frame(match.start(), in_list=frame.previous == "IN"))
+                frame.previous = value
+                continue
+            if value == ")" and len(frames) > 1:
+                self._end_select(frame, match.start())
+                frames.pop()
+                self._close(frame, frames[-1], match.end())
+                frames[-1].previous = value
+                continue
+            frame.previous = value.upper()
+
+            if frame.rows is not None and value != ",":
+                self._end_rows(frame)
+            self._track_literals(frame, kind, value)
+            self._track_select(frame, kind, value, match)
+            if kind == "word" and value.upper() == "VALUES":
+                frame.rows, frame.rows_start = [], None
+
+        self._end_rows(frames[-1])
+        self._end_select(frames[-1], len(self.sql))
+        return self.render(0, len(self.sql)), self.collapsed
+
+    def _track_literals(self, frame, kind, value):
+        if not frame.literal_only:
+            return
+        if value == ",":
+            frame.literal_only = not frame.expect_item
+            frame.expect_item = True
+            return
+        if value in ("-", "+") and frame.expect_item and not frame.sign:
+            frame.sign = value
+            return
+        literal = literal_kind(kind, value) if frame.expect_item else None
+        if literal is None or (frame.sign and literal not in ("integer", "float")):
+            frame.literal_only = False
+            return
+        frame.literals.append((literal, frame.sign.replace("+", "") + value))
+        frame.sign = ""
+        frame.expect_item = False
+
+    def _track_select(self, frame, kind, value, match):
+        if kind == "word" and value.upper() == "SELECT":
+            self._end_select(frame, match.start())
+            frame.select = [match.end()]
+        elif frame.select is None:
+            return
+        elif kind == "word" and value.upper() in SELECT_MODIFIERS and len(frame.select) == 1 and self._is_blank(frame.select[0], match.start()):
+            frame.select[0] = match.end()
+        elif value == ",":
+            frame.select.append(match.end())
+        elif value == ";" or (kind == "word" and value.upper() in SELECT_TERMINATORS):
+            self._end_select(frame, match.start())
+
+    def _close(self, frame, parent, end):
+        """A `( ... )` just closed: collapse it, or record it as one row of the parent's VALUES run"""
+        complete = frame.literal_only and frame.literals and not frame.expect_item
+        if parent.rows is not None:
+            if complete:
+                if not parent.rows:
+                    parent.rows_start = frame.start
+                parent.rows.append((frame.literals, self.sql[frame.start:end]))
+                parent.rows_end = end
+            else:
+                self._end_rows(parent)
+        elif complete and frame.in_list and len(frame.literals) >= self.literal_threshold:
+            summary = summarize_literals(frame.literals)
+            if summary is not None:
+                self._replace(frame.start, end, summary, parenthesize=True)
+
+    def _end_rows(self, frame):
+        rows, frame.rows = frame.rows, None
+        if not rows or len(rows) < self.literal_threshold:
+            return
+        summary = summarize_rows([literals for literals, _ in rows], [text for _, text in rows])
+        if summary is not None:
+            self._replace(frame.rows_start, frame.rows_end, summary, parenthesize=True)
+
+    def _end_select(self, frame, end):
+        starts, frame.select = frame.select, None
+        if not starts or len(starts) < self.wide_threshold:
+            return
+        bounds = list(zip(starts, [start - 1 for start in starts[1:]] + [end]))
+        items = [self.render(start, stop).strip() for start, stop in bounds]
+        self._replace(starts[0], end, ColumnBatch(items), parenthesize=False)
+
+    def _replace(self, start, end, value, parenthesize):
+        placeholder = PLACEHOLDER.format(len(self.collapsed))
+        self.collapsed[placeholder] = value
+        # spans inside this one are either rendered into ColumnBatch items already or superseded
+        self.spans = [span for span in self.spans if not (start <= span[0] and span[1] <= end)]
+        self.spans.append((start, end, f"({placeholder})" if parenthesize else f" {placeholder} "))
+
+    def _is_blank(self, start, end):
+        return not self.sql[start:end].strip()
+
+    def render(self, start, end):
+        """sql[start:end] with every collapsed span inside it replaced by its placeholder"""
+        out, position = [], start
+        for span_start, span_end, text in sorted(self.spans):
+            if start <= span_start and span_end <= end:
+                out.append(self.sql[position:span_start])
+                out.append(text)
+                position = span_end
+        out.append(self.sql[position:end])
+        return "".join(out)
+
+
+def collapse_sql(sql, literal_threshold=LITERAL_LIST_THRESHOLD, wide_threshold=WIDE_LIST_THRESHOLD):
+    """Returns (rewritten sql, {placeholder: LiteralSummary | ColumnBatch}); see `Collapser`"""
+    return Collapser(sql, literal_threshold, wide_threshold).collapse()
+
+
+def get_collapsed(token, context):
+    """The LiteralSummary/ColumnBatch a placeholder token (`x`, `(x)` or `VALUES (x)`) stands for, if any"""
+    if context is None or not context.collapsed or len(token.value) > 64:
+        return None
+    match = PLACEHOLDER_TOKEN_PATTERN.fullmatch(token.value.strip())
+    return context.collapsed.get(match.group(1)) if match else None
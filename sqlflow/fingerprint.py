@@ -0,0 +1,147 @@
+import hashlib
+from abc import ABC, abstractmethod
+
+from sqlparse.keywords import KEYWORDS, KEYWORDS_COMMON
+
+from sqlflow import parser as s
+from sqlflow.utils import TOKEN_PATTERN
+
+
+PLACEHOLDER = "?"
+LIST_PLACEHOLDER = "?+"
+
+
+def normalize_query(sql):
+    """
+    Single-pass canonical form of a query: comments and whitespace are dropped,
+    keywords are uppercased, other identifiers lowercased, literals and bind
+    parameters become `?`, and literal IN-lists of any length become `(?+)`.
+    """
+    out = []
+    in_list_start = None
+    for match in TOKEN_PATTERN.finditer(sql):
+        kind = match.lastgroup
+        value = match.group()
+
+        if kind in ("space", "comment"):
+            continue
+        elif kind in ("string", "number", "param"):
+            value = PLACEHOLDER
+        elif kind == "word":
+            upper = value.upper()
+            value = upper if (upper in KEYWORDS or upper in KEYWORDS_COMMON) else value.lower()
+        elif value == ";":
+            continue
+
+        if value == "(":
+            in_list_start = len(out) + 1 if (out and out[-1] == "IN") else None
+        elif value == ")" and in_list_start is not None:
+            items = out[in_list_start:]
+            if items and all(item in (PLACEHOLDER, ",") for item in items):
+                out[in_list_start:] = [LIST_PLACEHOLDER]
+            in_list_start = None
+        elif in_list_start is not None and value not in (PLACEHOLDER, ","):
+            in_list_start = None
+
+        out.append(value)
+
+    return " ".join(out).replace(" . ", ".")
+
+
+def fingerprint(sql):
+    """Stable hex digest of a query's shape (see `normalize_query`)"""
+    return hashlib.blake2b(normalize_query(sql).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class QueryShape:
+    """A distinct query shape: its normalized text, one representative query and how often it occurred"""
+
+    __slots__ = ["fingerprint", "normalized", "representative", "count"]
+
+    def __init__(self, fingerprint, normalized, representative, count=0):
+        self.fingerprint = fingerprint
+        self.normalized = normalized
+        self.representative = representative
+        self.count = count
+
+    def __repr__(self):
+        return f"QueryShape({self.fingerprint}, count={self.count})"
+
+
+def group_queries(queries):
+    """Groups raw queries by shape in first-seen order; returns {fingerprint: QueryShape}"""
+    shapes = {}
+    for sql in queries:
+        normalized = normalize_query(sql)
+        digest = hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+        shape = shapes.get(digest)
+        if shape is None:
+            shape = shapes[digest] = QueryShape(digest, normalized, sql)
+        shape.count += 1
+    return shapes
+
+
+def parse_unique(queries):
+    """
+    Fully parses only one representative per query shape.
+
+    Returns a list of (QueryShape, SQLTree, ParsingContext) per parsed statement.
+    Each statement's context carries `has_fingerprint` and `has_occurrences`
+    triples so counts survive into downstream triple stores.
+    """
+    results = []
+    for shape in group_queries(queries).values():
+        for tree, context in s.parse_sql(shape.representative):
+            context.add_triple(tree.root.uri, "has_fingerprint", shape.fingerprint)
+            context.add_triple(tree.root.uri, "has_occurrences", str(shape.count))
+            results.append((shape, tree, context))
+    return results
+
+
+class ShapeAggregator(ABC):
+    """
+    Base for streaming per-query statistics. `add` parses each query shape
+    once (keeping up to `cache_size` shapes' summaries), then folds the
+    summary into the subclass's totals with the query's weight.
+    """
+
+    def __init__(self, cache_size):
+        self.cache_size = cache_size
+        self.queries = 0
+        self.errors = 0
+        self._shapes = {}
+
+    @abstractmethod
+    def summarize(self, trees):
+        pass
+
+    @abstractmethod
+    def fold(self, summary, weight, query):
+        pass
+
+    def summary(self, sql):
+        """Summary of one query, reused for every later query of the same shape"""
+        shape = fingerprint(sql)
+        summary = self._shapes.get(shape)
+        if summary is None:
+            summary = self.summarize([tree for tree, _ in s.parse_sql(sql)])
+            if len(self._shapes) < self.cache_size:
+                self._shapes[shape] = summary
+        return summary
+
+    def add(self, sql, weight=1, query=None):
+        query = self.queries if query is None else query
+        self.queries += 1
+        try:
+            summary = self.summary(sql)
+        except Exception:
+            self.errors += 1
+            return
+        self.fold(summary, weight, query)
+
+    def add_many(self, queries):
+        """Adds SQL strings or (sql, weight) pairs; query ids are positions in the stream"""
+        for item in queries:
+            sql, weight = (item, 1) if isinstance(item, str) else item
+            self.add(sql, weight)
+        return self
@@ -19,6 +19,7 @@ class HandlerType(Enum):
     IDENTIFIER = auto()
     KEYWORD = auto()
     LITERAL = auto()
+    LITERAL_LIST = auto()
     OPERATOR = auto()
     SUBQUERY = auto()
     TABLE = auto()
@@ -42,6 +43,24 @@ def is_logical_operator(token, context):
     return (token.ttype == Operator)
 
 
+def emits(context, handler_type):
+    """False when the context's extraction profile excludes this handler's nodes"""
+    return context is None or context.profile is None or context.profile.emits(handler_type)
+
+
+def descends(context, handler_type, token=None):
+    """False when a container handler should not recurse into `token`: nothing wanted inside, or max depth reached"""
+    return context is None or context.profile is None or context.profile.descends(handler_type, context.depth, token)
+
+
+def descend(parser, token, parent, context, created=None):
+    """Parses `token` into `parent`, or defers it to the node's first `children` access when lazy and the handler `created` it"""
+    if created is not None and context.lazy:
+        created.defer(parser, token, context)
+    else:
+        parser.parse_tokens(token, parent, context)
+
+
 class BaseHandler(ABC):
     @abstractmethod
     def handle(self, token, parent, parser, context):
@@ -54,9 +73,10 @@ class KeywordHandler(BaseHandler):
         NOTE: `parser` and `context` attributes intentionally unused 
         here unless handling subqueries
         """
-        keyword_node = n.SQLKeyword(token)
-        parent.add_child(keyword_node, context)
-        u.log_parsing_step('Keyword added', keyword_node, level=1)
+        if emits(context, HandlerType.KEYWORD):
+            keyword_node = n.SQLKeyword(token)
+            parent.add_child(keyword_node, context)
+            u.log_parsing_step('Keyword added', keyword_node, level=1)
         context.last_keyword = token
 
 
@@ -66,6 +86,8 @@ class OperatorHandler(BaseHandler):
         NOTE: `parser` and `context` attributes intentionally unused 
         here unless handling subqueries
         """
+        if not emits(context, HandlerType.OPERATOR):
+            return
         operator_node = n.SQLOperator(token)
         parent.add_child(operator_node, context)
         u.log_parsing_step('Operator added!', operator_node, level=2)
@@ -77,6 +99,8 @@ class LiteralHandler(BaseHandler):
         NOTE: `parser` and `context` attributes intentionally unused 
         here unless handling subqueries
         """
+        if not emits(context, HandlerType.LITERAL):
+            return
         literal_node = n.SQLLiteral(token)
         parent.add_child(literal_node, context)
         u.log_parsing_step('Literal added!', literal_node, level=2)
@@ -88,6 +112,8 @@ class UnknownHandler(BaseHandler):
         NOTE: `parser` and `context` attributes intentionally unused 
         here unless handling subqueries
         """
+        if not emits(context, HandlerType.UNKNOWN):
+            return
         unknown_node = n.SQLNode(token)
         parent.add_child(unknown_node, context)
         u.log_parsing_step('Unknown Node added!', unknown_node, level=2)
@@ -1,8 +1,8 @@
-
 from sqlparse.sql import Identifier, IdentifierList
 from sqlparse.tokens import Keyword, DML
-from sqlflow.handlers.base import HandlerType, BaseHandler
+from sqlflow.handlers.base import HandlerType, BaseHandler, emits, descends
 from sqlflow.handlers.feature import is_feature
+from sqlflow.fastpath import ColumnBatch, get_collapsed
 from sqlflow import (
     nodes as n,
     utils as u
@@ -16,16 +16,28 @@ def is_column(token, context):
     )
 
 
+def is_column_batch(token, context):
+    return isinstance(get_collapsed(token, context), ColumnBatch)
+
+
 class ColumnHandler(BaseHandler):
     def handle(self, token, parent, parser, context):
+        if not emits(context, HandlerType.COLUMN) and not descends(context, HandlerType.FEATURE, token):
+            return
+
         if is_feature(token, context):
             parser.assign_handler(token, parent, context.copy(), HandlerType.FEATURE)
 
+        elif not emits(context, HandlerType.COLUMN):
+            return
+
+        elif is_column_batch(token, context):
+            self.handle_batch(get_collapsed(token, context), parent, parser, context)
+
         elif isinstance(token, IdentifierList):
-            for sub_token in u.clean_tokens(token.tokens):
-                col_node = n.SQLColumn(sub_token)
-                parent.add_child(col_node, context)
-                u.log_parsing_step('Column:IdentifierList added', col_node, level=1)
+            col_nodes = [n.SQLColumn(sub_token) for sub_token in u.clean_tokens(token.tokens)]
+            parent.add_children(col_nodes, context)
+            u.log_parsing_step(f'Column:IdentifierList added {len(col_nodes)} columns to', parent, level=1)
         elif isinstance(token, Identifier):
             col_node = n.SQLColumn(token)
             parent.add_child(col_node, context)
@@ -34,3 +46,9 @@ class ColumnHandler(BaseHandler):
             col_node = n.SQLColumn(token)
             parent.add_child(col_node, context)
             u.log_parsing_step('Column:Unknown added', col_node, level=1)
+
+    def handle_batch(self, batch, parent, parser, context):
+        """Fast path for very wide select lists: one SQLColumn per item, attached in one batch"""
+        col_nodes = [n.SQLColumn(sub_token) for sub_token in batch.tokens()]
+        parent.add_children(col_nodes, context)
+        u.log_parsing_step(f'Column:Batch added {len(col_nodes)} columns to', parent, level=1)
@@ -1,8 +1,9 @@
 
 from sqlparse.sql import Comparison
 from sqlparse.tokens import Keyword
-from sqlflow.handlers.base import HandlerType, BaseHandler, is_literal, is_logical_operator
+from sqlflow.handlers.base import HandlerType, BaseHandler, is_literal, is_logical_operator, emits, descends
 from sqlflow.handlers.subquery import is_subquery
+from sqlflow.handlers.literal_list import is_literal_list
 from sqlflow import (
     nodes as n,
     utils as u
@@ -18,9 +19,14 @@ def is_connection(token, context):
 
 class ComparisonHandler(BaseHandler):
     def handle(self, token, parent, parser, context):
+        if not descends(context, HandlerType.COMPARISON, token):
+            return
+
         for sub_token in u.clean_tokens(token.tokens):
             if is_literal(sub_token, context):
                 parser.assign_handler(sub_token, parent, context.copy(), HandlerType.LITERAL)
+            elif is_literal_list(sub_token, context):
+                parser.assign_handler(sub_token, parent, context.copy(), HandlerType.LITERAL_LIST)
             elif is_logical_operator(sub_token, context):
                 parser.assign_handler(sub_token, parent, context.copy(), HandlerType.OPERATOR)
             elif is_subquery(sub_token, context):
@@ -42,12 +48,13 @@ class ConnectionHandler(BaseHandler):
             u.log_parsing_step('Connection:{token} Failed!', token, level=2)
             return
         
-        connection_node = comparison_type(token)
+        connection_node = parent
+        if emits(context, HandlerType.CONNECTION):
+            connection_node = comparison_type(token)
+            parent.add_child(connection_node, context)
 
         if is_comparison(token, context):
-            parent.add_child(connection_node, context)
             connection_context = context.copy(depth=context.depth + 1)
             parser.assign_handler(token, connection_node, connection_context, HandlerType.COMPARISON)
         else:
-            parent.add_child(connection_node, context)
             parser.assign_handler(token, connection_node, context.copy(), HandlerType.UNKNOWN)
@@ -1,7 +1,7 @@
 
 from sqlparse.sql import IdentifierList
 from sqlparse.tokens import Keyword, CTE
-from sqlflow.handlers.base import BaseHandler
+from sqlflow.handlers.base import BaseHandler, HandlerType, descend, emits, descends
 from sqlflow import (
     nodes as n,
     utils as u
@@ -19,19 +19,24 @@ def is_cte(token, context):
 class CTEHandler(BaseHandler):
     def handle(self, token, parent, parser, context):
         for cte in u.clean_tokens(token.tokens):
-            cte_node = n.SQLCTE(cte)
-            parent.add_child(cte_node, context)
-            u.log_parsing_step('CTE added', cte_node, level=1)
+            cte_parent, cte_node = parent, None
+            if emits(context, HandlerType.CTE):
+                cte_node = n.SQLCTE(cte)
+                parent.add_child(cte_node, context)
+                u.log_parsing_step('CTE added', cte_node, level=1)
 
-            if cte_node in context.visited:
-                u.log_parsing_step('Cycle detected in CTE!', cte_node, level=2)
-                continue
+                if cte_node in context.visited:
+                    u.log_parsing_step('Cycle detected in CTE!', cte_node, level=2)
+                    continue
 
-            context.visited.add(cte_node)
+                context.visited.add(cte_node)
+                cte_parent = cte_node
 
-            u.log_parsing_step('Entering CTE...', cte_node, level=1)
+            if not descends(context, HandlerType.CTE):
+                continue
+            u.log_parsing_step('Entering CTE...', cte_parent, level=1)
             cte_context = context.copy(depth=context.depth + 1)
-            parser.parse_tokens(cte, cte_node, cte_context)
-            u.log_parsing_step('...Exiting CTE', cte_node, level=1)
+            descend(parser, cte, cte_parent, cte_context, cte_node)
+            u.log_parsing_step('...Exiting CTE', cte_parent, level=1)
 
 
@@ -1,6 +1,6 @@
 
 from sqlparse.sql import Identifier, Function, Case
-from sqlflow.handlers.base import BaseHandler
+from sqlflow.handlers.base import BaseHandler, HandlerType, descend, emits, descends
 from sqlflow import (
     nodes as n,
     utils as u
@@ -38,9 +38,13 @@ class FeatureHandler(BaseHandler):
         NOTE: `parser` and `context` attributes intentionally unused 
         here unless handling subqueries
         """
-        feature_node = n.SQLFeature(token)
-        parent.add_child(feature_node, context)
-        u.log_parsing_step('Feature Node added', feature_node, level=2)
-
-        feature_context = context.copy(depth=context.depth + 1)
-        parser.parse_tokens(token, feature_node, feature_context)
+        feature_node = None
+        if emits(context, HandlerType.FEATURE):
+            feature_node = n.SQLFeature(token)
+            parent.add_child(feature_node, context)
+            u.log_parsing_step('Feature Node added', feature_node, level=2)
+            parent = feature_node
+
+        if descends(context, HandlerType.FEATURE, token):
+            feature_context = context.copy(depth=context.depth + 1)
+            descend(parser, token, parent, feature_context, feature_node)
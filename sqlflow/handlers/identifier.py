@@ -1,11 +1,14 @@
 
 from sqlparse.sql import IdentifierList
-from sqlflow.handlers.base import BaseHandler
+from sqlflow.handlers.base import BaseHandler, HandlerType, descends
 from sqlflow import utils as u
 
 
 class IdentifierHandler(BaseHandler):
     def handle(self, token, parent, parser, context):
+        if token.is_group and not descends(context, HandlerType.IDENTIFIER):
+            return
+
         if isinstance(token, IdentifierList):
             u.log_parsing_step('Entering IdentifierList...', parent, level=2)
             nested_context = context.copy(depth=context.depth + 1)
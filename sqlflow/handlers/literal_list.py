@@ -0,0 +1,34 @@
+from sqlflow.handlers.base import BaseHandler, HandlerType, emits
+from sqlflow.fastpath import LiteralSummary, get_collapsed
+from sqlflow import (
+    nodes as n,
+    utils as u
+)
+
+
+def is_literal_list(token, context):
+    return isinstance(get_collapsed(token, context), LiteralSummary)
+
+
+class LiteralListHandler(BaseHandler):
+    def handle(self, token, parent, parser, context):
+        """
+        Fast path: one summarized node (plus count/type/range triples) stands in
+        for a literal list or VALUES rows collapsed before tokenizing
+        """
+        if token.is_group and token.token_first().normalized == "VALUES":
+            parser.assign_handler(token.token_first(), parent, context, HandlerType.KEYWORD)
+
+        if not emits(context, HandlerType.LITERAL_LIST):
+            return
+        summary = get_collapsed(token, context)
+        list_node = n.SQLLiteralList(token, summary)
+        parent.add_child(list_node, context)
+        u.log_parsing_step('Literal list added', list_node, level=1)
+
+        if context.collect_triples:
+            context.add_triple(list_node.uri, "has_count", str(summary.count))
+            context.add_triple(list_node.uri, "has_literal_type", summary.type)
+            if summary.minimum is not None:
+                context.add_triple(list_node.uri, "has_min", str(summary.minimum))
+                context.add_triple(list_node.uri, "has_max", str(summary.maximum))
@@ -1,7 +1,7 @@
 
 from sqlparse.sql import Parenthesis
 from sqlparse.tokens import DML
-from sqlflow.handlers.base import BaseHandler
+from sqlflow.handlers.base import BaseHandler, HandlerType, descend, emits, descends
 from sqlflow import (
     nodes as n,
     utils as u
@@ -21,17 +21,22 @@ class SubqueryHandler(BaseHandler):
         NOTE: `parser` and `context` attributes intentionally unused 
         here unless handling subqueries
         """
-        subquery_node = n.SQLSubquery(token)
-        parent.add_child(subquery_node, context)
-        u.log_parsing_step('Subquery added', subquery_node, level=1)
+        subquery_node = None
+        if emits(context, HandlerType.SUBQUERY):
+            subquery_node = n.SQLSubquery(token)
+            parent.add_child(subquery_node, context)
+            u.log_parsing_step('Subquery added', subquery_node, level=1)
 
-        if subquery_node in context.visited:
-            u.log_parsing_step('Cycle detected in Subquery!', subquery_node, level=2)
-            return
+            if subquery_node in context.visited:
+                u.log_parsing_step('Cycle detected in Subquery!', subquery_node, level=2)
+                return
+
+            context.visited.add(subquery_node)
+            parent = subquery_node
 
-        context.visited.add(subquery_node)
-        
-        u.log_parsing_step('Entering Subquery...', subquery_node, level=1)
+        if not descends(context, HandlerType.SUBQUERY):
+            return
+        u.log_parsing_step('Entering Subquery...', parent, level=1)
         subquery_context = context.copy(depth=context.depth + 1)
-        parser.parse_tokens(token, subquery_node, subquery_context)
-        u.log_parsing_step('...Exiting Subquery', subquery_node, level=1)
+        descend(parser, token, parent, subquery_context, subquery_node)
+        u.log_parsing_step('...Exiting Subquery', parent, level=1)
@@ -1,6 +1,6 @@
 
 from sqlparse.tokens import Keyword
-from sqlflow.handlers.base import HandlerType, BaseHandler
+from sqlflow.handlers.base import HandlerType, BaseHandler, emits
 from sqlflow.handlers.cte import is_cte_name
 from sqlflow.handlers.subquery import is_subquery
 from sqlflow import (
@@ -29,7 +29,7 @@ class TableHandler(BaseHandler):
             subquery_context = context.copy(depth=context.depth + 1)
             parser.assign_handler(token, parent, subquery_context, HandlerType.SUBQUERY)
 
-        else:
+        elif emits(context, HandlerType.TABLE):
             table_node = n.SQLTable(token)
             parent.add_child(table_node, context)
             u.log_parsing_step('Table added', table_node, level=1)
@@ -1,8 +1,9 @@
 
 from sqlparse.sql import Where
 from sqlparse.tokens import Keyword
-from sqlflow.handlers.base import BaseHandler, HandlerType, is_keyword, is_logical_operator
+from sqlflow.handlers.base import BaseHandler, HandlerType, is_keyword, is_logical_operator, emits, descends
 from sqlflow.handlers.connection import is_comparison
+from sqlflow.handlers.literal_list import is_literal_list
 from sqlflow import (
     nodes as n, 
     utils as u
@@ -19,13 +20,18 @@ def is_complex_condition(token):
 
 class WhereHandler(BaseHandler):
     def handle(self, token, parent, parser, context):
+        if not descends(context, HandlerType.WHERE, token):
+            return
+
         for sub_token in u.clean_tokens(token.tokens):
             if is_comparison(sub_token, context):
-                comparison_node = n.SQLSegment(sub_token)
-                parent.add_child(comparison_node, context)
+                comparison_node = parent
+                if emits(context, HandlerType.WHERE):
+                    comparison_node = n.SQLSegment(sub_token)
+                    parent.add_child(comparison_node, context)
+                    u.log_parsing_step('Where:Segment added', comparison_node, level=1)
                 comparison_context = context.copy(depth=context.depth + 1)
                 parser.assign_handler(sub_token, comparison_node, comparison_context, HandlerType.COMPARISON)
-                u.log_parsing_step('Where:Segment added', comparison_node, level=1)
 
             elif is_keyword(sub_token, context):
                 parser.assign_handler(sub_token, parent, context.copy(), HandlerType.KEYWORD)
@@ -33,5 +39,8 @@ class WhereHandler(BaseHandler):
             elif is_logical_operator(sub_token, context):
                 parser.assign_handler(sub_token, parent, context.copy(), HandlerType.OPERATOR)
 
+            elif is_literal_list(sub_token, context):
+                parser.assign_handler(sub_token, parent, context.copy(), HandlerType.LITERAL_LIST)
+
             else:
                 parser.assign_handler(sub_token, parent, context.copy(), HandlerType.UNKNOWN)
@@ -1,64 +1,158 @@
 
 import uuid
-from sqlflow import utils as u
+
+
+# token-invariant metadata shared by keyword/operator/literal nodes, keyed by (node type, token value);
+# the only state shared between parses: entries are immutable and recomputed identically, so racing threads are harmless
+FLYWEIGHTS = {}
+MAX_FLYWEIGHTS = 100000
+
+
+class NodeMeta:
+    """Shared, immutable display value and uri for nodes whose metadata depends only on the token text"""
+
+    __slots__ = ["display_value", "uri"]
+
+    def __init__(self, display_value, uri):
+        self.display_value = display_value
+        self.uri = uri
 
 
 class SQLNode:
-    """Base class representing a node in the SQL parse tree."""
-    
-    __slots__ = ["id", "token", "type", "level", "children", "parent", "name", "alias"]
+    """
+    Base class representing a node in the SQL parse tree.
+
+    Construction only stores the token; `id`, `name`, `alias` and `parent` are
+    resolved on first access. Subclasses with FLYWEIGHT = True share a single
+    NodeMeta per distinct token value instead of computing it per node.
+    """
+
+    __slots__ = ["token", "level", "children", "_id", "_name", "_alias", "_parent", "_meta"]
 
     TOKENS2RESOLVE = ['sqlliteral', 'sqloperator', 'sqlkeyword', 'sqlcolumn', 'sqltable']
     CHAR_DISPLAY_LIMIT = 50
+    FLYWEIGHT = False
+    type = "SQLNode"
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.type = cls.__name__
 
     def __init__(self, token, level=None):
+        self.token = token
+        self.level = level or 0
+        self.children = []
+        self._id = self._name = self._alias = self._parent = None
+        self._meta = self.get_flyweight(token) if self.FLYWEIGHT else None
+
+    @classmethod
+    def get_flyweight(cls, token):
+        key = (cls.type, token.value)
+        meta = FLYWEIGHTS.get(key)
+        if meta is None:
+            display_value = token.value.replace('\n', ' ')[:cls.CHAR_DISPLAY_LIMIT]
+            meta = NodeMeta(display_value, cls.resolved_uri(cls.type.lower(), ' ', ' ', display_value))
+            if len(FLYWEIGHTS) < MAX_FLYWEIGHTS:
+                FLYWEIGHTS[key] = meta
+        return meta
+
+    @staticmethod
+    def resolved_uri(node_type, parent, alias, name):
+        slug = f"{parent.lower().strip()}/{alias.lower().strip()}/{name.lower().strip()}"
+        return f"{node_type}://{slug}".replace(" ", "_")
 
-        # ensures no "reference before assignment" logging errors
-        for attr in self.__slots__:
-            setattr(self, attr, None)
+    @property
+    def id(self):
+        if self._id is None:
+            self._id = uuid.uuid4()
+        return self._id
 
-        self.id = uuid.uuid4()
+    @id.setter
+    def id(self, value):
+        self._id = value
 
-        self.token = token
-        self.type = self.__class__.__name__
-        self.level = level or 0
+    @property
+    def name(self):
+        return self._name if self._name is not None else self.display_value
 
-        self.parent = u.get_node_parent(self, token) or ' '
-        self.name = u.get_node_name(self, token) or self.display_value
-        self.alias = u.get_node_alias(self, token) or ' '
+    @name.setter
+    def name(self, value):
+        self._name = value
+        self._meta = None
 
-        self.children = []
+    @property
+    def alias(self):
+        return self._alias if self._alias is not None else ' '
+
+    @alias.setter
+    def alias(self, value):
+        self._alias = value
+        self._meta = None
+
+    @property
+    def parent(self):
+        return self._parent if self._parent is not None else ' '
+
+    @parent.setter
+    def parent(self, value):
+        self._parent = value
+        self._meta = None
 
     def add_child(self, child_node, context=None):
         """Adds a child node to the current node."""
         child_node.level = self.level + 1
         self.children.append(child_node)
 
-        if context:
+        if context and context.collect_triples:
             context.add_triple(
                 subject=self.uri,
                 predicate=f"has_{child_node.type}",
                 object_=child_node.uri
             )
 
+    def add_children(self, child_nodes, context=None):
+        """Batched `add_child`: attaches many nodes with one list extend and one triple set update."""
+        level = self.level + 1
+        for child_node in child_nodes:
+            child_node.level = level
+        self.children.extend(child_nodes)
+
+        if context and context.collect_triples:
+            uri = self.uri
+            context.triples.update((uri, f"has_{child_node.type}", child_node.uri) for child_node in child_nodes)
+
     def traverse(self, depth=0):
         print('  ' * depth + repr(self))
         for child in self.children:
             child.traverse(depth + 1)
 
+    def to_dict(self):
+        """Returns a JSON-serializable view of the node and its subtree (tokens excluded)."""
+        return {
+            "type": self.type,
+            "name": self.name,
+            "uri": self.uri,
+            "level": self.level,
+            "children": [child.to_dict() for child in self.children]
+        }
+
     @property
     def uri(self):
+        if self._meta is not None:
+            return self._meta.uri
+
         node_type = self.type.lower().strip()
 
         if node_type in self.TOKENS2RESOLVE:
-            slug = f"{self.parent.lower().strip()}/{self.alias.lower().strip()}/{self.name.lower().strip()}"
-            return f"{node_type}://{slug}".replace(" ", "_")
+            return self.resolved_uri(node_type, self.parent, self.alias, self.name)
         else:
             slug = self.name.lower().strip()
             return f"{node_type}://{self.id}/{slug}".replace(" ", "_")
 
     @property
     def display_value(self):
+        if self._meta is not None:
+            return self._meta.display_value
         return self.token.value.replace('\n', ' ')[:self.CHAR_DISPLAY_LIMIT]
 
     def __hash__(self):
@@ -71,57 +165,143 @@ class SQLNode:
         return f"{self.__class__.__name__}({display_value}{ellipses})"
 
 
+CHILDREN = SQLNode.children  # the slot descriptor, wrapped by LazyNode.children
+
+
+class LazyNode(SQLNode):
+    """
+    A container node whose children may be parsed later (`parse_sql(lazy=True)`).
+
+    A handler can `defer` the parse; it then runs on first access to
+    `children` or on `expand()`, adding the subtree's triples to the
+    context's triple set at that point.
+    """
+
+    __slots__ = ["_expansion"]
+
+    def __init__(self, token, level=None):
+        self._expansion = None
+        super().__init__(token, level)
+
+    @property
+    def children(self):
+        if self._expansion is not None:
+            self.expand()
+        return CHILDREN.__get__(self)
+
+    @children.setter
+    def children(self, value):
+        CHILDREN.__set__(self, value)
+
+    @property
+    def expanded(self):
+        return self._expansion is None
+
+    def defer(self, parser, tokens, context):
+        self._expansion = (parser, tokens, context)
+
+    def expand(self):
+        """Parses deferred children now; a no-op once expanded"""
+        if self._expansion is not None:
+            parser, tokens, context = self._expansion
+            self._expansion = None
+            parser.parse_tokens(tokens, self, context)
+        return self
+
+
 # --- Specialized SQL Node Classes ---
 class SQLKeyword(SQLNode):
     """Represents a SQL keyword (e.g., SELECT, FROM, WHERE)."""
-    pass
+    __slots__ = ()
+    FLYWEIGHT = True
 
 
 class SQLLiteral(SQLNode):
     """Represents a literal (e.g. 'Green' or 123)"""
-    pass
+    __slots__ = ()
+    FLYWEIGHT = True
 
 
 class SQLOperator(SQLNode):
     """Represents a logical operator (e.g. AND, OR, <, =)"""
-    pass
+    __slots__ = ()
+    FLYWEIGHT = True
 
 
 class SQLColumn(SQLNode):
     """Represents a column in a SQL statement."""
-    pass
+    __slots__ = ()
 
 
 class SQLTable(SQLNode):
     """Represents a table in a SQL statement."""
-    pass
+    __slots__ = ()
 
 
-class SQLFeature(SQLNode):
+class SQLFeature(LazyNode):
     """Represents a calculated feature, such as a function or case statement."""
-    pass
+    __slots__ = ()
 
 
 class SQLRelationship(SQLNode):
     """Represents a relational clause between tables (e.g., JOIN conditions)."""
-    pass
+    __slots__ = ()
 
 
 class SQLSegment(SQLNode):
     """Represents a filtered segment of the population (e.g. WHERE or HAVING conditions)."""
-    pass
+    __slots__ = ()
 
 
-class SQLSubquery(SQLNode):
+class SQLSubquery(LazyNode):
     """Represents a subquery enclosed in parentheses."""
-    pass
+    __slots__ = ()
 
 
-class SQLCTE(SQLNode):
+class SQLCTE(LazyNode):
     """Represents a CTE in a SQL statement."""
-    pass
+    __slots__ = ()
 
 
 class SQLQuery(SQLNode):
     """Represents a complete SQL statement."""
-    pass
\ No newline at end of file
+    __slots__ = ()
+
+
+class SQLLiteralList(SQLNode):
+    """Represents a collapsed list of literals or VALUES rows (fast path), summarized instead of expanded."""
+    __slots__ = ["summary"]
+
+    def __init__(self, token, summary=None, level=None):
+        super().__init__(token, level)
+        self.summary = summary
+
+    @property
+    def display_value(self):
+        if self.summary is None:
+            return super().display_value
+        return self.summary.describe()[:self.CHAR_DISPLAY_LIMIT]
+
+    def to_dict(self):
+        result = super().to_dict()
+        if self.summary is not None:
+            result["summary"] = self.summary.to_dict()
+        return result
+
+
+# Stable ordering of node classes; append new classes at the end so integer encodings stay valid
+NODE_TYPES = (
+    SQLNode,
+    SQLKeyword,
+    SQLLiteral,
+    SQLOperator,
+    SQLColumn,
+    SQLTable,
+    SQLFeature,
+    SQLRelationship,
+    SQLSegment,
+    SQLSubquery,
+    SQLCTE,
+    SQLQuery,
+    SQLLiteralList
+)
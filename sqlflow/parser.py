@@ -1,16 +1,24 @@
 
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+
+import sqlparse
 from sqlparse.sql import Identifier, IdentifierList
+from sqlparse.tokens import Comment
 from sqlflow.context import ParsingContext
+from sqlflow.profiles import get_profile
 from sqlflow.registry import HANDLER_MAPPING, HandlerType
 from sqlflow.handlers.base import is_keyword
 from sqlflow.handlers.cte import is_cte
 from sqlflow.handlers.connection import is_comparison, is_connection
 from sqlflow.handlers.feature import is_feature
-from sqlflow.handlers.column import is_column
+from sqlflow.handlers.literal_list import is_literal_list
+from sqlflow.handlers.column import is_column, is_column_batch
 from sqlflow.handlers.table import is_table
 from sqlflow.handlers.where import is_where
 from sqlflow.handlers.subquery import is_subquery
 from sqlflow import (
+    fastpath as f,
     nodes as n,
     utils as u
 )
@@ -22,9 +30,15 @@ class SQLTree:
 
     def parse_tokens(self, tokens, parent, context=None):
         context = context or ParsingContext()
-        for token, next_token in u.peekable(u.clean_tokens(tokens)):
+        for token in u.clean_tokens(tokens):
             self.dispatch_handler(token, parent, context)
-        self.dispatch_handler(next_token, parent, context)
+
+    def expand(self):
+        """Parses every deferred subtree of a lazy parse, e.g. before reading the complete triple set"""
+        stack = [self.root]
+        while stack:
+            stack.extend(stack.pop().children)
+        return self
 
     def assign_handler(self, token, parent, context, handler_type: HandlerType = HandlerType.UNKNOWN):
         assigned_handler = HANDLER_MAPPING[handler_type]
@@ -40,6 +54,12 @@ class SQLTree:
         if is_keyword(token, context):
             return HandlerType.KEYWORD
 
+        elif is_literal_list(token, context):
+            return HandlerType.LITERAL_LIST
+
+        elif is_column_batch(token, context):
+            return HandlerType.COLUMN
+
         elif is_cte(token, context):
             return HandlerType.CTE
 
@@ -69,3 +89,66 @@ class SQLTree:
 
         else:
             return HandlerType.UNKNOWN
+
+
+def is_empty_statement(statement):
+    """True for the whitespace/comment-only tail sqlparse emits after a final `;`"""
+    return all(t.is_whitespace or t.ttype in Comment for t in statement.flatten())
+
+
+def parse_statement(statement, context=None):
+    """Parses a single sqlparse statement into a populated SQLTree"""
+    context = context if context is not None else ParsingContext()
+    tree = SQLTree(statement)
+    tree.parse_tokens(statement.tokens, tree.root, context)
+    return tree, context
+
+
+def parse_sql(sql, fast=False, profile=None, max_depth=None, lazy=False):
+    """
+    Parses every statement in a SQL string, returning a list of (SQLTree, ParsingContext).
+
+    With `fast=True`, long homogeneous literal lists and VALUES rows are
+    collapsed into single summarized SQLLiteralList nodes and very wide
+    select lists are tokenized in batches (see `sqlflow.fastpath`), keeping
+    node counts bounded and parse time linear for such statements.
+
+    `profile` ("full", "lineage", "tables-only", a set of HandlerType or an
+    ExtractionProfile) and `max_depth` restrict which nodes are built and how
+    deep handlers recurse (see `sqlflow.profiles`).
+
+    With `lazy=True`, subquery, CTE and feature bodies are not parsed until
+    their node's `children` is first read (or `expand()` is called); their
+    triples join the context's set at that point, and `SQLTree.expand()`
+    forces the whole tree.
+    """
+    collapsed = None
+    if fast:
+        sql, collapsed = f.collapse_sql(sql)
+    profile = get_profile(profile, max_depth)
+    return [
+        parse_statement(statement, ParsingContext(collapsed=collapsed, profile=profile, lazy=lazy))
+        for statement in sqlparse.parse(sql)
+        if not is_empty_statement(statement)
+    ]
+
+
+def parse_many(queries, executor=ThreadPoolExecutor, max_workers=None, fast=False, profile=None, max_depth=None, lazy=False):
+    """
+    Parses many SQL strings concurrently; returns one `parse_sql` result per query, in order.
+
+    `executor` is an Executor instance (used as-is and left running) or an
+    Executor class (created with `max_workers` and shut down afterwards).
+    Parses share no mutable state: each gets its own SQLTree, ParsingContext
+    and triple set, handlers in HANDLER_MAPPING are stateless, and the only
+    global write is the node flyweight memo (`nodes.FLYWEIGHTS`), whose
+    entries are immutable and idempotent, so racing inserts are harmless.
+    This makes threads safe on both GIL and free-threaded (3.13t) builds;
+    keep the "sqlflow" logger above DEBUG, since handler logging serializes
+    threads on the logging lock.
+    """
+    parse = partial(parse_sql, fast=fast, profile=get_profile(profile, max_depth), lazy=lazy)
+    if isinstance(executor, Executor):
+        return list(executor.map(parse, queries))
+    with executor(max_workers=max_workers) as pool:
+        return list(pool.map(parse, queries))
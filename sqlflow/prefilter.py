@@ -0,0 +1,230 @@
+import time
+import zlib
+from array import array
+from bisect import bisect_left
+
+from sqlparse.sql import Identifier, Parenthesis
+from sqlparse.tokens import Name, Punctuation, String
+
+from sqlflow import parser as s
+from sqlflow.utils import TOKEN_PATTERN
+
+
+PREFILTER_MAGIC = b"SQLFPF01"
+NAME_KINDS = ("word", "quoted")
+SCOPE_TYPES = frozenset(["SQLQuery", "SQLSubquery", "SQLCTE", "SQLSegment", "SQLTable"])
+
+
+def normalize_name(name):
+    """Last dotted part of a (possibly qualified or quoted) name, unquoted and lowercased"""
+    return name.rsplit(".", 1)[-1].strip('"`[]').lower()
+
+
+def qualified_name(token):
+    """
+    `database.schema.name` of a table reference, as far as it is written
+    (aliases dropped, each part normalized); None when it has no plain name
+    """
+    parts = []
+    for sub_token in getattr(token, "tokens", [token]):
+        if sub_token.ttype in Name or sub_token.ttype in String.Symbol:
+            parts.append(normalize_name(sub_token.value))
+        elif not sub_token.match(Punctuation, "."):
+            break
+    return ".".join(parts) or None
+
+
+def name_hash(name):
+    return zlib.crc32(name.encode("utf-8"))
+
+
+def query_name_hashes(sql):
+    """
+    Cheap lexical pass: sorted, distinct hashes of every identifier-like word
+    in a query. Strings, numbers and comments are skipped by the lexer, so a
+    table named in a literal does not make the query a candidate.
+    """
+    names = set()
+    for match in TOKEN_PATTERN.finditer(sql):
+        if match.lastgroup in NAME_KINDS:
+            names.add(match.group())
+    return sorted({name_hash(normalize_name(name)) for name in names})
+
+
+class PrefilterIndex:
+    """
+    Per-query sorted hash sets of identifier tokens, stored as two flat
+    arrays (hashes and per-query offsets) so millions of queries fit in a
+    few bytes each and a lookup is one bisect per name and query.
+
+    Matching is lexical: a query whose text mentions a name is a candidate
+    whatever role the name plays (alias, column, CTE), so candidates must be
+    confirmed with a full parse (see `find_references`). A query that does
+    reference a name is never missed.
+    """
+
+    def __init__(self, offsets=None, hashes=None):
+        self.offsets = offsets if offsets is not None else array("q", [0])
+        self.hashes = hashes if hashes is not None else array("I")
+
+    @classmethod
+    def build(cls, queries):
+        index = cls()
+        for sql in queries:
+            index.add(sql)
+        return index
+
+    def add(self, sql):
+        """Indexes one more query; its id is its position in insertion order"""
+        self.hashes.extend(query_name_hashes(sql))
+        self.offsets.append(len(self.hashes))
+        return len(self) - 1
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def mentions(self, query_id, name):
+        target = name_hash(normalize_name(name))
+        start, end = self.offsets[query_id], self.offsets[query_id + 1]
+        position = bisect_left(self.hashes, target, start, end)
+        return position < end and self.hashes[position] == target
+
+    def candidates(self, names, match="any"):
+        """Ids of queries mentioning any (or, with match="all", every) one of `names`"""
+        targets = sorted({name_hash(normalize_name(name)) for name in names})
+        if not targets:
+            return []
+        required = len(targets) if match == "all" else 1
+        hashes, offsets, result = self.hashes, self.offsets, []
+        for query_id in range(len(self)):
+            start, end, found = offsets[query_id], offsets[query_id + 1], 0
+            for target in targets:
+                position = bisect_left(hashes, target, start, end)
+                if position < end and hashes[position] == target:
+                    found += 1
+                    if found == required:
+                        result.append(query_id)
+                        break
+                    start = position
+        return result
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(PREFILTER_MAGIC)
+            f.write(array("q", [len(self), len(self.hashes)]).tobytes())
+            f.write(self.offsets.tobytes())
+            f.write(self.hashes.tobytes())
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            if f.read(len(PREFILTER_MAGIC)) != PREFILTER_MAGIC:
+                raise ValueError(f"{path} is not a prefilter index")
+            counts = array("q")
+            counts.frombytes(f.read(counts.itemsize * 2))
+            offsets, hashes = array("q"), array("I")
+            offsets.frombytes(f.read(offsets.itemsize * (counts[0] + 1)))
+            hashes.frombytes(f.read(hashes.itemsize * counts[1]))
+        return cls(offsets, hashes)
+
+
+def is_select(token):
+    return isinstance(token, Parenthesis) and token.value[1:].lstrip().upper().startswith(("SELECT", "WITH"))
+
+
+def token_names(token, subqueries):
+    """
+    Real names of the identifiers in a token. SELECT parentheses are not
+    descended into; they are appended to `subqueries` instead.
+    """
+    if is_select(token):
+        subqueries.append(token)
+        return []
+    if isinstance(token, Identifier) and not token.tokens[0].is_group:
+        name = token.get_real_name()
+        return [name] if name else []
+    if not token.is_group:
+        return []
+    return [name for sub_token in token.tokens for name in token_names(sub_token, subqueries)]
+
+
+def referenced_names(tree, qualified=False):
+    """
+    (table names, column names) referenced anywhere in a parsed statement,
+    normalized. Subqueries the tree keeps as a single unparsed node (such as
+    `IN (SELECT ...)`) are parsed on their own and merged in. With
+    `qualified`, table names keep the database and schema they are written
+    with (see `qualified_name`).
+    """
+    tables, columns, stack = set(), set(), [tree.root]
+    while stack:
+        node = stack.pop()
+        stack.extend(node.children)
+        if node.type == "SQLTable":
+            if qualified:
+                name = qualified_name(node.token)
+            else:
+                name = getattr(node.token, "get_real_name", lambda: None)()
+                name = name and normalize_name(name)
+            if name:
+                tables.add(name)
+        elif node.type not in SCOPE_TYPES:
+            subqueries = []
+            columns.update(normalize_name(name) for name in token_names(node.token, subqueries))
+            for subquery in subqueries if not node.children else ():
+                for subquery_tree, _ in s.parse_sql(subquery.value[1:-1]):
+                    subquery_tables, subquery_columns = referenced_names(subquery_tree, qualified)
+                    tables |= subquery_tables
+                    columns |= subquery_columns
+    return tables, columns
+
+
+def confirm(sql, tables=(), columns=(), match="any"):
+    """Full parse of one query: does it reference the given tables/columns?"""
+    tables = {normalize_name(name) for name in tables}
+    columns = {normalize_name(name) for name in columns}
+    found_tables, found_columns = set(), set()
+    for tree, _ in s.parse_sql(sql):
+        statement_tables, statement_columns = referenced_names(tree)
+        found_tables |= statement_tables
+        found_columns |= statement_columns
+    hits = len(tables & found_tables) + len(columns & found_columns)
+    return hits == len(tables) + len(columns) if match == "all" else hits > 0
+
+
+def find_references(queries, tables=(), columns=(), match="any", index=None):
+    """
+    Ids of the queries that reference `tables`/`columns`, parsing only the
+    prefilter's candidates. `queries` must support indexing (a list or a
+    StatementStore); pass a prebuilt `index` to skip the lexical pass.
+
+    Returns (matching ids, stats) where stats has the candidate count, the
+    false-positive rate among candidates and the time spent in each phase.
+    """
+    start = time.perf_counter()
+    if index is None:
+        index = PrefilterIndex.build(queries)
+    built = time.perf_counter()
+    candidates = index.candidates(list(tables) + list(columns), match)
+    filtered = time.perf_counter()
+
+    matches, errors = [], 0
+    for query_id in candidates:
+        try:
+            if confirm(queries[query_id], tables, columns, match):
+                matches.append(query_id)
+        except Exception:
+            errors += 1  # unparseable candidates cannot be confirmed
+    confirmed = time.perf_counter()
+
+    return matches, {
+        "queries": len(index),
+        "candidates": len(candidates),
+        "matches": len(matches),
+        "errors": errors,
+        "false_positive_rate": (len(candidates) - len(matches)) / len(candidates) if candidates else 0.0,
+        "index_s": built - start,
+        "filter_s": filtered - built,
+        "confirm_s": confirmed - filtered
+    }
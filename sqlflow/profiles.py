@@ -0,0 +1,101 @@
+from sqlflow.handlers.base import HandlerType
+
+
+ALL_HANDLERS = frozenset(HandlerType)
+# handler types whose tokens can appear directly inside each container handler's token
+CONTAINS = {
+    HandlerType.WHERE: {HandlerType.COMPARISON, HandlerType.KEYWORD, HandlerType.OPERATOR, HandlerType.LITERAL_LIST, HandlerType.UNKNOWN},
+    HandlerType.COMPARISON: {HandlerType.LITERAL, HandlerType.LITERAL_LIST, HandlerType.OPERATOR, HandlerType.SUBQUERY, HandlerType.COLUMN},
+    HandlerType.CONNECTION: {HandlerType.COMPARISON, HandlerType.UNKNOWN},
+    HandlerType.COLUMN: {HandlerType.FEATURE},
+    HandlerType.TABLE: {HandlerType.SUBQUERY},
+    HandlerType.SUBQUERY: ALL_HANDLERS,
+    HandlerType.CTE: ALL_HANDLERS,
+    HandlerType.FEATURE: ALL_HANDLERS,
+    HandlerType.IDENTIFIER: ALL_HANDLERS
+}
+
+
+def reachable_handlers(handler_type):
+    """Every handler type that can run somewhere beneath `handler_type`"""
+    seen, stack = set(), list(CONTAINS.get(handler_type, ()))
+    while stack:
+        current = stack.pop()
+        if current not in seen:
+            seen.add(current)
+            stack.extend(CONTAINS.get(current, ()))
+    return frozenset(seen)
+
+
+REACHABLE = {handler_type: reachable_handlers(handler_type) for handler_type in HandlerType}
+# expression containers and the node kinds built from expression tokens; tables, CTEs and joins
+# only occur inside an expression through a nested subquery
+EXPRESSION_HANDLERS = frozenset([HandlerType.WHERE, HandlerType.COMPARISON, HandlerType.FEATURE])
+EXPRESSION_KINDS = frozenset([
+    HandlerType.COLUMN, HandlerType.COMPARISON, HandlerType.FEATURE, HandlerType.IDENTIFIER, HandlerType.KEYWORD,
+    HandlerType.LITERAL, HandlerType.LITERAL_LIST, HandlerType.OPERATOR, HandlerType.UNKNOWN, HandlerType.WHERE
+])
+
+
+class ExtractionProfile:
+    """
+    Which handlers build nodes (and triples), and how deep the parser descends.
+
+    A handler whose type is excluded creates nothing: leaf handlers return
+    immediately, and container handlers (WHERE, SUBQUERY, CTE, ...) either
+    return too or, when an included type can occur inside them, recurse
+    transparently so e.g. tables in subqueries attach to the nearest kept
+    ancestor. Profiles that keep no expression-level kinds only enter WHERE
+    clauses, comparisons and functions whose text contains a SELECT.
+    Keywords are always tracked in the context, since dispatch depends on
+    them. `max_depth` caps ParsingContext.depth for recursion.
+    """
+
+    __slots__ = ["name", "handler_types", "max_depth", "subqueries_only", "_descends"]
+
+    def __init__(self, handler_types=ALL_HANDLERS, max_depth=None, name="custom"):
+        self.name = name
+        self.handler_types = frozenset(handler_types)
+        self.max_depth = max_depth
+        self.subqueries_only = not (self.handler_types & EXPRESSION_KINDS)
+        self._descends = {
+            handler_type: handler_type in self.handler_types or bool(REACHABLE[handler_type] & self.handler_types)
+            for handler_type in HandlerType
+        }
+
+    def emits(self, handler_type):
+        return handler_type in self.handler_types
+
+    def descends(self, handler_type, depth, token=None):
+        if not self._descends[handler_type] or (self.max_depth is not None and depth >= self.max_depth):
+            return False
+        if self.subqueries_only and handler_type in EXPRESSION_HANDLERS:
+            return token is None or "SELECT" in token.value.upper()
+        return True
+
+    def __repr__(self):
+        return f"ExtractionProfile({self.name}, max_depth={self.max_depth})"
+
+
+PROFILES = {
+    "full": ALL_HANDLERS,
+    "lineage": frozenset([HandlerType.TABLE, HandlerType.CTE, HandlerType.SUBQUERY, HandlerType.CONNECTION]),
+    "tables-only": frozenset([HandlerType.TABLE])
+}
+
+
+def get_profile(profile=None, max_depth=None):
+    """
+    Resolves a profile name, a set of HandlerType or an ExtractionProfile;
+    returns None (no filtering) for a plain full parse
+    """
+    if isinstance(profile, ExtractionProfile):
+        return profile if max_depth is None else ExtractionProfile(profile.handler_types, max_depth, profile.name)
+    if profile is None or isinstance(profile, str):
+        name = profile or "full"
+        if name not in PROFILES:
+            raise ValueError(f"Unknown extraction profile {name!r}; expected one of {sorted(PROFILES)}")
+        if name == "full" and max_depth is None:
+            return None
+        return ExtractionProfile(PROFILES[name], max_depth, name)
+    return ExtractionProfile(profile, max_depth)
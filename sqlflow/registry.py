@@ -5,6 +5,7 @@ from sqlflow.handlers.connection import ComparisonHandler, ConnectionHandler
 from sqlflow.handlers.cte import CTEHandler
 from sqlflow.handlers.feature import FeatureHandler
 from sqlflow.handlers.identifier import IdentifierHandler
+from sqlflow.handlers.literal_list import LiteralListHandler
 from sqlflow.handlers.subquery import SubqueryHandler
 from sqlflow.handlers.table import TableHandler
 from sqlflow.handlers.where import WhereHandler
@@ -19,6 +20,7 @@ HANDLER_MAPPING = {
     HandlerType.IDENTIFIER: IdentifierHandler(),
     HandlerType.KEYWORD: KeywordHandler(),
     HandlerType.LITERAL: LiteralHandler(),
+    HandlerType.LITERAL_LIST: LiteralListHandler(),
     HandlerType.OPERATOR: OperatorHandler(),
     HandlerType.SUBQUERY: SubqueryHandler(),
     HandlerType.TABLE: TableHandler(),
@@ -0,0 +1,184 @@
+import json
+import random
+import asyncio
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlflow import parser as s
+from sqlflow.corpus import packaged_corpus
+
+
+def percentile(ordered, q):
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered))) - 1))]
+
+
+def load_corpus_queries():
+    """Every non-empty statement in the packaged healthcare corpus"""
+    with packaged_corpus() as store:
+        return list(store)
+
+
+def parse_timestamp(value):
+    if isinstance(value, (int, float)):
+        return float(value)
+    return datetime.fromisoformat(value).timestamp()
+
+
+def load_log(path, speed=1.0, target_qps=None):
+    """
+    Reads a JSON-lines query log (`{"ts": ..., "sql": ...}` per line; `ts` in epoch
+    seconds or ISO-8601) into [(offset seconds, sql)] sorted by arrival. Offsets
+    are divided by `speed`, or rescaled so the mean rate equals `target_qps`.
+    A record without a timestamp raises ValueError naming its line.
+    """
+    records = []
+    with open(path) as f:
+        for number, line in enumerate(f, 1):
+            if line.strip():
+                record = json.loads(line)
+                ts = record.get("ts", record.get("timestamp"))
+                if ts is None:
+                    raise ValueError(f"{path}:{number}: query log record has no \"ts\" or \"timestamp\"")
+                records.append((parse_timestamp(ts), record.get("sql", record.get("query"))))
+    records.sort(key=lambda record: record[0])
+    if not records:
+        return []
+
+    start = records[0][0]
+    span = records[-1][0] - start
+    scale = 1.0 / speed
+    if target_qps and span > 0:
+        scale = (len(records) - 1) / target_qps / span
+    return [((ts - start) * scale, sql) for ts, sql in records]
+
+
+def synthetic_arrivals(queries, qps, count, seed=0, process="poisson"):
+    """Cycles through `queries` with Poisson (exponential gaps) or uniform arrivals at `qps`"""
+    rng = random.Random(seed)
+    arrivals, offset = [], 0.0
+    for i in range(count):
+        arrivals.append((offset, queries[i % len(queries)]))
+        offset += rng.expovariate(qps) if process == "poisson" else 1.0 / qps
+    return arrivals
+
+
+class InProcessTarget:
+    """Parses with `parse_sql` on a thread pool inside this process"""
+
+    def __init__(self, concurrency=4):
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    async def call(self, sql):
+        await asyncio.get_running_loop().run_in_executor(self.executor, s.parse_sql, sql)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+
+class HttpTarget:
+    """POSTs each query to a running `sqlflow serve` endpoint"""
+
+    def __init__(self, host="127.0.0.1", port=8080, path="/parse"):
+        self.host = host
+        self.port = port
+        self.path = path
+
+    async def call(self, sql):
+        body = json.dumps({"sql": sql, "tree": False}).encode("utf-8")
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            writer.write(
+                f"POST {self.path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body
+            )
+            await writer.drain()
+            response = await reader.read()
+        finally:
+            writer.close()
+
+        head, _, payload = response.partition(b"\r\n\r\n")
+        status = int(head.split(b" ", 2)[1])
+        if status != 200:
+            raise RuntimeError(f"HTTP {status}")
+        errors = [result["error"] for result in json.loads(payload)["results"] if result["error"]]
+        if errors:
+            raise RuntimeError(errors[0])
+
+    def close(self):
+        pass
+
+
+async def replay(arrivals, target, sample_interval=0.1):
+    """
+    Open-loop replay: every request is fired at its scheduled offset whether or
+    not earlier ones have finished, and latency is measured from the scheduled
+    time (so queueing delay is not hidden by a slow sender).
+    """
+    loop = asyncio.get_running_loop()
+    latencies, errors, timeline = [], [], []
+    state = {"in_flight": 0, "completed": 0, "max_in_flight": 0}
+    start = loop.time()
+
+    async def fire(scheduled, sql):
+        try:
+            await target.call(sql)
+            latencies.append((loop.time() - scheduled) * 1000)
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+        finally:
+            state["in_flight"] -= 1
+            state["completed"] += 1
+
+    async def sample():
+        while True:
+            timeline.append({
+                "t": round(loop.time() - start, 3),
+                "in_flight": state["in_flight"],
+                "completed": state["completed"]
+            })
+            await asyncio.sleep(sample_interval)
+
+    sampler = asyncio.create_task(sample())
+    tasks = []
+    for offset, sql in arrivals:
+        scheduled = start + offset
+        delay = scheduled - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        tasks.append(asyncio.create_task(fire(scheduled, sql)))
+    await asyncio.gather(*tasks)
+    sampler.cancel()
+    duration = loop.time() - start
+
+    ordered = sorted(latencies)
+    offered = (len(arrivals) - 1) / arrivals[-1][0] if len(arrivals) > 1 and arrivals[-1][0] > 0 else None
+    return {
+        "requests": len(arrivals),
+        "completed": len(latencies),
+        "errors": len(errors),
+        "error_samples": errors[:10],
+        "duration_s": round(duration, 3),
+        "offered_qps": round(offered, 2) if offered else None,
+        "throughput_qps": round(len(latencies) / duration, 2) if duration else None,
+        "latency_ms": {
+            "p50": percentile(ordered, 0.50),
+            "p95": percentile(ordered, 0.95),
+            "p99": percentile(ordered, 0.99),
+            "max": ordered[-1] if ordered else None,
+            "mean": sum(ordered) / len(ordered) if ordered else None
+        },
+        "max_in_flight": state["max_in_flight"],
+        "timeline": timeline
+    }
+
+
+def run_replay(arrivals, target, sample_interval=0.1):
+    try:
+        return asyncio.run(replay(arrivals, target, sample_interval))
+    finally:
+        target.close()
@@ -0,0 +1,318 @@
+import math
+import time
+import random
+from array import array
+from statistics import NormalDist
+
+from sqlparse.tokens import Keyword
+
+from sqlflow.parser import parse_sql
+
+
+BATCH_SIZE = 100
+MIN_SAMPLE = 200
+MAX_SAMPLE = 20000
+SIZE_BUCKETS = 8  # size strata grow 4x per bucket; larger statements share the last
+
+
+class Metric:
+    """
+    A per-query statistic over its parsed trees. `kind="proportion"` metrics
+    return 0/1 and are estimated to an absolute precision; `kind="mean"`
+    metrics return any number and are estimated to a relative one.
+    """
+
+    __slots__ = ["name", "function", "kind"]
+
+    def __init__(self, name, function, kind="mean"):
+        self.name = name
+        self.function = function
+        self.kind = kind
+
+    def __call__(self, trees):
+        return self.function(trees)
+
+    def __repr__(self):
+        return f"Metric({self.name}, {self.kind})"
+
+
+def nodes(trees):
+    stack = [tree.root for tree in trees]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(node.children)
+
+
+def uses_window(trees):
+    return int(any(
+        leaf.ttype in Keyword and leaf.normalized == "OVER"
+        for tree in trees for leaf in tree.root.token.flatten()
+    ))
+
+
+def join_count(trees):
+    return sum(1 for node in nodes(trees) if node.type == "SQLKeyword" and "JOIN" in node.token.normalized)
+
+
+def subquery_count(trees):
+    return sum(1 for node in nodes(trees) if node.type in ("SQLSubquery", "SQLCTE"))
+
+
+def node_count(trees):
+    return sum(1 for _ in nodes(trees))
+
+
+def max_level(trees):
+    return max((node.level for node in nodes(trees)), default=0)
+
+
+METRICS = [
+    Metric("uses_window", uses_window, "proportion"),
+    Metric("join_count", join_count),
+    Metric("subquery_count", subquery_count),
+    Metric("node_count", node_count),
+    Metric("max_level", max_level),
+]
+
+
+def reservoir_sample(items, k, rng=None, key=None):
+    """
+    One pass, O(k) memory uniform sample without replacement (Algorithm R)
+    of (position, item) pairs from an iterable of unknown length. With
+    `key(position, item)`, one reservoir of up to `k` is kept per stratum.
+    Returns ({stratum: [(position, item)]}, {stratum: population size}).
+    """
+    rng = rng or random.Random()
+    reservoirs, counts = {}, {}
+    for position, item in enumerate(items):
+        stratum = key(position, item) if key else None
+        seen = counts[stratum] = counts.get(stratum, 0) + 1
+        reservoir = reservoirs.setdefault(stratum, [])
+        if len(reservoir) < k:
+            reservoir.append((position, item))
+        else:
+            slot = rng.randrange(seen)
+            if slot < k:
+                reservoir[slot] = (position, item)
+    return reservoirs, counts
+
+
+def size_bucket(size):
+    return min((max(size, 1).bit_length() - 1) // 2, SIZE_BUCKETS - 1)
+
+
+def statement_sizes(source):
+    """Per-statement sizes, read from an index where the source has one (StatementStore, CompressedStore)"""
+    index = getattr(source, "index", None)
+    if index is not None and hasattr(index, "starts"):
+        return [end - start for start, end in zip(index.starts, index.ends)]
+    if hasattr(source, "raw_lengths"):
+        return list(source.raw_lengths)
+    return [len(sql) for sql in source]
+
+
+def strata_keys(source, strata):
+    """Stratum of every statement in a random-access source: by "file", by "size" bucket, or a callable(id, source)"""
+    if strata is None:
+        return None
+    if strata == "file":
+        index = getattr(source, "index", None)
+        if index is None or not hasattr(index, "statement_files"):
+            raise ValueError("File strata need a StatementStore (sqlflow.corpus)")
+        return list(index.statement_files)
+    if strata == "size":
+        return [size_bucket(size) for size in statement_sizes(source)]
+    return [strata(statement_id, source) for statement_id in range(len(source))]
+
+
+class Stratum:
+    """
+    The ids that can be drawn from one stratum, drawn without replacement in
+    random order, and the metric values seen. `population` is the stratum's
+    true size, larger than len(ids) when the ids are a reservoir.
+    """
+
+    __slots__ = ["ids", "population", "drawn", "values"]
+
+    def __init__(self, ids, population=None):
+        self.ids = ids
+        self.population = len(ids) if population is None else population
+        self.drawn = 0
+        self.values = []  # one tuple of metric values per successfully parsed draw
+
+    @property
+    def exhausted(self):
+        return self.drawn >= len(self.ids)
+
+    def draw(self, rng):
+        """Next id of a lazy Fisher-Yates shuffle; the ids array is permuted in place"""
+        position = rng.randrange(self.drawn, len(self.ids))
+        ids = self.ids
+        ids[self.drawn], ids[position] = ids[position], ids[self.drawn]
+        self.drawn += 1
+        return ids[self.drawn - 1]
+
+
+class Estimate:
+    """A metric's stratified estimate with a normal-approximation confidence interval"""
+
+    __slots__ = ["metric", "kind", "value", "low", "high", "half_width", "target"]
+
+    def __init__(self, metric, kind, value, half_width, target):
+        self.metric = metric
+        self.kind = kind
+        self.value = value
+        self.half_width = half_width
+        self.low = value - half_width
+        self.high = value + half_width
+        self.target = target
+
+    @property
+    def precise(self):
+        return self.half_width <= self.target
+
+    def to_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __repr__(self):
+        return f"Estimate({self.metric}={self.value:.4g} ± {self.half_width:.2g})"
+
+
+def estimate(strata, metric_index, metric, confidence, precision):
+    """
+    Stratified mean: sum of W_h * mean_h, with variance sum of
+    W_h^2 * (1 - n_h / N_h) * s_h^2 / n_h. A stratum with one observation
+    borrows the pooled variance.
+    """
+    population = sum(stratum.population for stratum in strata)
+    pooled = [values[metric_index] for stratum in strata for values in stratum.values]
+    pooled_variance = variance(pooled)
+    value = var = 0.0
+    for stratum in strata:
+        observed = [values[metric_index] for values in stratum.values]
+        if not observed:
+            continue
+        weight = stratum.population / population
+        n = len(observed)
+        value += weight * sum(observed) / n
+        s2 = variance(observed) if n > 1 else pooled_variance
+        var += weight ** 2 * (1 - n / stratum.population) * s2 / n
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    half_width = z * math.sqrt(max(var, 0.0))
+    target = precision if metric.kind == "proportion" else precision * abs(value)
+    return Estimate(metric.name, metric.kind, value, half_width, target)
+
+
+def variance(values):
+    n = len(values)
+    if n < 2:
+        return 0.0
+    mean = sum(values) / n
+    return sum((v - mean) ** 2 for v in values) / (n - 1)
+
+
+class SampleReport:
+    """Estimates per metric plus how the sample was drawn and whether the requested precision was reached"""
+
+    def __init__(self, estimates, strata, population, parsed, errors, precise, elapsed):
+        self.estimates = estimates
+        self.strata = strata
+        self.population = population
+        self.parsed = parsed
+        self.errors = errors
+        self.precise = precise
+        self.elapsed = elapsed
+
+    def __getitem__(self, metric):
+        return self.estimates[metric]
+
+    def to_dict(self):
+        return {
+            "population": self.population,
+            "parsed": self.parsed,
+            "errors": self.errors,
+            "precise": self.precise,
+            "s": round(self.elapsed, 3),
+            "strata": self.strata,
+            "estimates": {name: estimate.to_dict() for name, estimate in self.estimates.items()}
+        }
+
+
+def sample_analysis(source, metrics=None, strata=None, precision=0.01, confidence=0.95, batch_size=BATCH_SIZE,
+                    min_sample=MIN_SAMPLE, max_sample=MAX_SAMPLE, seed=None, **parse_options):
+    """
+    Estimates `metrics` over a statement source by parsing a random sample
+    that grows in batches until every confidence interval is within
+    `precision` (absolute for proportions, relative to the estimate for
+    means), `max_sample` statements were parsed, or the source is exhausted.
+
+    Sequences (lists, StatementStore, CompressedStore) are sampled by id
+    without reading the rest. Other iterables are read once into a
+    reservoir of `max_sample` per stratum, which is then parsed in random
+    order. `strata` is None, "file" (StatementStore only), "size" (log-scale
+    size buckets) or a callable(id, source) for sequences / callable(position,
+    sql) for streams; batches are allocated to strata in proportion to
+    their size. Intervals use the normal approximation, so `min_sample`
+    keeps rare proportions from stopping on a zero-width interval.
+    """
+    start = time.perf_counter()
+    metrics = METRICS if metrics is None else metrics
+    rng = random.Random(seed)
+
+    if hasattr(source, "__len__") and hasattr(source, "__getitem__"):
+        keys = strata_keys(source, strata)
+        groups = {}
+        for statement_id in range(len(source)):
+            groups.setdefault(keys[statement_id] if keys else None, array("q")).append(statement_id)
+        parts = {name: Stratum(ids) for name, ids in groups.items()}
+        fetch = source.__getitem__
+    else:
+        key = None
+        if strata == "size":
+            key = lambda position, sql: size_bucket(len(sql))
+        elif callable(strata):
+            key = strata
+        elif strata is not None:
+            raise ValueError(f"Strata {strata!r} need a random-access source")
+        reservoirs, counts = reservoir_sample(source, max_sample, rng, key)
+        texts = {}
+        parts = {}
+        for name, items in reservoirs.items():
+            parts[name] = Stratum(array("q", (position for position, _ in items)), counts[name])
+            texts.update(items)
+        fetch = texts.__getitem__
+
+    names = sorted(parts, key=repr)
+    parts = [parts[name] for name in names]
+    population = sum(part.population for part in parts)
+    parsed = errors = 0
+    estimates, precise = {}, False
+    while parsed + errors < max_sample:
+        remaining = [part for part in parts if not part.exhausted]
+        if not remaining:
+            break
+        for part in remaining:
+            # proportional allocation, with at least two draws per stratum to start its variance
+            draws = max(1 if part.drawn else 2, round(batch_size * part.population / population))
+            for _ in range(min(len(part.ids) - part.drawn, draws)):
+                try:
+                    trees = [tree for tree, _ in parse_sql(fetch(part.draw(rng)), **parse_options)]
+                    part.values.append(tuple(metric(trees) for metric in metrics))
+                    parsed += 1
+                except Exception:
+                    errors += 1
+
+        estimates = {
+            metric.name: estimate(parts, i, metric, confidence, precision)
+            for i, metric in enumerate(metrics)
+        }
+        precise = all(e.precise for e in estimates.values())
+        if precise and parsed >= min_sample:
+            break
+
+    strata_summary = {
+        repr(name): {"population": part.population, "sampled": len(part.values)}
+        for name, part in zip(names, parts)
+    }
+    return SampleReport(estimates, strata_summary, population, parsed, errors, precise, time.perf_counter() - start)
@@ -0,0 +1,75 @@
+import re
+
+from sqlflow import utils as u
+
+
+DEFAULT_SCHEMA = "data/healthcare/schema.sql"
+CREATE_TABLE_PATTERN = re.compile(r"CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?([\w\"]+)\s*\((.*?)\)\s*;", re.IGNORECASE | re.DOTALL)
+COMPOSITE_KEY_PATTERN = re.compile(r"PRIMARY\s+KEY\s*\(([^)]*)\)", re.IGNORECASE)
+TYPE_PATTERN = re.compile(r"[A-Za-z_]+")
+CONSTRAINT_PREFIXES = ("PRIMARY", "FOREIGN", "UNIQUE", "CONSTRAINT", "CHECK", "KEY", "INDEX")
+
+
+class Table:
+    """A table from a schema file: ordered {column: type} and its primary key columns"""
+
+    __slots__ = ["name", "columns", "primary_key"]
+
+    def __init__(self, name, columns=None, primary_key=()):
+        self.name = name
+        self.columns = columns or {}
+        self.primary_key = tuple(primary_key)
+
+    def __repr__(self):
+        return f"Table({self.name}, columns={len(self.columns)})"
+
+
+def parse_schema(sql):
+    """Parses `CREATE TABLE` statements into {table name: Table}"""
+    sql = re.sub(r"--[^\n]*", "", sql)
+    tables = {}
+    for name, body in CREATE_TABLE_PATTERN.findall(sql):
+        table = Table(name.strip('"').lower())
+        for line in re.split(r",(?![^(]*\))", body):
+            line = line.strip()
+            if not line:
+                continue
+            if line.upper().startswith(CONSTRAINT_PREFIXES):
+                composite = COMPOSITE_KEY_PATTERN.search(line)
+                if composite:
+                    table.primary_key = tuple(c.strip().strip('"').lower() for c in composite.group(1).split(","))
+                continue
+            column, _, definition = line.partition(" ")
+            column = column.strip('"').lower()
+            column_type = TYPE_PATTERN.match(definition.strip())
+            table.columns[column] = column_type.group().upper() if column_type else "TEXT"
+            if "PRIMARY KEY" in definition.upper():
+                table.primary_key = (column,)
+        tables[table.name] = table
+    return tables
+
+
+def load_schema(path=None):
+    """Loads a schema file; defaults to the packaged healthcare schema"""
+    if path is None:
+        return parse_schema(u.get_package_file(DEFAULT_SCHEMA).read_text())
+    with open(path) as f:
+        return parse_schema(f.read())
+
+
+def infer_foreign_keys(tables):
+    """
+    Infers (table, column, referenced table) edges by name: a column that is the
+    single-column primary key of another table is treated as a reference to it.
+    """
+    owners = {
+        table.primary_key[0]: table.name
+        for table in tables.values()
+        if len(table.primary_key) == 1
+    }
+    return [
+        (table.name, column, owners[column])
+        for table in tables.values()
+        for column in table.columns
+        if column in owners and owners[column] != table.name
+    ]
@@ -0,0 +1,359 @@
+import json
+import time
+import asyncio
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from sqlflow import parser as s
+
+
+logger = logging.getLogger(__name__)
+
+HTTP_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    503: "Service Unavailable"
+}
+MAX_BODY_BYTES = 16 * 1024 * 1024
+LATENCY_WINDOW = 10000
+BATCH_POLL_INTERVAL = 0.001
+# workers forked straight from the server would inherit its open client sockets (holding them open after a
+# response), which matters once a broken pool is replaced while serving; forkserver children start clean
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else None
+
+
+# --- Worker-side functions (run inside the warm process pool) ---
+def warm_worker(log_level=logging.WARNING):
+    """Pool initializer: silences per-node logging and pays import/handler setup once per process"""
+    logging.getLogger("sqlflow").setLevel(log_level)
+    s.parse_sql("SELECT 1")
+
+
+def ping_worker():
+    """No-op task used to force every worker process to start before serving"""
+    return True
+
+
+def parse_query(sql, include_tree=True, include_triples=True):
+    """Parses one SQL string into a JSON-serializable result; errors are reported, not raised"""
+    try:
+        statements = []
+        for tree, context in s.parse_sql(sql):
+            result = {}
+            if include_tree:
+                result["tree"] = tree.root.to_dict()
+            if include_triples:
+                result["triples"] = sorted(context.triples)
+            statements.append(result)
+        return {"statements": statements, "error": None}
+    except Exception as e:
+        return {"statements": [], "error": f"{type(e).__name__}: {e}"}
+
+
+def parse_batch(batch):
+    """Parses a micro-batch of (sql, include_tree, include_triples) requests in one task"""
+    return [parse_query(*request) for request in batch]
+
+
+# --- Server ---
+class ServerMetrics:
+    """Counters and a rolling latency window exposed on `/metrics`"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.requests = 0
+        self.queries = 0
+        self.errors = 0
+        self.rejected = 0
+        self.restarts = 0
+        self.batches = 0
+        self.batched_queries = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def percentile(self, q):
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def snapshot(self, queue_depth, queue_size, workers):
+        return {
+            "uptime_s": round(time.time() - self.started, 3),
+            "workers": workers,
+            "requests_total": self.requests,
+            "queries_total": self.queries,
+            "errors_total": self.errors,
+            "rejected_total": self.rejected,
+            "pool_restarts_total": self.restarts,
+            "batches_total": self.batches,
+            "mean_batch_size": (self.batched_queries / self.batches) if self.batches else 0.0,
+            "queue_depth": queue_depth,
+            "queue_size": queue_size,
+            "latency_ms": {
+                "p50": self.percentile(0.50),
+                "p95": self.percentile(0.95),
+                "p99": self.percentile(0.99)
+            }
+        }
+
+
+class ParseServer:
+    """
+    Asyncio HTTP server in front of a warm process pool.
+
+    Incoming queries are put on a bounded queue (full queue -> 503, a request
+    with more queries than the queue holds -> 413) and drained by one batcher
+    per worker, which groups up to `batch_size` queries (waiting at most
+    `batch_timeout` seconds) into a single pool task.
+
+    If a worker dies the pool is broken: the batch in flight gets errors, a
+    fresh pool is warmed up in the background, and `/health` answers 503
+    until it is ready.
+
+    Routes:
+        POST /parse    {"sql": "..."} or {"queries": ["...", ...]}, optional "tree"/"triples" flags
+        GET  /health   liveness and readiness
+        GET  /metrics  counters, queue depth and latency percentiles
+    """
+
+    def __init__(self, host="127.0.0.1", port=8080, unix_path=None, workers=2,
+                 batch_size=16, batch_timeout=0.005, queue_size=1024, log_level=logging.WARNING):
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self.queue_size = queue_size
+        self.log_level = log_level
+        self.metrics = ServerMetrics()
+        self.pool = None
+        self.queue = None
+        self.server = None
+        self.batchers = []
+        self.restart = None
+        self.ready = False
+
+    @property
+    def address(self):
+        if self.unix_path:
+            return self.unix_path
+        return self.server.sockets[0].getsockname()[:2]
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(START_METHOD),
+            initializer=warm_worker,
+            initargs=(self.log_level,)
+        )
+
+    async def _warm(self, pool):
+        # pre-fork: make sure every worker has imported and warmed up before accepting traffic
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(pool, ping_worker) for _ in range(self.workers)])
+
+    async def start(self):
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.pool = self._new_pool()
+        await self._warm(self.pool)
+
+        self.batchers = [asyncio.create_task(self._batcher()) for _ in range(self.workers)]
+        if self.unix_path:
+            self.server = await asyncio.start_unix_server(self._handle_connection, path=self.unix_path)
+        else:
+            self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.ready = True
+        logger.info(f"sqlflow serve listening on {self.address} with {self.workers} workers")
+
+    def _replace_pool(self, broken):
+        """Swaps a broken pool for a fresh one, warmed up in the background; the server is unready meanwhile"""
+        if broken is not self.pool:
+            return  # already replaced after another batch failed on it
+        logger.error("Parser worker pool is broken; starting a new one")
+        self.ready = False
+        self.metrics.restarts += 1
+        self.pool = self._new_pool()
+        broken.shutdown(wait=False)
+        self.restart = asyncio.create_task(self._rewarm(self.pool))
+
+    async def _rewarm(self, pool):
+        try:
+            await self._warm(pool)
+        except BrokenProcessPool:
+            logger.exception("New parser worker pool failed to start; retrying on the next request or health check")
+            return
+        if pool is self.pool:
+            self.ready = True
+            logger.info("Parser worker pool restarted")
+
+    def _check_pool(self):
+        """
+        Notices a pool broken by a dead worker before a batch fails on it,
+        without queuing work on the workers. ProcessPoolExecutor has no public
+        view of its state, so this reads its `_broken` flag and worker processes.
+        """
+        if self.pool is None or (self.restart and not self.restart.done()):
+            return
+        processes = list((getattr(self.pool, "_processes", None) or {}).values())
+        if getattr(self.pool, "_broken", False) or any(not process.is_alive() for process in processes):
+            self._replace_pool(self.pool)
+
+    async def close(self):
+        self.ready = False
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+        tasks = self.batchers + ([self.restart] if self.restart else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self.pool:
+            self.pool.shutdown(wait=True)
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.close()
+
+    def enqueue(self, sql, include_tree=True, include_triples=True):
+        """Queues a single query for the next micro-batch; raises asyncio.QueueFull when saturated"""
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait(((sql, include_tree, include_triples), future, time.perf_counter()))
+        return future
+
+    async def _batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.batch_timeout
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    await asyncio.sleep(min(remaining, BATCH_POLL_INTERVAL))
+
+            self.metrics.batches += 1
+            self.metrics.batched_queries += len(batch)
+            pool = self.pool
+            try:
+                results = await loop.run_in_executor(pool, parse_batch, [request for request, _, _ in batch])
+            except BrokenProcessPool as e:
+                results = [{"statements": [], "error": f"{type(e).__name__}: {e}"}] * len(batch)
+                self._replace_pool(pool)
+            except Exception as e:
+                results = [{"statements": [], "error": f"{type(e).__name__}: {e}"}] * len(batch)
+
+            for (_, future, queued_at), result in zip(batch, results):
+                self.metrics.latencies.append((time.perf_counter() - queued_at) * 1000)
+                if result["error"]:
+                    self.metrics.errors += 1
+                if not future.done():
+                    future.set_result(result)
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request = await read_http_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                status, payload = await self._route(method, path, body)
+                keep_alive = headers.get("connection", "keep-alive").lower() != "close"
+                await write_http_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError as e:
+            await write_http_response(writer, 400, {"error": str(e)}, keep_alive=False)
+        finally:
+            writer.close()
+
+    async def _route(self, method, path, body):
+        path = path.split("?", 1)[0]
+        if path == "/health":
+            self._check_pool()
+            if self.ready:
+                return 200, {"status": "ok", "workers": self.workers}
+            return 503, {"status": "restarting" if self.restart else "starting", "workers": self.workers}
+        if path == "/metrics":
+            return 200, self.metrics.snapshot(self.queue.qsize(), self.queue_size, self.workers)
+        if path != "/parse":
+            return 404, {"error": f"Unknown path: {path}"}
+        if method != "POST":
+            return 405, {"error": "Use POST for /parse"}
+        return await self._parse(body)
+
+    async def _parse(self, body):
+        self.metrics.requests += 1
+        try:
+            payload = json.loads(body or b"{}")
+            queries = payload["queries"] if "queries" in payload else [payload["sql"]]
+            if not isinstance(queries, list) or not all(isinstance(sql, str) for sql in queries):
+                raise TypeError("Queries must be strings")
+        except (ValueError, KeyError, TypeError):
+            return 400, {"error": "Body must be JSON with a `sql` string or a `queries` list"}
+
+        include_tree = bool(payload.get("tree", True))
+        include_triples = bool(payload.get("triples", True))
+        if len(queries) > self.queue_size:
+            return 413, {"error": f"At most {self.queue_size} queries per request", "queue_size": self.queue_size}
+        if self.queue.qsize() + len(queries) > self.queue_size:
+            self.metrics.rejected += 1
+            return 503, {"error": "Parse queue is full, retry later", "queue_depth": self.queue.qsize()}
+
+        self.metrics.queries += len(queries)
+        futures = [self.enqueue(sql, include_tree, include_triples) for sql in queries]
+        results = await asyncio.gather(*futures)
+        return 200, {"results": results}
+
+
+# --- Minimal HTTP/1.1 framing ---
+async def read_http_request(reader):
+    """Reads one request as (method, path, headers, body); returns None on a clean EOF"""
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    try:
+        method, path, _ = request_line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise ValueError("Malformed request line")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip()
+
+    length = int(headers.get("content-length", 0))
+    if length > MAX_BODY_BYTES:
+        raise ValueError("Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), path, headers, body
+
+
+async def write_http_response(writer, status, payload, keep_alive=True):
+    body = json.dumps(payload).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
+    await writer.drain()
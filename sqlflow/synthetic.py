@@ -0,0 +1,169 @@
+import random
+from itertools import count
+
+from sqlflow.schema import load_schema, infer_foreign_keys
+
+
+JOIN_TYPES = ["JOIN", "JOIN", "LEFT JOIN", "INNER JOIN"]
+TEXT_VALUES = ["active", "inactive", "pending", "F", "M", "emergency", "routine", "high", "low", "unknown"]
+NUMERIC_TYPES = frozenset(["INT", "INTEGER", "BIGINT", "SMALLINT", "FLOAT", "REAL", "DOUBLE", "NUMERIC", "DECIMAL"])
+ORDERED_TYPES = NUMERIC_TYPES | frozenset(["DATE", "TIMESTAMP"])
+SIZE_PARAMETERS = ("joins", "ctes", "depth", "width", "in_list", "unions")
+
+
+def pick(rng, value):
+    """Size parameters are either fixed ints or inclusive (low, high) ranges"""
+    if isinstance(value, (tuple, list)):
+        return rng.randint(value[0], value[1])
+    return value
+
+
+class TemplateQueryGenerator:
+    """
+    Offline, template-based SQL generator driven by a schema file.
+
+    Joins follow foreign keys inferred from the schema (see `infer_foreign_keys`),
+    so every generated query references real tables and columns. Query `index`
+    under a given `seed` always produces the same SQL, so corpora can be
+    generated in parallel or regenerated piecemeal.
+
+    Size parameters (ints or inclusive ranges):
+        joins     joins in each SELECT block
+        ctes      CTEs in the WITH clause, joined into the main query
+        depth     nesting depth of `IN (SELECT ...)` subqueries
+        width     columns in the select list
+        in_list   literals in an `IN (...)` filter (0 disables it)
+        unions    additional `UNION ALL` branches
+    """
+
+    def __init__(self, tables=None, seed=0):
+        self.tables = tables or load_schema()
+        self.seed = seed
+        self.neighbors = {name: [] for name in self.tables}
+        self.tables_with_column = {}
+        self.key_columns = set()
+
+        for table, column, referenced in infer_foreign_keys(self.tables):
+            self.neighbors[table].append((referenced, column))
+            self.neighbors[referenced].append((table, column))
+            self.key_columns.add(column)
+        for table in self.tables.values():
+            for column in table.columns:
+                self.tables_with_column.setdefault(column, []).append(table.name)
+
+        self.joinable = sorted(name for name, edges in self.neighbors.items() if edges)
+
+    def generate(self, index=0, joins=2, ctes=0, depth=0, width=4, in_list=0, unions=0):
+        rng = random.Random(f"{self.seed}:{index}")
+        aliases = count()
+        joins, ctes, depth, width, in_list, unions = (
+            pick(rng, value) for value in (joins, ctes, depth, width, in_list, unions)
+        )
+
+        base = rng.choice(self.joinable)
+        scope = [(base, f"t{next(aliases)}")]
+        from_lines = [f"FROM {base} {scope[0][1]}"]
+        for _ in range(joins):
+            left_table, left_alias = rng.choice(scope)
+            right_table, column = rng.choice(self.neighbors[left_table])
+            right_alias = f"t{next(aliases)}"
+            scope.append((right_table, right_alias))
+            from_lines.append(f"{rng.choice(JOIN_TYPES)} {right_table} {right_alias} ON {left_alias}.{column} = {right_alias}.{column}")
+
+        with_clause = self._with_clause(rng, scope, from_lines, ctes, aliases)
+        select_lines = self._select_list(rng, scope, width)
+
+        branches = []
+        for _ in range(unions + 1):
+            where = self._where(rng, scope, depth, in_list, aliases)
+            branches.append("\n".join(["SELECT", ",\n".join(select_lines)] + from_lines + where))
+
+        return with_clause + "\nUNION ALL\n".join(branches) + ";"
+
+    def generate_many(self, n, start=0, **parameters):
+        for index in range(start, start + n):
+            yield self.generate(index, **parameters)
+
+    def _keys(self, table):
+        """Foreign/primary key columns of a table (every table reached by a join has at least one)"""
+        return [column for column in self.tables[table].columns if column in self.key_columns]
+
+    def _with_clause(self, rng, scope, from_lines, ctes, aliases):
+        if not ctes:
+            return ""
+        base_table, base_alias = scope[0]
+        key = rng.choice(self._keys(base_table))
+
+        definitions = []
+        for i in range(ctes):
+            source = rng.choice(self.tables_with_column[key])
+            alias = f"t{next(aliases)}"
+            body = [f"    SELECT {alias}.{key}, COUNT(*) AS n_rows_{i}", f"    FROM {source} {alias}"]
+            if i > 0 and rng.random() < 0.5:
+                body.append(f"    JOIN cte_{i - 1} p{i} ON {alias}.{key} = p{i}.{key}")
+            body.append(f"    GROUP BY {alias}.{key}")
+            definitions.append(f"cte_{i} AS (\n" + "\n".join(body) + "\n)")
+
+            cte_alias = f"c{i}"
+            from_lines.append(f"JOIN cte_{i} {cte_alias} ON {base_alias}.{key} = {cte_alias}.{key}")
+            scope.append((None, cte_alias))
+        return "WITH " + ",\n".join(definitions) + "\n"
+
+    def _select_list(self, rng, scope, width):
+        columns = [
+            f"{alias}.{column}"
+            for table, alias in scope if table
+            for column in self.tables[table].columns
+        ]
+        if width <= len(columns):
+            return [f"    {column}" for column in rng.sample(columns, width)]
+        return [f"    {rng.choice(columns)} AS col_{i}" for i in range(width)]
+
+    def _where(self, rng, scope, depth, in_list, aliases):
+        tables = [(table, alias) for table, alias in scope if table]
+        table, alias = rng.choice(tables)
+        column = rng.choice(list(self.tables[table].columns))
+        conditions = [self._comparison(rng, f"{alias}.{column}", self.tables[table].columns[column])]
+
+        if in_list:
+            table, alias = rng.choice(tables)
+            column, column_type = rng.choice(list(self.tables[table].columns.items()))
+            values = ", ".join(self._literal(rng, column_type) for _ in range(in_list))
+            conditions.append(f"{alias}.{column} IN ({values})")
+
+        if depth:
+            keyed = [(alias, column) for table, alias in tables for column in self._keys(table)]
+            alias, column = rng.choice(keyed)
+            conditions.append(f"{alias}.{column} IN {self._subquery(rng, column, depth, aliases)}")
+
+        return ["WHERE " + conditions[0]] + [f"    AND {condition}" for condition in conditions[1:]]
+
+    def _subquery(self, rng, column, depth, aliases):
+        table = rng.choice(self.tables_with_column[column])
+        alias = f"s{next(aliases)}"
+        filter_column, filter_type = rng.choice(list(self.tables[table].columns.items()))
+        conditions = [self._comparison(rng, f"{alias}.{filter_column}", filter_type)]
+
+        if depth > 1:
+            key = rng.choice(self._keys(table))
+            conditions.append(f"{alias}.{key} IN {self._subquery(rng, key, depth - 1, aliases)}")
+        return f"(SELECT {alias}.{column} FROM {table} {alias} WHERE " + " AND ".join(conditions) + ")"
+
+    def _comparison(self, rng, column, column_type):
+        operator = rng.choice(["=", ">", "<", ">="]) if column_type in ORDERED_TYPES else rng.choice(["=", "<>"])
+        return f"{column} {operator} {self._literal(rng, column_type)}"
+
+    def _literal(self, rng, column_type):
+        if column_type in ("INT", "INTEGER", "BIGINT", "SMALLINT"):
+            return str(rng.randint(0, 1000))
+        if column_type in NUMERIC_TYPES:
+            return f"{rng.uniform(0, 100):.2f}"
+        if column_type == "BOOLEAN":
+            return rng.choice(["TRUE", "FALSE"])
+        if column_type == "DATE":
+            return f"'20{rng.randint(15, 25)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}'"
+        if column_type == "TIMESTAMP":
+            return f"'20{rng.randint(15, 25)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} {rng.randint(0, 23):02d}:00:00'"
+        if column_type == "UUID":
+            return f"'{rng.getrandbits(128):032x}'"
+        return f"'{rng.choice(TEXT_VALUES)}'"
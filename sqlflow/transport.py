@@ -0,0 +1,277 @@
+import logging
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+from sqlflow import (
+    nodes as n,
+    parser as s
+)
+
+
+NODE_FIELDS = 5  # type id, parent index, level, name string id, uri string id
+TYPE_IDS = {node_type.__name__: i for i, node_type in enumerate(n.NODE_TYPES)}
+TYPE_NAMES = [node_type.__name__ for node_type in n.NODE_TYPES]
+
+
+class SegmentDescriptor:
+    """The only thing sent back to the parent: where a chunk's arrays live and how long they are"""
+
+    __slots__ = ["name", "n_queries", "n_statements", "n_nodes", "n_triples", "n_strings", "string_bytes", "errors"]
+
+    def __init__(self, name, n_queries, n_statements, n_nodes, n_triples, n_strings, string_bytes, errors):
+        self.name = name
+        self.n_queries = n_queries
+        self.n_statements = n_statements
+        self.n_nodes = n_nodes
+        self.n_triples = n_triples
+        self.n_strings = n_strings
+        self.string_bytes = string_bytes
+        self.errors = errors
+
+    def __getstate__(self):
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __setstate__(self, state):
+        for slot, value in zip(self.__slots__, state):
+            setattr(self, slot, value)
+
+    def layout(self):
+        """Byte ranges of each array inside the segment; int64 first so every array stays aligned"""
+        sizes = [
+            ("string_offsets", 8 * (self.n_strings + 1)),
+            ("statement_queries", 4 * self.n_statements),
+            ("statement_nodes", 4 * (self.n_statements + 1)),
+            ("statement_triples", 4 * (self.n_statements + 1)),
+            ("nodes", 4 * NODE_FIELDS * self.n_nodes),
+            ("triples", 4 * 3 * self.n_triples),
+            ("strings", self.string_bytes)
+        ]
+        ranges, offset = {}, 0
+        for field, size in sizes:
+            ranges[field] = (offset, offset + size)
+            offset += size
+        return ranges, offset
+
+
+class StringTable:
+    """Interns strings to dense integer ids"""
+
+    def __init__(self):
+        self.ids = {}
+        self.values = []
+
+    def intern(self, value):
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return string_id
+
+    def encode(self):
+        offsets, chunks, position = array("q", [0]), [], 0
+        for value in self.values:
+            encoded = value.encode("utf-8")
+            chunks.append(encoded)
+            position += len(encoded)
+            offsets.append(position)
+        return offsets, b"".join(chunks)
+
+
+def create_segment(size):
+    """Creates a segment whose lifetime is owned by the parent (which attaches and unlinks it)"""
+    try:
+        return shared_memory.SharedMemory(create=True, size=size, track=False)
+    except TypeError:  # Python < 3.13 has no `track`; hand ownership over by unregistering
+        segment = shared_memory.SharedMemory(create=True, size=size)
+        resource_tracker.unregister(segment._name, "shared_memory")
+        return segment
+
+
+def parse_chunk(queries):
+    """Parses a chunk of queries into [(query index, SQLTree, ParsingContext)] and {query index: error}"""
+    parsed, errors = [], {}
+    for query_index, sql in enumerate(queries):
+        try:
+            parsed.extend((query_index, tree, context) for tree, context in s.parse_sql(sql))
+        except Exception as e:
+            errors[query_index] = f"{type(e).__name__}: {e}"
+    return parsed, errors
+
+
+def parse_to_segment(queries):
+    """
+    Worker side: parses a chunk of queries and writes flat node/triple arrays
+    plus an interned string table into one shared memory segment.
+    """
+    parsed, errors = parse_chunk(queries)
+    return write_segment(parsed, len(queries), errors)
+
+
+def write_segment(parsed, n_queries, errors):
+    """Flattens parsed statements into one shared memory segment and returns its descriptor"""
+    strings = StringTable()
+    statement_queries = array("i")
+    statement_nodes = array("i", [0])
+    statement_triples = array("i", [0])
+    nodes, triples = array("i"), array("i")
+
+    for query_index, tree, context in parsed:
+        base = len(nodes) // NODE_FIELDS
+        stack = [(tree.root, -1)]
+        while stack:
+            node, parent_index = stack.pop()
+            index = len(nodes) // NODE_FIELDS - base
+            nodes.extend((TYPE_IDS.get(node.type, 0), parent_index, node.level, strings.intern(node.name), strings.intern(node.uri)))
+            stack.extend((child, index) for child in reversed(node.children))
+
+        for subject, predicate, object_ in context.triples:
+            triples.extend((strings.intern(subject), strings.intern(predicate), strings.intern(str(object_))))
+
+        statement_queries.append(query_index)
+        statement_nodes.append(len(nodes) // NODE_FIELDS)
+        statement_triples.append(len(triples) // 3)
+
+    string_offsets, string_data = strings.encode()
+    descriptor = SegmentDescriptor(
+        name=None,
+        n_queries=n_queries,
+        n_statements=len(statement_queries),
+        n_nodes=len(nodes) // NODE_FIELDS,
+        n_triples=len(triples) // 3,
+        n_strings=len(strings.values),
+        string_bytes=len(string_data),
+        errors=errors
+    )
+    ranges, total = descriptor.layout()
+    segment = create_segment(max(total, 1))
+    payloads = {
+        "string_offsets": string_offsets.tobytes(),
+        "statement_queries": statement_queries.tobytes(),
+        "statement_nodes": statement_nodes.tobytes(),
+        "statement_triples": statement_triples.tobytes(),
+        "nodes": nodes.tobytes(),
+        "triples": triples.tobytes(),
+        "strings": string_data
+    }
+    for field, (start, end) in ranges.items():
+        segment.buf[start:end] = payloads[field]
+    descriptor.name = segment.name
+    segment.close()
+    return descriptor
+
+
+class SharedParseResult:
+    """
+    Parent side: attaches to a worker's segment and exposes zero-copy views.
+
+    `nodes` is a flat int32 view of NODE_FIELDS columns per node (pre-order,
+    parent indices relative to the statement) and `triples` a flat int32 view
+    of string ids. Strings are decoded only when asked for. Call `close()`
+    (or use as a context manager) to release the views and unlink the segment.
+    """
+
+    def __init__(self, descriptor):
+        self.descriptor = descriptor
+        self.errors = descriptor.errors
+        self.segment = shared_memory.SharedMemory(name=descriptor.name)
+        ranges, _ = descriptor.layout()
+        buffer = self.segment.buf
+        self.string_offsets = buffer[slice(*ranges["string_offsets"])].cast("q")
+        self.statement_queries = buffer[slice(*ranges["statement_queries"])].cast("i")
+        self.statement_nodes = buffer[slice(*ranges["statement_nodes"])].cast("i")
+        self.statement_triples = buffer[slice(*ranges["statement_triples"])].cast("i")
+        self.nodes = buffer[slice(*ranges["nodes"])].cast("i")
+        self.triples = buffer[slice(*ranges["triples"])].cast("i")
+        self.strings = buffer[slice(*ranges["strings"])]
+        self._decoded = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.descriptor.n_statements
+
+    def string(self, string_id):
+        value = self._decoded.get(string_id)
+        if value is None:
+            start, end = self.string_offsets[string_id], self.string_offsets[string_id + 1]
+            value = self._decoded[string_id] = bytes(self.strings[start:end]).decode("utf-8")
+        return value
+
+    def statement_query(self, statement):
+        return self.statement_queries[statement]
+
+    def statement_node_rows(self, statement):
+        """(type name, parent index, level, name, uri) per node of one statement, in pre-order"""
+        rows = []
+        for row in range(self.statement_nodes[statement], self.statement_nodes[statement + 1]):
+            base = row * NODE_FIELDS
+            type_id, parent, level, name_id, uri_id = self.nodes[base:base + NODE_FIELDS]
+            rows.append((TYPE_NAMES[type_id], parent, level, self.string(name_id), self.string(uri_id)))
+        return rows
+
+    def statement_triple_set(self, statement):
+        result = set()
+        for row in range(self.statement_triples[statement], self.statement_triples[statement + 1]):
+            base = row * 3
+            result.add(tuple(self.string(string_id) for string_id in self.triples[base:base + 3]))
+        return result
+
+    def materialize(self):
+        """Copies everything out into plain Python objects: [{query, nodes, triples}] per statement"""
+        return [
+            {
+                "query": self.statement_query(statement),
+                "nodes": self.statement_node_rows(statement),
+                "triples": self.statement_triple_set(statement)
+            }
+            for statement in range(len(self))
+        ]
+
+    def close(self):
+        if self.segment is None:
+            return
+        for view in (self.string_offsets, self.statement_queries, self.statement_nodes,
+                     self.statement_triples, self.nodes, self.triples, self.strings):
+            view.release()
+        self.segment.close()
+        self.segment.unlink()
+        self.segment = None
+
+
+def quiet_worker():
+    logging.getLogger("sqlflow").setLevel(logging.WARNING)
+
+
+def chunked(items, chunk_size):
+    for start in range(0, len(items), chunk_size):
+        yield items[start:start + chunk_size]
+
+
+def parse_many_shared(queries, processes=None, chunk_size=64):
+    """
+    Parses queries in a process pool, returning results through shared memory.
+
+    Yields one SharedParseResult per chunk, in order. Each result is closed
+    (views released, segment unlinked) when the generator advances, so copy
+    out anything you need (e.g. with `materialize()`) before moving on.
+    """
+    queries = list(queries)
+    with ProcessPoolExecutor(max_workers=processes, initializer=quiet_worker) as pool:
+        descriptors = pool.map(parse_to_segment, chunked(queries, chunk_size))
+        try:
+            for descriptor in descriptors:
+                with SharedParseResult(descriptor) as result:
+                    yield result
+        finally:
+            for descriptor in descriptors:  # abandoned early: unlink segments nobody will read
+                SharedParseResult(descriptor).close()
+
+
+def parse_chunk_pickled(queries):
+    """Baseline transport: return full (SQLTree, ParsingContext) pairs and let the pool pickle them"""
+    return [s.parse_sql(sql) for sql in queries]
@@ -0,0 +1,294 @@
+import re
+import hashlib
+from collections import Counter
+from difflib import SequenceMatcher
+
+from sqlparse.sql import Identifier, Parenthesis
+
+from sqlflow.parser import parse_sql
+
+
+# containers whose children cover their whole text, so they are hashed by name and children only
+SCOPE_TYPES = frozenset(["SQLQuery", "SQLSubquery", "SQLCTE"])
+UUID_PATTERN = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+
+def collapse(text):
+    return " ".join(text.split())
+
+
+def scope_name(node):
+    """Name of a CTE, or alias of a derived table; None for other nodes"""
+    token = node.token
+    if node.type == "SQLCTE" and isinstance(token, Identifier):
+        return token.get_name()
+    if node.type == "SQLSubquery" and isinstance(token, Identifier):
+        first = token.token_first(skip_cm=True)
+        return token.get_alias() if isinstance(first, Parenthesis) else token.get_name()
+    return None
+
+
+def scope_label(node, parent_label, in_named=False):
+    """
+    Where changes inside `node` are located, e.g. "CTE RecentVisits > subquery d".
+    The parenthesized body of a named CTE or derived table (`in_named`) adds no level.
+    """
+    token = node.token
+    if node.type == "SQLQuery" or (in_named and not isinstance(token, Identifier)):
+        return parent_label
+    if isinstance(token, Identifier):
+        first = token.token_first(skip_cm=True)
+        kind = "CTE" if node.type == "SQLCTE" or not isinstance(first, Parenthesis) else "subquery"
+        label = f"{kind} {scope_name(node)}"
+    else:
+        label = "subquery"
+    return f"{parent_label} > {label}" if parent_label else label
+
+
+def node_text(node):
+    return collapse(node.token.value)
+
+
+def node_label(node):
+    """What a node contributes to its own hash besides its children"""
+    if node.type in SCOPE_TYPES:
+        return f"{node.type}\0{scope_name(node) or ''}"
+    return f"{node.type}\0{collapse(node.token.value)}"
+
+
+def merkle_hashes(root):
+    """
+    {id(node): (digest, subtree size)} for every node under `root`. A
+    node's digest covers its type, its own label and its children's
+    digests in order, so equal digests mean structurally equal subtrees.
+    """
+    hashes, stack = {}, [(root, False)]
+    while stack:
+        node, done = stack.pop()
+        if not done:
+            stack.append((node, True))
+            stack.extend((child, False) for child in node.children)
+            continue
+        digest = hashlib.blake2b(node_label(node).encode("utf-8"), digest_size=16)
+        size = 1
+        for child in node.children:
+            child_digest, child_size = hashes[id(child)]
+            digest.update(child_digest)
+            size += child_size
+        hashes[id(node)] = (digest.digest(), size)
+    return hashes
+
+
+class NodeChange:
+    """One structural difference: kind (added, removed, moved, changed), node class, where, and the text involved"""
+
+    __slots__ = ["kind", "type", "scope", "old", "new", "old_scope"]
+
+    def __init__(self, kind, node_type, scope, old=None, new=None, old_scope=None):
+        self.kind = kind
+        self.type = node_type
+        self.scope = scope
+        self.old = old
+        self.new = new
+        self.old_scope = old_scope
+
+    def to_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __str__(self):
+        where = f" in {self.scope}" if self.scope else ""
+        if self.kind == "changed":
+            return f"{self.type} changed{where}: {self.old} -> {self.new}"
+        if self.kind == "moved" and self.old_scope != self.scope:
+            return f"{self.type} moved from {self.old_scope or 'top level'} to {self.scope or 'top level'}: {self.new}"
+        return f"{self.type} {self.kind}{where}: {self.old if self.kind == 'removed' else self.new}"
+
+    def __repr__(self):
+        return f"NodeChange({self})"
+
+
+class TreeDiff:
+    """
+    Structural diff of two parse results. Subtrees with equal Merkle
+    digests are matched without being visited; everything else is aligned
+    child by child (longest matching runs of digests first).
+    """
+
+    def __init__(self, changes, triples_added=(), triples_removed=(), visited=0, skipped=0):
+        self.changes = changes
+        self.triples_added = sorted(triples_added)
+        self.triples_removed = sorted(triples_removed)
+        self.visited = visited
+        self.skipped = skipped
+
+    def __bool__(self):
+        return bool(self.changes or self.triples_added or self.triples_removed)
+
+    def summary(self):
+        """{"<kind> <node class>": count}"""
+        return dict(Counter(f"{change.kind} {change.type}" for change in self.changes))
+
+    def to_dict(self):
+        return {
+            "summary": self.summary(),
+            "changes": [str(change) for change in self.changes],
+            "triples_added": [list(triple) for triple in self.triples_added],
+            "triples_removed": [list(triple) for triple in self.triples_removed],
+            "nodes_visited": self.visited,
+            "nodes_skipped": self.skipped
+        }
+
+
+class TreeDiffer:
+    def __init__(self, old_hashes, new_hashes):
+        self.old_hashes = old_hashes
+        self.new_hashes = new_hashes
+        self.changes = []
+        self.removed, self.added = [], []  # (node, scope) subtree roots not matched in place
+        self.changed = []  # (old, new, scope) pairs that differ, reported unless either side moved
+        self.visited = self.skipped = 0
+
+    def align(self, old, new, scope, in_named=False):
+        self.visited += 1
+        if self.old_hashes[id(old)][0] == self.new_hashes[id(new)][0]:
+            self.skipped += self.old_hashes[id(old)][1]
+            return
+        if old.type in SCOPE_TYPES and node_label(old) == node_label(new):
+            self.align_children(old, new, scope_label(new, scope, in_named), scope_name(new) is not None)
+        else:
+            self.changed.append((old, new, scope))
+
+    def align_children(self, old, new, scope, in_named=False):
+        old_children, new_children = old.children, new.children
+        matcher = SequenceMatcher(
+            None,
+            [self.old_hashes[id(child)][0] for child in old_children],
+            [self.new_hashes[id(child)][0] for child in new_children],
+            autojunk=False
+        )
+        olds, news = [], []
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                self.visited += i2 - i1
+                self.skipped += sum(self.old_hashes[id(child)][1] for child in old_children[i1:i2])
+            else:
+                olds.extend(old_children[i1:i2])
+                news.extend(new_children[j1:j2])
+        if olds or news:
+            self.pair(olds, news, scope, in_named)
+
+    def pair(self, olds, news, scope, in_named=False):
+        """
+        Pairs replaced children by class and identity (table, CTE or alias
+        name), then by class in order; named CTEs and derived tables only
+        pair by name, so a renamed one is a removal and an addition.
+        """
+        unpaired = list(news)
+        by_type = lambda node: None if node.type in SCOPE_TYPES and scope_name(node) else node.type
+        for key in (lambda node: (node.type, identity(node)), by_type):
+            remaining = []
+            for old in olds:
+                match = next((new for new in unpaired if key(new) == key(old)), None)
+                if match is None or key(old) is None:
+                    remaining.append(old)
+                else:
+                    unpaired.remove(match)
+                    if self.old_hashes[id(old)][0] == self.new_hashes[id(match)][0]:
+                        # identical, but outside the aligned runs: reordered among its siblings
+                        self.visited += 1
+                        self.skipped += self.old_hashes[id(old)][1]
+                        self.changes.append(NodeChange("moved", match.type, scope, node_text(old), node_text(match), scope))
+                    else:
+                        self.align(old, match, scope, in_named)
+            olds = remaining
+        self.removed.extend((old, scope) for old in olds)
+        self.added.extend((new, scope) for new in unpaired)
+
+    def finish(self):
+        """
+        Reports what was not matched in place. A removed or changed-from
+        subtree identical to an added or changed-to one elsewhere is a move;
+        the other side of a changed pair with a moved side becomes a plain
+        removal or addition.
+        """
+        olds = self.removed + [(old, scope) for old, _, scope in self.changed]
+        news = self.added + [(new, scope) for _, new, scope in self.changed]
+        by_digest = {}
+        for node, scope in olds:
+            by_digest.setdefault(self.old_hashes[id(node)][0], []).append((node, scope))
+        moved = set()
+        for node, scope in news:
+            candidates = by_digest.get(self.new_hashes[id(node)][0])
+            if candidates:
+                old, old_scope = candidates.pop(0)
+                moved.update((id(old), id(node)))
+                self.changes.append(NodeChange("moved", node.type, scope, node_text(old), node_text(node), old_scope))
+
+        for old, new, scope in self.changed:
+            if id(old) in moved and id(new) not in moved:
+                self.added.append((new, scope))
+            elif id(new) in moved and id(old) not in moved:
+                self.removed.append((old, scope))
+            elif id(old) not in moved:
+                self.changes.append(NodeChange("changed", new.type, scope, node_text(old), node_text(new)))
+        for node, scope in self.added:
+            if id(node) not in moved:
+                self.changes.append(NodeChange("added", node.type, scope, new=node_text(node)))
+        for node, scope in self.removed:
+            if id(node) not in moved:
+                self.changes.append(NodeChange("removed", node.type, scope, old=node_text(node)))
+        return self.changes
+
+
+def identity(node):
+    if node.type == "SQLTable" and isinstance(node.token, Identifier):
+        return (node.token.get_real_name() or "").lower()
+    name = scope_name(node)
+    return name.lower() if name else None
+
+
+def masked_triples(triples):
+    """Triples with per-node uuids masked, so the same structure gives the same triples across parses"""
+    return Counter(tuple(UUID_PATTERN.sub("*", str(part)) for part in triple) for triple in triples)
+
+
+def diff_trees(old, new, old_triples=None, new_triples=None, scope=""):
+    """TreeDiff of two SQLTrees, plus their (uuid-masked) triple difference when triple sets are given"""
+    differ = TreeDiffer(merkle_hashes(old.root), merkle_hashes(new.root))
+    differ.align(old.root, new.root, scope)
+    changes = differ.finish()
+    added = removed = ()
+    if old_triples is not None and new_triples is not None:
+        old_counts, new_counts = masked_triples(old_triples), masked_triples(new_triples)
+        added, removed = (new_counts - old_counts).elements(), (old_counts - new_counts).elements()
+    return TreeDiff(changes, added, removed, differ.visited, differ.skipped)
+
+
+def diff_sql(old_sql, new_sql, **parse_options):
+    """
+    Structural diff of two versions of a SQL string, statement by statement
+    (statements beyond the shorter version are reported as whole additions
+    or removals). Parse options are passed to `parse_sql`.
+    """
+    old_parsed, new_parsed = parse_sql(old_sql, **parse_options), parse_sql(new_sql, **parse_options)
+    several = max(len(old_parsed), len(new_parsed)) > 1
+    changes, added, removed, visited, skipped = [], [], [], 0, 0
+    for i in range(max(len(old_parsed), len(new_parsed))):
+        scope = f"statement {i + 1}" if several else ""
+        if i >= len(old_parsed):
+            tree, context = new_parsed[i]
+            changes.append(NodeChange("added", tree.root.type, scope, new=node_text(tree.root)))
+            added.extend(masked_triples(context.triples).elements())
+        elif i >= len(new_parsed):
+            tree, context = old_parsed[i]
+            changes.append(NodeChange("removed", tree.root.type, scope, old=node_text(tree.root)))
+            removed.extend(masked_triples(context.triples).elements())
+        else:
+            (old_tree, old_context), (new_tree, new_context) = old_parsed[i], new_parsed[i]
+            statement = diff_trees(old_tree, new_tree, old_context.triples, new_context.triples, scope)
+            changes.extend(statement.changes)
+            added.extend(statement.triples_added)
+            removed.extend(statement.triples_removed)
+            visited += statement.visited
+            skipped += statement.skipped
+    return TreeDiff(changes, added, removed, visited, skipped)
@@ -0,0 +1,466 @@
+import os
+import json
+import mmap
+import heapq
+import hashlib
+import logging
+import threading
+from array import array
+from contextlib import contextmanager
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+from sqlflow.parser import parse_sql
+
+
+SEGMENT_MAGIC = b"SQLFTS01"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+SEGMENT_PATTERN = "segment_*.seg"
+FANOUT = 4  # segments of one level merged into one of the next
+BLOOM_BITS_PER_KEY = 10
+BLOOM_HASHES = 7  # ~1% false positives at 10 bits per key
+FOOTER = 8 * 8 + 16  # eight int64 fields and a 16-byte digest
+
+logger = logging.getLogger(__name__)
+
+
+def fsync_directory(directory):
+    """Makes a rename in `directory` durable (a no-op where directories cannot be opened)"""
+    try:
+        descriptor = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
+
+
+def write_durably(path, chunks):
+    """Writes to a temporary file beside `path`, fsyncs it and renames it over `path`"""
+    path = Path(path)
+    temporary = path.with_name(path.name + ".tmp")
+    with open(temporary, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+    fsync_directory(path.parent)
+    return path
+
+
+class BloomFilter:
+    """Bit array with `hashes` probes per key, derived from one blake2b digest by double hashing"""
+
+    __slots__ = ["bits", "hashes", "data"]
+
+    def __init__(self, bits, hashes=BLOOM_HASHES, data=None):
+        self.bits = max(bits, 8)
+        self.hashes = hashes
+        self.data = bytearray((self.bits + 7) // 8) if data is None else data
+
+    @classmethod
+    def build(cls, keys, bits_per_key=BLOOM_BITS_PER_KEY, hashes=BLOOM_HASHES):
+        keys = list(keys)
+        bloom = cls(len(keys) * bits_per_key, hashes)
+        for key in keys:
+            bloom.add(key)
+        return bloom
+
+    def positions(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.bits for i in range(self.hashes))
+
+    def add(self, key):
+        for position in self.positions(key):
+            self.data[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        data = self.data
+        return all(data[position >> 3] & (1 << (position & 7)) for position in self.positions(key))
+
+
+def subject_key(subject):
+    return "s\0" + subject
+
+
+def predicate_key(predicate):
+    return "p\0" + predicate
+
+
+def write_segment(path, triples):
+    """
+    Writes sorted, distinct (subject, predicate, object) triples as a segment:
+
+        magic | string blob | padding | string offsets (m + 1)
+        | subject, predicate, object id columns (n each, sorted by triple)
+        | predicate-ordered row permutation (n) and its predicate ids (n)
+        | Bloom filter over subjects and predicates | padding
+        | m, n, positions of offsets, columns and filter, filter bits and hashes | digest
+
+    Strings are stored once, in sorted order, so ids compare like the
+    strings and each column can be binary searched in place.
+    """
+    triples = list(triples)
+    strings = sorted({part for triple in triples for part in triple})
+    ids = {string: i for i, string in enumerate(strings)}
+    offsets, blob = array("q", [0]), bytearray()
+    for string in strings:
+        blob += string.encode("utf-8")
+        offsets.append(len(blob))
+    blob += b"\0" * (-(len(SEGMENT_MAGIC) + len(blob)) % 8)
+
+    subjects = array("q", (ids[s] for s, _, _ in triples))
+    predicates = array("q", (ids[p] for _, p, _ in triples))
+    objects = array("q", (ids[o] for _, _, o in triples))
+    by_predicate = array("q", sorted(range(len(triples)), key=lambda row: (predicates[row], row)))
+    predicate_keys = array("q", (predicates[row] for row in by_predicate))
+    bloom = BloomFilter.build([subject_key(s) for s in {s for s, _, _ in triples}] + [predicate_key(p) for p in {p for _, p, _ in triples}])
+    bloom_data = bytes(bloom.data) + b"\0" * (-len(bloom.data) % 8)
+
+    offsets_position = len(SEGMENT_MAGIC) + len(blob)
+    columns_position = offsets_position + offsets.itemsize * len(offsets)
+    bloom_position = columns_position + 5 * subjects.itemsize * len(triples)
+    body = [
+        SEGMENT_MAGIC, bytes(blob), offsets.tobytes(),
+        subjects.tobytes(), predicates.tobytes(), objects.tobytes(), by_predicate.tobytes(), predicate_keys.tobytes(),
+        bloom_data,
+        array("q", [len(strings), len(triples), offsets_position, columns_position, bloom_position, bloom.bits, bloom.hashes, 0]).tobytes()
+    ]
+    digest = hashlib.blake2b(digest_size=16)
+    for chunk in body:
+        digest.update(chunk)
+    write_durably(path, body + [digest.digest()])
+    return len(triples)
+
+
+class Strings:
+    """The segment's sorted string table as a read-only sequence (for bisect)"""
+
+    def __init__(self, data, offsets):
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return bytes(self.data[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8")
+
+    def find(self, string):
+        i = bisect_left(self, string)
+        return i if i < len(self) and self[i] == string else None
+
+
+class Segment:
+    """An immutable, memory-mapped segment file; columns are read in place"""
+
+    def __init__(self, path, level=0):
+        self.path = Path(path)
+        self.level = level
+        self.readers = 0  # lookups in progress, guarded by the owning store's lock
+        self.retired = False  # replaced by a merge; closed and removed once no reader is left
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < len(SEGMENT_MAGIC) + FOOTER or self._map[:len(SEGMENT_MAGIC)] != SEGMENT_MAGIC:
+            self._map.close()
+            raise ValueError(f"{self.path} is not a triple store segment")
+        view = memoryview(self._map)
+        footer = view[-FOOTER:-16].cast("q")
+        n_strings, self.count, offsets_position, columns_position, bloom_position, bits, hashes, _ = footer
+        footer.release()
+        self._views = [view]
+        offsets = self._view(offsets_position, n_strings + 1)
+        blob = view[len(SEGMENT_MAGIC):offsets_position]
+        self._views.append(blob)
+        self.strings = Strings(blob, offsets)
+        self.subjects, self.predicates, self.objects, self.predicate_order, self.predicate_keys = (
+            self._view(columns_position + 8 * self.count * i, self.count) for i in range(5)
+        )
+        self.bloom = BloomFilter(bits, hashes, bytes(view[bloom_position:bloom_position + (bits + 7) // 8]))
+
+    def _view(self, position, count):
+        view = self._views[0][position:position + 8 * count].cast("q")
+        self._views.append(view)
+        return view
+
+    def __len__(self):
+        return self.count
+
+    def triple(self, row):
+        strings = self.strings
+        return strings[self.subjects[row]], strings[self.predicates[row]], strings[self.objects[row]]
+
+    def __iter__(self):
+        return (self.triple(row) for row in range(self.count))
+
+    def by_subject(self, subject):
+        if subject_key(subject) not in self.bloom:
+            return []
+        subject_id = self.strings.find(subject)
+        if subject_id is None:
+            return []
+        return [self.triple(row) for row in range(bisect_left(self.subjects, subject_id), bisect_right(self.subjects, subject_id))]
+
+    def by_predicate(self, predicate):
+        if predicate_key(predicate) not in self.bloom:
+            return []
+        predicate_id = self.strings.find(predicate)
+        if predicate_id is None:
+            return []
+        low, high = bisect_left(self.predicate_keys, predicate_id), bisect_right(self.predicate_keys, predicate_id)
+        return [self.triple(self.predicate_order[i]) for i in range(low, high)]
+
+    def verify(self):
+        """Whether the file's digest matches its contents (catches torn or corrupted writes)"""
+        digest = hashlib.blake2b(self._map[:-16], digest_size=16).digest()
+        return digest == self._map[-16:]
+
+    def close(self):
+        if self._map is None:
+            return
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._map.close()
+        self._map = None
+
+
+def merge_triples(segments):
+    """Sorted, distinct triples of several segments (k-way merge)"""
+    previous = None
+    for triple in heapq.merge(*segments):
+        if triple != previous:
+            yield triple
+            previous = triple
+
+
+class TripleStore:
+    """
+    Append-only, log-structured triple store in a directory. Each `add`
+    batch is written as an immutable sorted segment at level 0; whenever a
+    level holds `fanout` segments they are merged and deduplicated into one
+    segment of the next level, in a background thread unless `background`
+    is False. `manifest.json` lists the live segments.
+
+    Segments and the manifest are written to a temporary file, fsynced and
+    renamed, and the manifest is only replaced after the segments it names
+    are durable, so a crash leaves the previous manifest and its segments
+    intact. On open, files the manifest does not name (an interrupted flush
+    or merge) are deleted, and segments a merge replaced are removed once
+    the manifest no longer lists them.
+    """
+
+    def __init__(self, directory, fanout=FANOUT, background=True):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.fanout = fanout
+        self._lock = threading.Lock()  # guards segments, next_id and the manifest file
+        self._merging = threading.Lock()  # one merge at a time
+        self._wake = threading.Condition()
+        self._pending = self._closed = False
+        self.next_id, self.segments = 0, []
+        self._recover()
+        self._worker = None
+        if background:
+            self._worker = threading.Thread(target=self._run, name="sqlflow-triplestore-compaction", daemon=True)
+            self._worker.start()
+
+    def _recover(self):
+        path = self.directory / MANIFEST_NAME
+        if path.exists():
+            with open(path) as f:
+                manifest = json.load(f)
+            if manifest.get("version") != MANIFEST_VERSION:
+                raise ValueError(f"{path} has unsupported version {manifest.get('version')}")
+            self.next_id = manifest["next_id"]
+            self.segments = [Segment(self.directory / entry["name"], entry["level"]) for entry in manifest["segments"]]
+        live = {segment.path.name for segment in self.segments}
+        for leftover in [*self.directory.glob(SEGMENT_PATTERN), *self.directory.glob("*.tmp")]:
+            if leftover.name not in live:
+                logger.info(f"Removing {leftover.name}, not in the triple store manifest")
+                leftover.unlink()
+
+    def _write_manifest(self):
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "next_id": self.next_id,
+            "segments": [{"name": s.path.name, "level": s.level, "triples": s.count} for s in self.segments]
+        }
+        write_durably(self.directory / MANIFEST_NAME, [json.dumps(manifest, indent=2).encode("utf-8")])
+
+    def _new_path(self):
+        with self._lock:
+            self.next_id += 1
+            return self.directory / f"segment_{self.next_id:08d}.seg"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add(self, triples):
+        """Writes one batch of triples as a new level-0 segment; returns how many distinct triples it holds"""
+        triples = sorted({tuple(triple) for triple in triples})
+        if not triples:
+            return 0
+        path = self._new_path()
+        write_segment(path, triples)
+        with self._lock:
+            self.segments.append(Segment(path, 0))
+            self._write_manifest()
+        if self._worker is None:
+            self.compact()
+        else:
+            with self._wake:
+                self._pending = True
+                self._wake.notify()
+        return len(triples)
+
+    def add_queries(self, queries, **parse_options):
+        """Parses SQL strings and adds their triples as one batch; unparseable queries are skipped and counted"""
+        triples, errors = set(), 0
+        for sql in queries:
+            try:
+                for _, context in parse_sql(sql, **parse_options):
+                    triples |= context.triples
+            except Exception:
+                errors += 1
+        return self.add(triples), errors
+
+    def _due(self, full):
+        """The oldest `fanout` segments of the lowest level that has that many, or every segment when `full`"""
+        with self._lock:
+            if full:
+                return list(self.segments) if len(self.segments) > 1 else []
+            by_level = {}
+            for segment in self.segments:
+                by_level.setdefault(segment.level, []).append(segment)
+            for level in sorted(by_level):
+                if len(by_level[level]) >= self.fanout:
+                    return by_level[level][:self.fanout]
+        return []
+
+    def compact(self, full=False):
+        """Runs merges until no level holds `fanout` segments (or, when `full`, into a single segment)"""
+        merges = 0
+        with self._merging:
+            while True:
+                inputs = self._due(full)
+                if not inputs:
+                    return merges
+                self._merge(inputs)
+                merges += 1
+                if full:
+                    return merges
+
+    def _merge(self, inputs):
+        path = self._new_path()
+        write_segment(path, merge_triples(inputs))
+        merged = Segment(path, max(segment.level for segment in inputs) + 1)
+        with self._lock:
+            replaced = {id(segment) for segment in inputs}
+            position = min(i for i, segment in enumerate(self.segments) if id(segment) in replaced)
+            remaining = [segment for segment in self.segments if id(segment) not in replaced]
+            self.segments = remaining[:position] + [merged] + remaining[position:]
+            self._write_manifest()
+            for segment in inputs:
+                segment.retired = True
+            unread = [segment for segment in inputs if not segment.readers]
+        # segments still being read are removed by their last reader (see `_reading`)
+        for segment in unread:
+            self._remove(segment)
+
+    def _remove(self, segment):
+        segment.close()
+        try:
+            segment.path.unlink()
+        except OSError:
+            logger.warning(f"Could not remove merged segment {segment.path.name}; it is removed on next open")
+
+    @contextmanager
+    def _reading(self):
+        """The current segments, kept open until the block exits even if a merge replaces them meanwhile"""
+        with self._lock:
+            segments = list(self.segments)
+            for segment in segments:
+                segment.readers += 1
+        try:
+            yield segments
+        finally:
+            with self._lock:
+                for segment in segments:
+                    segment.readers -= 1
+                done = [segment for segment in segments if segment.retired and not segment.readers]
+            for segment in done:
+                self._remove(segment)
+
+    def _run(self):
+        while True:
+            with self._wake:
+                while not (self._pending or self._closed):
+                    self._wake.wait()
+                if self._closed:
+                    return
+                self._pending = False
+            try:
+                self.compact()
+            except Exception:
+                logger.exception("Triple store compaction failed")
+
+    def wait(self):
+        """Blocks until pending compaction is done (compacting in the caller's thread)"""
+        self.compact()
+
+    def snapshot(self):
+        """The current segments; a later merge closes the ones it replaces"""
+        with self._lock:
+            return list(self.segments)
+
+    def by_subject(self, subject):
+        """Distinct triples with this subject across all segments, sorted"""
+        with self._reading() as segments:
+            return sorted({triple for segment in segments for triple in segment.by_subject(subject)})
+
+    def by_predicate(self, predicate):
+        """Distinct triples with this predicate across all segments, sorted"""
+        with self._reading() as segments:
+            return sorted({triple for segment in segments for triple in segment.by_predicate(predicate)})
+
+    def __contains__(self, triple):
+        return tuple(triple) in self.by_subject(triple[0])
+
+    def __iter__(self):
+        with self._reading() as segments:
+            yield from merge_triples(segments)
+
+    def stats(self):
+        segments = self.snapshot()
+        levels = {}
+        for segment in segments:
+            levels[segment.level] = levels.get(segment.level, 0) + 1
+        return {
+            "segments": len(segments),
+            "levels": {str(level): count for level, count in sorted(levels.items())},
+            "stored_triples": sum(segment.count for segment in segments),
+            "bytes": sum(segment.path.stat().st_size for segment in segments if segment.path.exists())
+        }
+
+    def close(self):
+        if self._closed:
+            return
+        with self._wake:
+            self._closed = True
+            self._wake.notify_all()
+        if self._worker is not None:
+            self._worker.join()
+        with self._lock:
+            for segment in self.segments:
+                segment.close()
+            self.segments = []
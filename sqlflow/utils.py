@@ -1,23 +1,39 @@
 
+import re
 import hashlib
 import logging
 from itertools import tee
+from importlib import resources
 
 import sqlparse
 from sqlparse.tokens import Punctuation
 from sqlparse.sql import Comment, TokenList
 
 
-logging.basicConfig(
-    level=logging.DEBUG, 
-    format="%(asctime)s [%(levelname)s] - %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S"
-)
 logger = logging.getLogger(__name__)
 
+AGGREGATE_FUNCTIONS = frozenset(["COUNT", "SUM", "AVG", "MIN", "MAX", "STDDEV", "VARIANCE", "ARRAY_AGG", "STRING_AGG"])
+
+# single-pass SQL lexer shared by fingerprinting and the fast path; far cheaper than sqlparse grouping
+TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<space>\s+)
+    |(?P<comment>--[^\n]*|/\*.*?\*/)
+    |(?P<string>(?:[EeNnBbXx])?'(?:[^']|'')*'|\$\$.*?\$\$)
+    |(?P<quoted>"(?:[^"]|"")*"|`[^`]*`|\[[^\]]*\])
+    |(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+    |(?P<word>[A-Za-z_][A-Za-z0-9_$]*)
+    |(?P<param>\?|%s|%\(\w+\)s|:\w+|\$\d+)
+    |(?P<operator><>|!=|<=|>=|::|\|\||.)
+    """,
+    re.DOTALL | re.VERBOSE
+)
+
 
 def log_parsing_step(log_step, node, level=0):
     verbose_options = [logging.WARN, logging.INFO, logging.DEBUG]
+    if not logger.isEnabledFor(verbose_options[level]):
+        return  # skip building the message (and resolving node.uri) when it would be dropped
     output = f"{log_step}: {node.type} -> {node.name} [UID: {node.uri}]"
     if verbose_options[level] == logging.WARN:
         logger.warning(output)
@@ -74,3 +90,8 @@ def clean_tokens(tokens):
             not (token.value == "AS")  # confuses sequential parsing; taken care of by sqlparse aliasing
         )
     ])
+
+
+def get_package_file(relative_path):
+    """Traversable handle to data shipped inside the package, e.g. `data/healthcare/schema.sql`"""
+    return resources.files("sqlflow").joinpath(relative_path)
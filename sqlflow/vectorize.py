@@ -0,0 +1,314 @@
+import json
+from pathlib import Path
+
+import numpy as np
+from sqlparse.sql import Function, Identifier
+from sqlparse.tokens import Keyword, Name
+
+from sqlflow import (
+    nodes as n,
+    parser as s,
+    utils as u
+)
+
+
+NESTING_TYPES = frozenset(["SQLSubquery", "SQLCTE"])
+# node classes counted in the leading columns; classes added to nodes.NODE_TYPES since are
+# counted in trailing columns instead, so the position of every existing column stays put
+LEADING_COUNT_TYPES = (
+    "SQLNode", "SQLKeyword", "SQLLiteral", "SQLOperator", "SQLColumn", "SQLTable",
+    "SQLFeature", "SQLRelationship", "SQLSegment", "SQLSubquery", "SQLCTE", "SQLQuery"
+)
+STRUCTURAL_FEATURES = [
+    "n_nodes",
+    "max_level",
+    "n_joins",
+    "max_nesting_depth",
+    "n_aggregates",
+    "n_windows",
+    "n_case",
+    "n_distinct_tables",
+    "n_distinct_columns"
+]
+
+
+def get_token_name(token):
+    """Real (unaliased, unqualified) name of an identifier token, lowercased"""
+    if isinstance(token, Identifier):
+        name = token.get_real_name()
+    elif token.ttype in Name:
+        name = token.value
+    else:
+        name = None
+    return name.strip('"`').lower() if name else None
+
+
+def count_token_features(token):
+    """Counts (aggregates, windows, CASE expressions) in a statement with one walk over its token groups"""
+    aggregates = windows = cases = 0
+    stack = [token]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, Function) and (current.get_name() or "").upper() in u.AGGREGATE_FUNCTIONS:
+            aggregates += 1
+        if current.is_group:
+            stack.extend(current.tokens)
+        elif current.ttype in Keyword:
+            if current.normalized == "OVER":
+                windows += 1
+            elif current.normalized == "CASE":
+                cases += 1
+    return aggregates, windows, cases
+
+
+class TreeVectorizer:
+    """
+    Converts batches of SQLTrees into a dense NumPy feature matrix.
+
+    Columns are ordered as: one count per node class in LEADING_COUNT_TYPES
+    (`count_<SQLType>`), the structural features in STRUCTURAL_FEATURES,
+    `n_buckets` hashed bag-of-words buckets each for table and column names,
+    then counts of node classes added later (e.g. `count_SQLLiteralList`).
+    Hashing uses sha256 so column meaning is stable across processes and
+    runs. `save` writes the column names next to the matrix; index saved
+    matrices by name with `load`.
+    """
+
+    def __init__(self, n_buckets=64, dtype=np.float32):
+        self.n_buckets = n_buckets
+        self.dtype = dtype
+        self.trailing_types = [node_type.__name__ for node_type in n.NODE_TYPES if node_type.__name__ not in LEADING_COUNT_TYPES]
+        self.structural_offset = len(LEADING_COUNT_TYPES)
+        self.table_offset = self.structural_offset + len(STRUCTURAL_FEATURES)
+        self.column_offset = self.table_offset + n_buckets
+        self.trailing_offset = self.column_offset + n_buckets
+        self.type_index = {name: i for i, name in enumerate(LEADING_COUNT_TYPES)}
+        self.type_index.update((name, self.trailing_offset + i) for i, name in enumerate(self.trailing_types))
+        self._bucket_cache = {}
+
+    @property
+    def feature_names(self):
+        return (
+            [f"count_{name}" for name in LEADING_COUNT_TYPES]
+            + list(STRUCTURAL_FEATURES)
+            + [f"table_hash_{i}" for i in range(self.n_buckets)]
+            + [f"column_hash_{i}" for i in range(self.n_buckets)]
+            + [f"count_{name}" for name in self.trailing_types]
+        )
+
+    @property
+    def n_features(self):
+        return self.trailing_offset + len(self.trailing_types)
+
+    def bucket(self, name):
+        if name not in self._bucket_cache:
+            self._bucket_cache[name] = u.get_short_hash(name) % self.n_buckets
+        return self._bucket_cache[name]
+
+    def transform(self, trees):
+        """Returns a (len(trees), n_features) matrix; accepts SQLTrees or root SQLNodes"""
+        trees = list(trees)
+        matrix = np.zeros((len(trees), self.n_features), dtype=self.dtype)
+        for row, tree in enumerate(trees):
+            self._fill_row(matrix[row], getattr(tree, "root", tree))
+        return matrix
+
+    def _fill_row(self, row, root):
+        structural = self.structural_offset
+        tables, columns = set(), set()
+        max_level = max_nesting = n_nodes = 0
+
+        stack = [(root, 0)]
+        while stack:
+            node, nesting = stack.pop()
+            n_nodes += 1
+            max_level = max(max_level, node.level)
+            max_nesting = max(max_nesting, nesting)
+            row[self.type_index.get(node.type, 0)] += 1
+
+            if node.type == "SQLTable":
+                name = get_token_name(node.token)
+                if name:
+                    tables.add(name)
+            elif node.type == "SQLColumn":
+                name = get_token_name(node.token)
+                if name:
+                    columns.add(name)
+
+            child_nesting = nesting + 1 if node.type in NESTING_TYPES else nesting
+            stack.extend((child, child_nesting) for child in node.children)
+
+        aggregates, windows, cases = count_token_features(root.token)
+        row[structural:structural + len(STRUCTURAL_FEATURES)] = [
+            n_nodes,
+            max_level,
+            row[self.type_index["SQLRelationship"]],
+            max_nesting,
+            aggregates,
+            windows,
+            cases,
+            len(tables),
+            len(columns)
+        ]
+        for name in tables:
+            row[self.table_offset + self.bucket(name)] += 1
+        for name in columns:
+            row[self.column_offset + self.bucket(name)] += 1
+
+    def save(self, matrix, path):
+        """Writes the matrix as `.npy` alongside a `.columns.json` file of feature names"""
+        path = str(path)
+        np.save(path, matrix)
+        base = path[:-4] if path.endswith(".npy") else path
+        with open(f"{base}.columns.json", "w") as f:
+            json.dump(self.feature_names, f)
+
+    @staticmethod
+    def load(path):
+        """(matrix, feature names) written by `save`"""
+        path = str(path)
+        base = path[:-4] if path.endswith(".npy") else path
+        with open(f"{base}.columns.json") as f:
+            names = json.load(f)
+        return np.load(f"{base}.npy"), names
+
+
+SEQUENCE_FIELDS = ["type_id", "depth", "name_id"]
+SEQUENCE_INDEX_FIELDS = ["query", "shard", "start", "length"]
+SEQUENCE_MANIFEST = "manifest.json"
+SEQUENCE_INDEX = "index.npy"
+VALUE_NODE_TYPES = frozenset(["SQLKeyword", "SQLOperator"])
+UNNAMED_NODE_TYPES = frozenset(["SQLLiteral", "SQLLiteralList", "SQLQuery", "SQLSegment"])
+
+
+class SequenceEncoder:
+    """
+    Turns an SQLTree into a (n_nodes, 3) int32 array, one row per node in
+    pre-order: node class id (index into NODE_TYPES), depth below the root,
+    and a hashed name id in [1, n_names] (0 when the node has no name, e.g.
+    literals). Keywords and operators hash their normalized text, everything
+    else its real identifier name.
+    """
+
+    def __init__(self, n_names=4096):
+        self.n_names = n_names
+        self.type_index = {node_type.__name__: i for i, node_type in enumerate(n.NODE_TYPES)}
+        self._name_cache = {}
+
+    def name_id(self, node):
+        if node.type in UNNAMED_NODE_TYPES:
+            return 0
+        name = node.token.normalized.upper() if node.type in VALUE_NODE_TYPES else get_token_name(node.token)
+        if not name:
+            return 0
+        name_id = self._name_cache.get(name)
+        if name_id is None:
+            name_id = self._name_cache[name] = u.get_short_hash(name) % self.n_names + 1
+        return name_id
+
+    def encode(self, tree):
+        rows, stack = [], [(getattr(tree, "root", tree), 0)]
+        while stack:
+            node, depth = stack.pop()
+            rows.append((self.type_index.get(node.type, 0), depth, self.name_id(node)))
+            stack.extend((child, depth + 1) for child in reversed(node.children))
+        return np.array(rows, dtype=np.int32).reshape(-1, len(SEQUENCE_FIELDS))
+
+
+class SequenceShardWriter:
+    """
+    Writes encoded sequences into `directory` as `shard_00000.npy`, ... of at
+    most `shard_size` rows each (a sequence never spans shards; one longer
+    than `shard_size` gets a shard of its own), plus `index.npy`, an int64
+    (n_sequences, 4) array of (query, shard, start row, length), and a
+    `manifest.json` describing the fields, node classes and shard files.
+    Use as a context manager or call `close()` to flush the last shard.
+    """
+
+    def __init__(self, directory, shard_size=1 << 20, encoder=None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.shard_size = shard_size
+        self.encoder = encoder or SequenceEncoder()
+        self.shards, self.index = [], []
+        self._pending, self._pending_rows = [], 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add(self, tree, query=None):
+        sequence = self.encoder.encode(tree)
+        if self._pending and self._pending_rows + len(sequence) > self.shard_size:
+            self._flush()
+        self.index.append((len(self.index) if query is None else query, len(self.shards), self._pending_rows, len(sequence)))
+        self._pending.append(sequence)
+        self._pending_rows += len(sequence)
+
+    def _flush(self):
+        name = f"shard_{len(self.shards):05d}.npy"
+        np.save(self.directory / name, np.concatenate(self._pending))
+        self.shards.append(name)
+        self._pending, self._pending_rows = [], 0
+
+    def close(self):
+        if self._pending:
+            self._flush()
+        np.save(self.directory / SEQUENCE_INDEX, np.array(self.index, dtype=np.int64).reshape(-1, len(SEQUENCE_INDEX_FIELDS)))
+        with open(self.directory / SEQUENCE_MANIFEST, "w") as f:
+            json.dump({
+                "fields": SEQUENCE_FIELDS,
+                "index_fields": SEQUENCE_INDEX_FIELDS,
+                "node_types": [node_type.__name__ for node_type in n.NODE_TYPES],
+                "n_names": self.encoder.n_names,
+                "shard_size": self.shard_size,
+                "shards": self.shards,
+                "n_sequences": len(self.index)
+            }, f, indent=2)
+
+
+def export_sequences(queries, directory, shard_size=1 << 20, n_names=4096, **parse_options):
+    """Parses `queries` and writes one sequence per statement (tagged with its query's position)"""
+    with SequenceShardWriter(directory, shard_size, SequenceEncoder(n_names)) as writer:
+        for query, sql in enumerate(queries):
+            for tree, _ in s.parse_sql(sql, **parse_options):
+                writer.add(tree, query)
+    return writer
+
+
+class SequenceShards:
+    """
+    Read side of SequenceShardWriter: shards are memory-mapped on first use,
+    so `shards[i]` is a zero-copy (length, 3) view and sampling a batch
+    touches only the pages of the sampled sequences.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        with open(self.directory / SEQUENCE_MANIFEST) as f:
+            self.manifest = json.load(f)
+        self.index = np.load(self.directory / SEQUENCE_INDEX, mmap_mode="r")
+        self._shards = {}
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, i):
+        _, shard, start, length = (int(value) for value in self.index[i])
+        return self.shard(shard)[start:start + length]
+
+    def shard(self, shard):
+        array = self._shards.get(shard)
+        if array is None:
+            array = self._shards[shard] = np.load(self.directory / self.manifest["shards"][shard], mmap_mode="r")
+        return array
+
+    def query(self, i):
+        return int(self.index[i][0])
+
+    def sample(self, k, seed=None):
+        """`k` random sequences (without replacement) as a list of views"""
+        rng = np.random.default_rng(seed)
+        return [self[i] for i in rng.choice(len(self), size=min(k, len(self)), replace=False)]
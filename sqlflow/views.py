@@ -0,0 +1,254 @@
+from collections import deque
+
+from sqlparse.sql import Comparison, Identifier
+
+from sqlflow.advisor import ColumnResolver
+from sqlflow.fingerprint import ShapeAggregator
+from sqlflow.schema import load_schema
+
+
+MAX_EDGES = 6
+EXAMPLES = 20
+CACHE_SIZE = 100000
+
+
+def join_edge(left, right):
+    """Canonical undirected edge ((table, column), (table, column)), or None for self joins"""
+    if left[0] == right[0]:
+        return None
+    return (left, right) if left <= right else (right, left)
+
+
+def join_graph(tree, resolver):
+    """
+    (edges, columns) of one statement: the equi-join conditions between
+    schema tables as canonical edges, and every (table, column) the
+    statement references. Joins on CTEs or derived tables are left out.
+    """
+    aliases = resolver.scope(tree.root)
+    edges, columns = set(), set()
+
+    def resolve(token):
+        return resolver.resolve(token, aliases) if isinstance(token, Identifier) else None
+
+    def add_edge(left, right):
+        left, right = resolve(left), resolve(right)
+        edge = join_edge(left, right) if left and right else None
+        if edge:
+            edges.add(edge)
+
+    stack = [tree.root]
+    while stack:
+        node = stack.pop()
+        in_on = False
+        children = node.children
+        for position, child in enumerate(children):
+            if child.type == "SQLKeyword":
+                keyword = child.token.normalized.upper()
+                in_on = keyword == "ON" or (in_on and keyword == "AND")
+            elif child.type == "SQLRelationship" and isinstance(child.token, Comparison):
+                add_edge(child.token.left, child.token.right)
+            elif in_on and position + 2 < len(children) and children[position + 1].token.value == "=":
+                # `ON a.x = b.x AND c.y = b.y`: the second condition is left as loose columns
+                add_edge(child.token, children[position + 2].token)
+            column = resolve(child.token)
+            if column:
+                columns.add(column)
+            stack.append(child)
+    return frozenset(edges), columns
+
+
+def edge_tables(edges):
+    return {table for edge in edges for table, _ in edge}
+
+
+class JoinPattern:
+    """A connected set of join edges, the queries containing all of them, and their weighted count"""
+
+    __slots__ = ["edges", "support", "graphs"]
+
+    def __init__(self, edges, support, graphs):
+        self.edges = edges
+        self.support = support
+        self.graphs = graphs
+
+    @property
+    def tables(self):
+        return sorted(edge_tables(self.edges))
+
+    def __repr__(self):
+        return f"JoinPattern({'-'.join(self.tables)}, edges={len(self.edges)}, support={self.support})"
+
+
+class ViewCandidate:
+    """A proposed materialized view: its SQL, the join pattern it covers, and the queries that would read it"""
+
+    __slots__ = ["name", "sql", "tables", "joins", "support", "score", "n_queries", "queries"]
+
+    def __init__(self, name, sql, tables, joins, support, score, n_queries, queries):
+        self.name = name
+        self.sql = sql
+        self.tables = tables
+        self.joins = joins
+        self.support = support
+        self.score = score
+        self.n_queries = n_queries
+        self.queries = queries
+
+    def to_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __repr__(self):
+        return f"ViewCandidate({self.name}, support={self.support}, score={self.score})"
+
+
+def view_sql(name, edges, columns):
+    """CREATE MATERIALIZED VIEW joining the pattern's tables in BFS order over its edges"""
+    adjacency = {}
+    for edge in sorted(edges):
+        (a, _), (b, _) = edge
+        adjacency.setdefault(a, []).append(edge)
+        adjacency.setdefault(b, []).append(edge)
+    start = min(adjacency)
+    order, joins, seen, queue = [start], {}, {start}, deque([start])
+    while queue:
+        table = queue.popleft()
+        for edge in adjacency[table]:
+            other = edge[1][0] if edge[0][0] == table else edge[0][0]
+            if other not in seen:
+                seen.add(other)
+                order.append(other)
+                queue.append(other)
+            # each edge is attached to whichever of its two tables joins last
+            joins.setdefault(max(edge[0][0], edge[1][0], key=order.index), []).append(edge)
+
+    select = ",\n    ".join(f"{table}.{column} AS {table}__{column}" for table, column in sorted(columns)) or "*"
+    lines = [f"CREATE MATERIALIZED VIEW {name} AS", f"SELECT\n    {select}", f"FROM {order[0]}"]
+    for table in order[1:]:
+        conditions = " AND ".join(f"{a}.{x} = {b}.{y}" for (a, x), (b, y) in sorted(set(joins[table])))
+        lines.append(f"JOIN {table} ON {conditions}")
+    return "\n".join(lines) + ";"
+
+
+class JoinGraphMiner(ShapeAggregator):
+    """
+    Collects per-query join graphs and mines frequent connected join subgraphs.
+
+    Queries with the same join graph are merged into one weighted entry, so
+    mining works on distinct graphs (usually orders of magnitude fewer than
+    queries), and repeated query shapes are parsed once. Mining grows
+    patterns one adjacent edge at a time (Apriori): a pattern is only
+    extended while its support, the weighted number of queries containing
+    it, stays at or above `min_support`, and the graphs containing a
+    pattern are the intersection of its parent's graphs with the new edge's.
+    """
+
+    def __init__(self, tables=None, examples=EXAMPLES, cache_size=CACHE_SIZE):
+        super().__init__(cache_size)
+        self.tables = tables or load_schema()
+        self.resolver = ColumnResolver(self.tables)
+        self.examples = examples
+        self.graphs = {}  # edges -> [weight, query count, columns, example query ids]
+
+    def summarize(self, trees):
+        edges, columns = set(), set()
+        for tree in trees:
+            statement_edges, statement_columns = join_graph(tree, self.resolver)
+            edges |= statement_edges
+            columns |= statement_columns
+        return frozenset(edges), frozenset(columns)
+
+    def fold(self, graph, weight, query):
+        edges, columns = graph
+        if not edges:
+            return
+        entry = self.graphs.setdefault(edges, [0, 0, set(), []])
+        entry[0] += weight
+        entry[1] += 1
+        entry[2] |= columns
+        if len(entry[3]) < self.examples:
+            entry[3].append(query)
+
+    def mine(self, min_support=2, max_edges=MAX_EDGES):
+        """Every frequent connected join pattern with 1 to `max_edges` edges, most supported first"""
+        graphs = list(self.graphs)
+        weights = [self.graphs[edges][0] for edges in graphs]
+
+        occurrences = {}
+        for index, edges in enumerate(graphs):
+            for edge in edges:
+                occurrences.setdefault(edge, set()).add(index)
+        frequent = {
+            edge: indexes for edge, indexes in occurrences.items()
+            if sum(weights[i] for i in indexes) >= min_support
+        }
+        by_table = {}
+        for edge in frequent:
+            for table, _ in edge:
+                by_table.setdefault(table, set()).add(edge)
+
+        level = [JoinPattern(frozenset([edge]), sum(weights[i] for i in indexes), indexes) for edge, indexes in frequent.items()]
+        patterns, seen = list(level), {pattern.edges for pattern in level}
+        for _ in range(max_edges - 1):
+            next_level = []
+            for pattern in level:
+                adjacent = set().union(*(by_table[table] for table in edge_tables(pattern.edges))) - pattern.edges
+                for edge in adjacent:
+                    edges = pattern.edges | {edge}
+                    if edges in seen:
+                        continue
+                    seen.add(edges)
+                    indexes = pattern.graphs & frequent[edge]
+                    support = sum(weights[i] for i in indexes)
+                    if support >= min_support:
+                        next_level.append(JoinPattern(edges, support, indexes))
+            if not next_level:
+                break
+            patterns.extend(next_level)
+            level = next_level
+        return sorted(patterns, key=lambda p: (-p.support, -len(p.edges), sorted(p.edges)))
+
+    def closed(self, patterns):
+        """Patterns with no frequent superset of equal support: the largest join each group of queries shares"""
+        by_support = {}
+        for pattern in patterns:
+            by_support.setdefault(pattern.support, []).append(pattern)
+        return [
+            pattern for pattern in patterns
+            if not any(pattern.edges < other.edges for other in by_support[pattern.support])
+        ]
+
+    def candidates(self, min_support=2, min_tables=2, max_edges=MAX_EDGES, top=None):
+        """
+        Materialized view proposals from closed frequent patterns joining at
+        least `min_tables` tables, scored by support times joins saved. Each
+        view selects the columns its benefiting queries read from its tables.
+        """
+        graphs = list(self.graphs)
+        proposals = []
+        for pattern in self.closed(self.mine(min_support, max_edges)):
+            tables = pattern.tables
+            if len(tables) < min_tables:
+                continue
+            columns, queries, n_queries = set(), [], 0
+            for index in sorted(pattern.graphs):
+                _, count, graph_columns, examples = self.graphs[graphs[index]]
+                columns |= {column for column in graph_columns if column[0] in tables}
+                queries.extend(examples)
+                n_queries += count
+            name = "mv_" + "_".join(tables)
+            joins = [f"{a}.{x} = {b}.{y}" for (a, x), (b, y) in sorted(pattern.edges)]
+            proposals.append(ViewCandidate(
+                name, view_sql(name, pattern.edges, columns), tables, joins, pattern.support,
+                pattern.support * len(pattern.edges), n_queries, sorted(queries)[:self.examples]
+            ))
+        proposals.sort(key=lambda c: (-c.score, c.name))
+        return proposals[:top]
+
+    def to_dict(self, min_support=2, min_tables=2, max_edges=MAX_EDGES, top=None):
+        return {
+            "queries": self.queries,
+            "errors": self.errors,
+            "distinct_join_graphs": len(self.graphs),
+            "candidates": [c.to_dict() for c in self.candidates(min_support, min_tables, max_edges, top)]
+        }
@@ -0,0 +1,57 @@
+import pytest
+from sqlflow.advisor import ColumnResolver, IndexAdvisor, column_uses
+from sqlflow.parser import parse_sql
+from sqlflow.schema import load_schema
+
+
+SQL = """
+SELECT p.patient_id, v.visit_date
+FROM patients p
+JOIN visits v ON v.patient_id = p.patient_id
+WHERE v.visit_date BETWEEN '2020-01-01' AND '2020-12-31' AND p.gender IN ('F', 'M')
+"""
+
+
+@pytest.fixture
+def setup_advisor():
+    advisor = IndexAdvisor(support_size=2)
+    advisor.add(SQL, weight=5)
+    advisor.add(SQL.replace("2020", "2021"), weight=1)
+    advisor.add("SELECT visit_id FROM visits WHERE provider_id = 7", weight=2)
+    return advisor
+
+
+def test_column_uses_resolve_aliases_and_kinds():
+    resolver = ColumnResolver(load_schema())
+    [(tree, _)] = parse_sql(SQL)
+    assert column_uses(tree, resolver) == {
+        ("patients", "patient_id", "join"),
+        ("visits", "patient_id", "join"),
+        ("visits", "visit_date", "range"),
+        ("patients", "gender", "equality"),
+    }
+
+
+def test_unknown_and_ambiguous_columns_are_skipped():
+    resolver = ColumnResolver(load_schema())
+    [(tree, _)] = parse_sql("SELECT * FROM patients p JOIN visits v ON v.patient_id = p.patient_id WHERE patient_id = 1 AND x.y = 2")
+    assert {(table, column) for table, column, _ in column_uses(tree, resolver)} == {("patients", "patient_id"), ("visits", "patient_id")}
+
+
+def test_weights_and_shape_cache(setup_advisor):
+    assert setup_advisor.queries == 3
+    assert setup_advisor.total_weight == 8
+    assert len(setup_advisor._shapes) == 2  # the 2021 query reuses the 2020 query's shape
+    assert setup_advisor.column_weights("visits")["visit_date"] == {"join": 0, "equality": 0, "range": 6}
+    assert setup_advisor.supporting_queries("visits", "patient_id") == [0, 1]
+
+
+def test_recommendations(setup_advisor):
+    recommendations = [(r.table, r.kind, r.columns, r.share) for r in setup_advisor.recommend()]
+    assert ("visits", "index", ["patient_id"], 6 / 8) in recommendations
+    assert ("visits", "index", ["provider_id"], 2 / 8) in recommendations
+    assert ("visits", "cluster", ["visit_date"], 6 / 8) in recommendations
+    assert ("patients", "index", ["gender"], 6 / 8) in recommendations
+    assert not any(table == "patients" and columns == ["patient_id"] and kind == "index" for table, kind, columns, _ in recommendations)
+
+    assert all(r.share >= 0.5 for r in setup_advisor.recommend(min_share=0.5))
@@ -0,0 +1,48 @@
+import pytest
+from sqlflow.antipatterns import Linter, LintReport, lint_corpus
+
+
+SQL = """WITH recent AS (SELECT * FROM visits)
+SELECT p.patient_id,
+       (SELECT AVG(l.result_value) FROM labs l WHERE l.patient_id = p.patient_id) AS avg_lab,
+       (SELECT COUNT(*) FROM labs) AS total_labs
+FROM patients p
+JOIN recent r ON r.patient_id = p.patient_id
+WHERE YEAR(p.date_of_birth) = 1990 AND p.created_at > DATE_SUB(CURDATE(), INTERVAL 1 YEAR)
+"""
+
+
+@pytest.fixture
+def setup_findings():
+    return {finding.rule: finding for finding in Linter().lint_sql(SQL, query=7)}
+
+
+def test_rules_flag_expected_nodes(setup_findings):
+    assert set(setup_findings) == {"correlated-scalar-subquery", "select-star-in-subquery", "function-on-filter-column"}
+    assert "on p" in setup_findings["correlated-scalar-subquery"].message
+    assert setup_findings["correlated-scalar-subquery"].line == 3
+    assert "a CTE" in setup_findings["select-star-in-subquery"].message
+    assert "p.date_of_birth" in setup_findings["function-on-filter-column"].message
+    assert setup_findings["function-on-filter-column"].query == 7
+
+
+def test_or_chain_and_clean_queries():
+    linter = Linter()
+    findings = linter.lint_sql("SELECT a FROM t WHERE a = 1 OR b = 2 OR (c = 3 OR d = 4)")
+    assert [finding.rule for finding in findings] == ["or-chain"]
+    assert linter.lint_sql("SELECT a FROM t WHERE a = 1 OR b = 2; SELECT COUNT(*) FROM t HAVING COUNT(*) > 1") == []
+
+
+def test_report_ranks_by_severity():
+    queries = ["SELECT a FROM (SELECT * FROM t) x", SQL, "SELECT 1"]
+    report = lint_corpus(queries, processes=0)
+    assert report.findings[0].severity == "high"
+    assert [query for query, _, _ in report.ranked_queries()] == [1, 0]
+    assert report.to_dict(top=1)["by_rule"]["select-star-in-subquery"] == 2
+    assert isinstance(report, LintReport) and not report.errors
+
+
+def test_parallel_matches_sequential():
+    queries = [SQL, "SELECT a FROM (SELECT * FROM t) x"] * 3
+    sequential = lint_corpus(queries, processes=0).to_dict()
+    assert lint_corpus(queries, processes=2, chunk_size=2).to_dict() == sequential
@@ -0,0 +1,53 @@
+import pytest
+from sqlflow.compressed import CompressedStore, build_store, train_dictionary
+
+
+STATEMENTS = [
+    f"SELECT p.patient_id, v.visit_date FROM patients p JOIN visits v ON v.patient_id = p.patient_id WHERE v.cost > {i}"
+    for i in range(50)
+] + ["SELECT 'ünïcode' AS name", ""]
+
+
+@pytest.fixture
+def setup_store(tmp_path):
+    path = tmp_path / "corpus.sqlz"
+    build_store(STATEMENTS, path, sample_size=10)
+    with CompressedStore(path) as store:
+        yield store
+
+
+def test_dictionary_holds_repeated_fragments():
+    dictionary = train_dictionary(STATEMENTS[:10], size=256)
+    assert 0 < len(dictionary) <= 256
+    assert b"JOIN visits v ON v.patient_id = p.patient_id" in dictionary
+
+
+def test_random_access_round_trip(setup_store):
+    assert len(setup_store) == len(STATEMENTS)
+    assert list(setup_store) == STATEMENTS
+    assert setup_store[17] == STATEMENTS[17]
+    assert setup_store[-2] == "SELECT 'ünïcode' AS name"
+    with pytest.raises(IndexError):
+        setup_store[len(STATEMENTS)]
+
+
+def test_parse_and_stats(setup_store):
+    [(tree, _)] = setup_store.parse(3)
+    assert tree.root.type == "SQLQuery"
+    stats = setup_store.stats()
+    assert stats["raw_bytes"] == sum(len(s.encode("utf-8")) for s in STATEMENTS)
+    assert stats["ratio"] > 5
+
+
+def test_dictionary_beats_plain_deflate(tmp_path):
+    build_store(STATEMENTS, tmp_path / "plain.sqlz", dictionary=b"")
+    build_store(STATEMENTS, tmp_path / "trained.sqlz")
+    with CompressedStore(tmp_path / "plain.sqlz") as plain, CompressedStore(tmp_path / "trained.sqlz") as trained:
+        assert list(plain) == list(trained)
+        assert trained.stats()["compressed_bytes"] < plain.stats()["compressed_bytes"] / 2
+
+
+def test_rejects_other_files(tmp_path):
+    (tmp_path / "not.sqlz").write_bytes(b"SELECT 1" * 4)
+    with pytest.raises(ValueError):
+        CompressedStore(tmp_path / "not.sqlz")
@@ -0,0 +1,93 @@
+import os
+
+import pytest
+import sqlparse
+from sqlflow.corpus import (
+    INDEX_NAME,
+    StatementIndex,
+    StatementStore,
+    open_corpus,
+    packaged_corpus,
+    scan_statements
+)
+
+
+@pytest.fixture
+def setup_corpus(tmp_path):
+    (tmp_path / "a.sql").write_text("SELECT ';' FROM t; -- not; a boundary\nSELECT 2;\n\n/* trailing; */\n")
+    (tmp_path / "b.sql").write_text("  SELECT \"x;y\" FROM u;\nSELECT 4")
+    return tmp_path
+
+
+def statements_of(data):
+    return [data[start:end] for start, end in scan_statements(data)]
+
+
+def test_scan_statements_skips_strings_and_comments():
+    data = b"SELECT ';' FROM t; -- not; a boundary\nSELECT 2;\n\n/* trailing; */\n"
+    assert statements_of(data) == [b"SELECT ';' FROM t;", b"-- not; a boundary\nSELECT 2;"]
+    assert statements_of(b"SELECT 1;\nSELECT 2  \n") == [b"SELECT 1;", b"SELECT 2"]
+    assert statements_of(b"  \n") == []
+
+
+def test_index_round_trip_and_random_access(setup_corpus):
+    path = StatementIndex.build(setup_corpus).save()
+    index = StatementIndex.load(path)
+
+    with StatementStore(index) as store:
+        assert len(store) == 4
+        assert store.get("b.sql", 0) == 'SELECT "x;y" FROM u;'
+        assert store[3] == "SELECT 4"
+        assert index.locate(2) == ("b.sql", 0)
+        assert index.global_id("b.sql", 1) == 3
+        with pytest.raises(IndexError):
+            store.get("a.sql", 2)
+
+
+def test_verify_detects_changed_statement(setup_corpus):
+    store = open_corpus(setup_corpus)
+    (setup_corpus / "b.sql").write_text("  SELECT \"x;z\" FROM u;\nSELECT 4")
+    store.close()
+
+    with pytest.raises(ValueError):
+        store.get("b.sql", 0, verify=True)
+    store.close()
+
+
+def test_open_corpus_rebuilds_stale_sidecar(setup_corpus):
+    open_corpus(setup_corpus).close()
+    assert (setup_corpus / INDEX_NAME).is_file()
+
+    (setup_corpus / "b.sql").write_text("SELECT 3; SELECT 4; SELECT 5;")
+    with open_corpus(setup_corpus) as store:
+        assert len(store) == 5
+        assert store.get("b.sql", 2) == "SELECT 5;"
+
+    # same size, new content: only the modification time gives it away
+    stat = (setup_corpus / "b.sql").stat()
+    (setup_corpus / "b.sql").write_text("SELECT 6; SELECT 7; SELECT 8;")
+    os.utime(setup_corpus / "b.sql", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert not StatementIndex.load(setup_corpus / INDEX_NAME).is_fresh()
+    with open_corpus(setup_corpus) as store:
+        assert store.get("b.sql", 2) == "SELECT 8;"
+
+
+def test_verify_ignores_mtime_and_checks_content(setup_corpus):
+    open_corpus(setup_corpus).close()
+    os.utime(setup_corpus / "a.sql", ns=(0, 0))  # as after unpacking an installed package
+    index = StatementIndex.load(setup_corpus / INDEX_NAME)
+    assert not index.is_fresh() and index.is_fresh(verify=True)
+
+    stat = (setup_corpus / "b.sql").stat()
+    (setup_corpus / "b.sql").write_text((setup_corpus / "b.sql").read_text().replace("4", "5"))
+    os.utime(setup_corpus / "b.sql", ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert not index.is_fresh(verify=True)
+
+
+def test_packaged_corpus_matches_sqlparse_split(caplog):
+    with packaged_corpus() as store:
+        assert "stale" not in caplog.text  # the shipped sidecar is used as is
+        path, _ = store.index.locate(0)
+        text = (store.index.root / path).read_text()
+        expected = [q for q in sqlparse.split(text) if q.strip()]
+        assert [store.get(path, i, verify=True) for i in range(len(expected))] == expected
@@ -0,0 +1,118 @@
+import json
+
+import pytest
+from sqlflow.dbt import STATE_NAME, ingest_project, load_models
+
+
+MODELS = {
+    "stg_patients": "SELECT patient_id, gender FROM \"warehouse\".\"raw\".\"patients\"",
+    "stg_visits": "SELECT visit_id, patient_id, visit_date FROM \"warehouse\".\"raw\".\"visits\"",
+    "patient_visits": (
+        "SELECT p.patient_id, COUNT(v.visit_id) AS visits\n"
+        "FROM \"warehouse\".\"analytics\".\"stg_patients\" p\n"
+        "JOIN \"warehouse\".\"analytics\".\"stg_visits\" v ON v.patient_id = p.patient_id\n"
+        "GROUP BY p.patient_id"
+    ),
+}
+DEPENDS_ON = {
+    "stg_patients": ["source.clinic.raw.patients"],
+    "stg_visits": ["source.clinic.raw.visits"],
+    "patient_visits": ["model.clinic.stg_patients"],  # stg_visits is only found by parsing
+}
+
+
+def write_project(root, models, depends_on=DEPENDS_ON, relations=None):
+    nodes = {}
+    for name, sql in models.items():
+        path = f"models/{name}.sql"
+        compiled = root / "target" / "compiled" / "clinic" / path
+        compiled.parent.mkdir(parents=True, exist_ok=True)
+        compiled.write_text(sql)
+        nodes[f"model.clinic.{name}"] = {
+            "resource_type": "model", "name": name, "package_name": "clinic",
+            "original_file_path": path, "depends_on": {"nodes": depends_on[name]}
+        }
+        if relations:
+            schema, alias = relations[name]
+            nodes[f"model.clinic.{name}"].update(database="warehouse", schema=schema, alias=alias)
+    nodes["test.clinic.not_null"] = {"resource_type": "test", "name": "not_null"}
+    (root / "target" / "manifest.json").write_text(json.dumps({"nodes": nodes}))
+
+
+@pytest.fixture
+def setup_project(tmp_path):
+    write_project(tmp_path, MODELS)
+    return tmp_path
+
+
+def test_load_models(setup_project):
+    models = load_models(setup_project)
+    assert sorted(models) == ["model.clinic.patient_visits", "model.clinic.stg_patients", "model.clinic.stg_visits"]
+    assert models["model.clinic.stg_visits"].compiled_sql() == MODELS["stg_visits"]
+
+
+def test_lineage(setup_project):
+    ingest = ingest_project(setup_project)
+    assert ingest.lineage() == {
+        "model.clinic.patient_visits": ["model.clinic.stg_patients", "model.clinic.stg_visits"],
+        "model.clinic.stg_patients": [],
+        "model.clinic.stg_visits": [],
+    }
+    assert ingest.sources()["model.clinic.stg_visits"] == ["source.clinic.raw.visits"]
+    assert ingest.results["model.clinic.stg_visits"]["tables"] == ["visits"]
+    assert ingest.errors() == {}
+
+
+def test_lineage_with_shared_alias(tmp_path):
+    models = {
+        "stg_patients": "SELECT patient_id FROM raw.patients",
+        "dim_patients": "SELECT patient_id FROM \"warehouse\".\"staging\".\"patients\"",
+        "patient_report": "SELECT p.patient_id FROM warehouse.marts.patients p",
+        "ambiguous": "SELECT patient_id FROM patients",
+        "partly_qualified": "SELECT patient_id FROM Staging.Patients",
+    }
+    relations = {
+        "stg_patients": ("staging", "patients"),
+        "dim_patients": ("marts", "patients"),
+        "patient_report": ("marts", "patient_report"),
+        "ambiguous": ("marts", "ambiguous"),
+        "partly_qualified": ("marts", "partly_qualified"),
+    }
+    write_project(tmp_path, models, dict.fromkeys(models, []), relations)
+    ingest = ingest_project(tmp_path)
+    assert ingest.relations["warehouse.staging.patients"] == "model.clinic.stg_patients"
+    assert ingest.lineage() == {
+        "model.clinic.stg_patients": [],
+        "model.clinic.dim_patients": ["model.clinic.stg_patients"],
+        "model.clinic.patient_report": ["model.clinic.dim_patients"],
+        "model.clinic.ambiguous": [],
+        "model.clinic.partly_qualified": ["model.clinic.stg_patients"],
+    }
+
+
+def test_incremental_reparse(setup_project):
+    first = ingest_project(setup_project)
+    assert (first.stats["parsed"], first.stats["reused"]) == (3, 0)
+    assert (setup_project / "target" / STATE_NAME).is_file()
+
+    second = ingest_project(setup_project)
+    assert (second.stats["parsed"], second.stats["reused"]) == (0, 3)
+    assert second.results == json.loads(json.dumps(first.results))
+
+    changed = dict(MODELS, stg_visits=MODELS["stg_visits"] + " WHERE visit_date > '2020-01-01'")
+    del changed["stg_patients"]
+    write_project(setup_project, changed)
+    third = ingest_project(setup_project)
+    assert (third.stats["parsed"], third.stats["reused"], third.stats["removed"]) == (1, 1, 1)
+    assert "visit_date" in third.results["model.clinic.stg_visits"]["columns"]
+
+    assert ingest_project(setup_project, full_refresh=True).stats["parsed"] == 2
+
+
+def test_uncompiled_and_stale_state(setup_project):
+    (setup_project / "target" / "compiled" / "clinic" / "models" / "stg_visits.sql").unlink()
+    (setup_project / "target" / STATE_NAME).write_text(json.dumps({"version": 0, "models": {}}))
+    ingest = ingest_project(setup_project)
+    assert ingest.stats["uncompiled"] == 1
+    assert ingest.stats["parsed"] == 2
+    assert list(ingest.errors()) == ["model.clinic.stg_visits"]
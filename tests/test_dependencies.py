@@ -0,0 +1,53 @@
+import pytest
+from sqlflow.dependencies import CTECycleError, CTEGraph, cte_graphs
+
+
+SQL = """
+-- chained CTEs
+WITH a AS (SELECT * FROM visits),
+b AS (SELECT * FROM a WHERE a.id IN (SELECT id FROM patients)),
+c AS (SELECT * FROM labs),
+d AS (SELECT * FROM b JOIN c ON b.id = c.id)
+SELECT * FROM d JOIN a ON d.id = a.id;
+SELECT 1 FROM t
+"""
+
+
+@pytest.fixture
+def setup_graph():
+    return cte_graphs(SQL)[0]
+
+
+def test_reads_and_tables(setup_graph):
+    assert list(setup_graph.ctes) == ["a", "b", "c", "d"]
+    assert setup_graph.reads == {"a": set(), "b": {"a"}, "c": set(), "d": {"b", "c"}}
+    assert setup_graph.tables["b"] == {"patients"}
+    assert setup_graph.main_reads == {"a", "d"}
+    assert not cte_graphs(SQL)[1].ctes
+
+
+def test_stages_and_critical_path(setup_graph):
+    assert setup_graph.stages() == [["a", "c"], ["b"], ["d"]]
+    assert setup_graph.critical_path() == (["a", "b", "d"], 3)
+    assert setup_graph.critical_path({"c": 5}) == (["c", "d"], 6)
+
+
+def test_cycles_are_detected():
+    graph = cte_graphs("WITH x AS (SELECT * FROM y), y AS (SELECT * FROM x), z AS (SELECT * FROM z) SELECT 1")[0]
+    assert graph.cycles() == [["x", "y"], ["z"]]
+    with pytest.raises(CTECycleError) as error:
+        graph.stages()
+    assert error.value.cycles == [["x", "y"], ["z"]]
+    assert "stages" not in graph.to_dict()
+
+
+def test_recursive_self_reference_is_not_a_cycle():
+    graph = cte_graphs("WITH RECURSIVE r AS (SELECT 1 AS n UNION ALL SELECT n + 1 FROM r WHERE n < 5) SELECT * FROM r")[0]
+    assert graph.recursive and graph.self_references == {"r"}
+    assert graph.cycles() == []
+    assert graph.stages() == [["r"]]
+
+
+def test_graph_from_definitions():
+    graph = CTEGraph([("one", "SELECT * FROM t"), ("two", "SELECT * FROM one")], "SELECT * FROM two")
+    assert graph.to_dict()["stages"] == [["one"], ["two"]]
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from sqlflow.embeddings import NodeEmbeddings, QueryEmbedder, cosine_scores, export_edgelist, top_k
+from sqlflow.parser import parse_sql
+
+
+VISITS = "SELECT v.patient_id FROM visits v WHERE v.visit_date > '2024-01-01'"
+VISITS_AGAIN = "SELECT v.patient_id FROM visits v WHERE v.visit_date > '2023-06-30'"
+LABS = "SELECT l.result_value FROM lab_results l"
+
+
+def tree(sql):
+    return parse_sql(sql)[0][0]
+
+
+def resolved_uris(*queries):
+    uris = set()
+    for sql in queries:
+        stack = [tree(sql).root]
+        while stack:
+            node = stack.pop()
+            stack.extend(node.children)
+            if node.type in ("SQLTable", "SQLColumn"):
+                uris.add(node.uri)
+    return sorted(uris)
+
+
+@pytest.fixture
+def setup_embeddings():
+    keys = resolved_uris(VISITS, LABS)
+    return NodeEmbeddings(keys, np.random.default_rng(0).standard_normal((len(keys), 16)))
+
+
+def test_query_vectors_come_from_trained_nodes(setup_embeddings):
+    embedder = QueryEmbedder(setup_embeddings, weights={"SQLTable": 1.0})
+    [table] = [key for key in setup_embeddings.keys if key.startswith("sqltable") and "visits" in key]
+    expected = setup_embeddings[table] / np.linalg.norm(setup_embeddings[table])
+    assert np.allclose(embedder.embed(tree(VISITS)), expected)
+    assert embedder.coverage(tree(VISITS)) == 1.0
+
+    embedder = QueryEmbedder(setup_embeddings)
+    new, same, other = embedder.embed_many([tree(VISITS_AGAIN), tree(VISITS), tree(LABS)])
+    assert np.isclose(np.linalg.norm(new), 1.0)
+    assert new @ same > new @ other
+
+
+def test_unseen_nodes_use_stable_hash_vectors(setup_embeddings):
+    embedder = QueryEmbedder(setup_embeddings)
+    unseen = "SELECT d.code FROM diagnoses d"
+    assert embedder.coverage(tree(unseen)) == 0.0
+    first, second = embedder.embed(tree(unseen)), QueryEmbedder(setup_embeddings).embed(tree(unseen))
+    assert np.allclose(first, second) and np.isclose(np.linalg.norm(first), 1.0)
+    assert not np.allclose(first, embedder.embed(tree("SELECT p.code FROM procedures p")))
+    assert not QueryEmbedder(setup_embeddings, weights={"SQLTable": 1.0}).embed(tree("SELECT 1")).any()
+
+
+def test_batch_scoring_and_top_k():
+    corpus = np.random.default_rng(1).standard_normal((500, 8)).astype(np.float32)
+    queries = corpus[[7, 42]] * 3
+    scores = cosine_scores(queries, np.vstack([corpus, np.zeros((1, 8), dtype=np.float32)]))
+    assert scores.shape == (2, 501) and scores[0, 500] == 0
+    indices, best = top_k(scores, 3)
+    assert indices[:, 0].tolist() == [7, 42]
+    assert np.allclose(best[:, 0], 1.0) and (np.diff(best, axis=1) <= 0).all()
+
+
+def test_embeddings_round_trip_and_edgelist(setup_embeddings, tmp_path):
+    setup_embeddings.save(tmp_path / "nodes.npz")
+    loaded = NodeEmbeddings.load(tmp_path / "nodes.npz")
+    assert loaded.keys == setup_embeddings.keys and np.array_equal(loaded.vectors, setup_embeddings.vectors)
+
+    with open(tmp_path / "nodes.emb", "w") as f:
+        f.write(f"{len(loaded)} {loaded.dim}\n")
+        for key, vector in zip(loaded.keys, loaded.vectors):
+            f.write(key + " " + " ".join(repr(float(value)) for value in vector) + "\n")
+    text = NodeEmbeddings.load(tmp_path / "nodes.emb")
+    assert text.keys == loaded.keys and np.allclose(text.vectors, loaded.vectors)
+
+    _, context = parse_sql(VISITS)[0]
+    export_edgelist(context.triples, tmp_path / "edges.tsv")
+    lines = (tmp_path / "edges.tsv").read_text().splitlines()
+    assert len(lines) == len(context.triples) and all(line.count("\t") == 1 for line in lines)
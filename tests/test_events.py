@@ -0,0 +1,89 @@
+import gc
+
+import pytest
+from sqlflow import nodes as n
+from sqlflow.context import ParsingContext
+from sqlflow.events import parse_events
+from sqlflow.parser import parse_sql
+
+
+SQL = """
+SELECT v.patient_id, COUNT(*) AS n
+FROM visits v
+JOIN (SELECT patient_id FROM patients WHERE age > 30) p ON v.patient_id = p.patient_id
+WHERE v.status = 'open'
+GROUP BY v.patient_id;
+SELECT a FROM t
+"""
+
+
+@pytest.fixture
+def setup_events():
+    events = []
+    parse_events(
+        SQL,
+        on_enter=lambda e: events.append(("enter", e)),
+        on_exit=lambda e: events.append(("exit", e)),
+        on_node=lambda e: events.append(("node", e))
+    )
+    return events
+
+
+def preorder(node):
+    yield node
+    for child in node.children:
+        yield from preorder(child)
+
+
+def test_nodes_match_tree_in_pre_order(setup_events):
+    expected = [(node.type, node.name, node.level) for tree, _ in parse_sql(SQL) for node in preorder(tree.root)]
+    reported = [
+        (event.type, event.name, event.level)
+        for kind, event in setup_events
+        if kind == "node" or (kind == "enter" and event.type == "SQLQuery")
+    ]
+    assert reported == expected
+
+
+def test_enter_and_exit_are_balanced(setup_events):
+    depth = 0
+    for kind, event in setup_events:
+        depth += {"enter": 1, "exit": -1}.get(kind, 0)
+        assert depth >= 0
+    assert depth == 0
+
+    statements = [event.statement for kind, event in setup_events if kind == "enter" and event.type == "SQLQuery"]
+    assert statements == [0, 1]
+
+    subquery = next(i for i, (kind, event) in enumerate(setup_events) if kind == "node" and event.type == "SQLSubquery")
+    assert setup_events[subquery + 1][0] == "enter"
+    assert setup_events[subquery + 1][1].type == "SQLSubquery"
+
+
+def count_nodes():
+    gc.collect()
+    return sum(isinstance(obj, n.SQLNode) for obj in gc.get_objects())
+
+
+def test_no_nodes_are_retained():
+    before = count_nodes()
+    during = []
+    assert parse_events(SQL, on_node=lambda event: during.append(count_nodes())) == 2
+    assert max(during) > before
+    assert count_nodes() == before
+
+
+def test_profile_limits_events():
+    types = set()
+    parse_events(SQL, on_node=lambda e: types.add(e.type), profile="tables-only")
+    assert types == {"SQLTable"}
+
+
+def test_fast_events_collect_no_triples(monkeypatch):
+    triples = []
+    monkeypatch.setattr(ParsingContext, "add_triple", lambda self, *triple: triples.append(triple))
+    ids = ", ".join(str(i) for i in range(40))
+    types = set()
+    assert parse_events(f"SELECT a FROM t WHERE id IN ({ids})", on_node=lambda e: types.add(e.type), fast=True) == 1
+    assert "SQLLiteralList" in types
+    assert triples == []
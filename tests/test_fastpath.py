@@ -0,0 +1,97 @@
+import pytest
+from sqlflow.parser import parse_sql
+from sqlflow.fastpath import ColumnBatch, LiteralSummary, collapse_sql, simple_column_token
+
+
+@pytest.fixture
+def setup_in_list_query():
+    return "SELECT a FROM t WHERE id IN (" + ", ".join(str(i) for i in range(-5, 45)) + ") AND b = 4"
+
+
+@pytest.fixture
+def setup_wide_query():
+    items = [f"t.c{i}" for i in range(300)] + ["COUNT(*) AS n", "CASE WHEN a > 1 THEN 'x' END AS k", "u.v w"]
+    return "SELECT " + ", ".join(items) + " FROM t"
+
+
+def flatten(node):
+    rows = [(node.type, node.name, node.level)]
+    for child in node.children:
+        rows.extend(flatten(child))
+    return rows
+
+
+def test_collapse_sql_summarizes_literal_lists(setup_in_list_query):
+    sql, collapsed = collapse_sql(setup_in_list_query)
+    [(placeholder, summary)] = collapsed.items()
+
+    assert sql == f"SELECT a FROM t WHERE id IN ({placeholder}) AND b = 4"
+    assert (summary.count, summary.type, summary.minimum, summary.maximum) == (50, "integer", -5, 44)
+    assert summary.sample == ["-5", "-4", "-3", "-2", "-1"]
+
+
+def test_collapse_sql_keeps_short_and_mixed_lists():
+    assert collapse_sql("SELECT a FROM t WHERE id IN (1, 2, 3)")[1] == {}
+    assert collapse_sql("SELECT a FROM t WHERE id IN (1, 'x', 3)", literal_threshold=2)[1] == {}
+    assert collapse_sql("SELECT f(a, b, c) FROM t", literal_threshold=2)[1] == {}
+
+
+def test_collapse_sql_keeps_wide_function_arguments():
+    arguments = ", ".join(str(i) for i in range(20))
+    sql = f"SELECT GREATEST({arguments}) FROM t WHERE (id, x) NOT IN (({arguments}))"
+    assert collapse_sql(sql) == (sql, {})
+    assert len(collapse_sql(f"SELECT a FROM t WHERE id NOT IN ({arguments})")[1]) == 1
+
+    sql = f"SELECT GREATEST({arguments}) FROM t"
+    [(default_tree, _)] = parse_sql(sql)
+    [(fast_tree, fast_context)] = parse_sql(sql, fast=True)
+    assert flatten(fast_tree.root)[1:] == flatten(default_tree.root)[1:]
+    assert not any("__sqlflow_list" in part for triple in fast_context.triples for part in triple)
+
+
+def test_collapse_sql_summarizes_values_rows():
+    sql, collapsed = collapse_sql("INSERT INTO t (a, b) VALUES " + ", ".join(f"({i}, 'v{i}')" for i in range(20)) + ";")
+    [summary] = collapsed.values()
+
+    assert sql.endswith("VALUES (__sqlflow_list_0__);")
+    assert summary.count == 20 and summary.type == "(integer, string)"
+
+
+def test_collapse_sql_batches_wide_select(setup_wide_query):
+    sql, collapsed = collapse_sql(setup_wide_query)
+    [batch] = collapsed.values()
+
+    assert sql == "SELECT __sqlflow_list_0__ FROM t"
+    assert isinstance(batch, ColumnBatch)
+    assert len(batch.items) == 303 and batch.items[-1] == "u.v w"
+
+
+def test_simple_column_token_matches_sqlparse():
+    token = simple_column_token("t.c AS x")
+    assert (token.get_parent_name(), token.get_real_name(), token.get_alias()) == ("t", "c", "x")
+    assert simple_column_token("COUNT(*)") is None
+    assert simple_column_token("date") is None
+
+
+def test_fast_parse_bounds_literal_lists(setup_in_list_query):
+    [(tree, context)] = parse_sql(setup_in_list_query, fast=True)
+    [literal_list] = [node for node in tree.root.children if node.type == "SQLLiteralList"]
+
+    assert isinstance(literal_list.summary, LiteralSummary)
+    assert literal_list.name == "50 integer literals [-5 .. 44]"
+    assert (literal_list.uri, "has_count", "50") in context.triples
+    assert literal_list.to_dict()["summary"]["count"] == 50
+
+
+def test_fast_parse_matches_default_for_wide_select(setup_wide_query):
+    [(default_tree, default_context)] = parse_sql(setup_wide_query)
+    [(fast_tree, fast_context)] = parse_sql(setup_wide_query, fast=True)
+
+    assert flatten(fast_tree.root)[1:] == flatten(default_tree.root)[1:]
+    assert len(fast_context.triples) == len(default_context.triples)
+
+
+def test_fast_parse_handles_statements_past_sqlparse_limits():
+    sql = "SELECT a FROM t WHERE id IN (" + ", ".join(str(i) for i in range(20000)) + ")"
+    [(tree, _)] = parse_sql(sql, fast=True)
+    assert sum(1 for _ in flatten(tree.root)) < 20
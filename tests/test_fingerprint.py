@@ -0,0 +1,48 @@
+import pytest
+from sqlflow.fingerprint import normalize_query, fingerprint, group_queries, parse_unique
+
+
+@pytest.fixture
+def setup_queries():
+    return [
+        "SELECT * FROM visits WHERE patient_id = 'a1'",
+        "select *  from VISITS where patient_id = 'b2' -- retry",
+        "SELECT * FROM visits WHERE patient_id IN (1, 2, 3)",
+        "SELECT * FROM visits WHERE patient_id IN (4)",
+        "SELECT name FROM providers"
+    ]
+
+
+def test_normalize_query_replaces_literals():
+    normalized = normalize_query("SELECT a FROM t WHERE b = 'x''y' AND c > 10.5 AND d = :param")
+    assert normalized == "SELECT a FROM t WHERE b = ? AND c > ? AND d = ?"
+
+
+def test_normalize_query_canonicalizes_case_and_whitespace():
+    assert normalize_query("select  P.Name\nFROM   Patients P") == normalize_query("SELECT p.name FROM patients p")
+
+
+def test_normalize_query_collapses_in_lists():
+    assert normalize_query("SELECT a FROM t WHERE b IN (1, 2, 3)") == "SELECT a FROM t WHERE b IN ( ?+ )"
+    assert "IN ( SELECT" in normalize_query("SELECT a FROM t WHERE b IN (SELECT c FROM u)")
+
+
+def test_fingerprint_ignores_literal_values():
+    assert fingerprint("SELECT a FROM t WHERE id = 1") == fingerprint("SELECT a FROM t WHERE id = 2")
+    assert fingerprint("SELECT a FROM t WHERE id = 1") != fingerprint("SELECT b FROM t WHERE id = 1")
+
+
+def test_group_queries_counts_shapes(setup_queries):
+    shapes = list(group_queries(setup_queries).values())
+
+    assert [shape.count for shape in shapes] == [2, 2, 1]
+    assert shapes[0].representative == setup_queries[0]
+
+
+def test_parse_unique_parses_one_representative_per_shape(setup_queries):
+    results = parse_unique(setup_queries)
+
+    assert len(results) == 3
+    shape, tree, context = results[0]
+    assert (tree.root.uri, "has_occurrences", "2") in context.triples
+    assert (tree.root.uri, "has_fingerprint", shape.fingerprint) in context.triples
@@ -1,4 +1,5 @@
 import pytest
+from sqlparse import sql
 from sqlparse.tokens import Keyword, Token
 from sqlflow.nodes import (
     SQLNode,
@@ -97,3 +98,29 @@ def test_sql_cte_initialization():
 def test_sql_query_initialization():
     query_node = SQLQuery(Token(Keyword, 'SELECT'))
     assert query_node.type == 'SQLQuery'
+
+
+def test_keyword_nodes_share_flyweight_metadata():
+    first = SQLKeyword(sql.Token(Keyword, 'FROM'))
+    second = SQLKeyword(sql.Token(Keyword, 'FROM'))
+    assert first._meta is second._meta
+    assert first.uri == second.uri == 'sqlkeyword:////from'
+    assert first is not second and first.id != second.id
+
+
+def test_node_attributes_resolve_lazily():
+    node = SQLTable(sql.Token(Keyword, 'my_table'))
+    assert node._id is None and node._name is None
+    assert node.name == 'my_table'
+    assert node.parent == ' ' and node.alias == ' '
+    assert node.uri == 'sqltable:////my_table'
+
+    node.alias = 't'
+    assert node.uri == 'sqltable:///t/my_table'
+
+
+def test_flyweight_is_dropped_when_metadata_is_overridden():
+    node = SQLLiteral(sql.Token(Keyword, '42'))
+    node.name = 'answer'
+    assert node.uri == 'sqlliteral:////answer'
+    assert SQLLiteral(sql.Token(Keyword, '42')).uri == 'sqlliteral:////42'
@@ -1,9 +1,13 @@
+import re
+import sys
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from sqlparse.tokens import Keyword
 from sqlparse.sql import Token
-from sqlflow.parser import SQLTree
+from sqlflow.parser import SQLTree, parse_many, parse_sql
+from sqlflow.replay import load_corpus_queries
 from sqlflow.context import ParsingContext
-from sqlflow.nodes import SQLNode
+from sqlflow.nodes import CHILDREN, SQLNode
 
 
 @pytest.fixture
@@ -66,3 +70,62 @@ def test_get_handler_key_with_invalid_token(setup_context):
     handler_key = tree.get_handler_key(token, setup_context)
 
     assert handler_key is not None
+
+
+def canonical_results(results):
+    """Trees and triples of parse results with per-node uuids masked out"""
+    def mask(value):
+        return re.sub(r"[0-9a-f]{8}-[0-9a-f-]{27}", "UUID", value)
+
+    def walk(node):
+        return (node.type, node.name, node.level, mask(node.uri), [walk(child) for child in node.children])
+
+    return [
+        [(walk(tree.root), sorted(tuple(mask(str(part)) for part in triple) for triple in context.triples))
+         for tree, context in result]
+        for result in results
+    ]
+
+
+def test_parse_many_matches_sequential_parsing_under_contention():
+    queries = load_corpus_queries()[:120]
+    expected = canonical_results([parse_sql(sql) for sql in queries])
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # force frequent thread switches mid-parse
+    try:
+        results = parse_many(queries, max_workers=8)
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert canonical_results(results) == expected
+
+
+def test_parse_many_accepts_running_executor():
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = parse_many(["SELECT a FROM t", "SELECT b FROM u; SELECT c FROM v"], executor=pool)
+
+    assert [len(result) for result in results] == [1, 2]
+    assert results[1][1][0].root.children[-1].name == "v"
+
+
+def test_lazy_parse_defers_nested_bodies():
+    sql = "SELECT UPPER(p.name) AS n FROM patients p JOIN (SELECT patient_id FROM visits WHERE cost > 3) v ON v.patient_id = p.patient_id"
+    [(tree, context)] = parse_sql(sql, lazy=True)
+    feature, derived = [node for node in CHILDREN.__get__(tree.root) if node.type in ("SQLFeature", "SQLSubquery")]
+    assert not feature.expanded and not derived.expanded
+    assert CHILDREN.__get__(derived) == []
+
+    before = len(context.triples)
+    body, alias = derived.children
+    assert alias.name == "v"
+    assert derived.expanded and not body.expanded
+    assert "visits" in [child.name for child in body.children]
+    assert len(context.triples) > before
+    assert not feature.expanded
+
+
+def test_lazy_parse_matches_eager_once_expanded():
+    queries = load_corpus_queries()[:60]
+    lazy = [[(tree.expand(), context) for tree, context in parse_sql(sql, lazy=True)] for sql in queries]
+    assert canonical_results(lazy) == canonical_results([parse_sql(sql) for sql in queries])
@@ -0,0 +1,52 @@
+import pytest
+from sqlflow.prefilter import (
+    PrefilterIndex,
+    confirm,
+    find_references,
+    query_name_hashes,
+    name_hash
+)
+
+
+@pytest.fixture
+def setup_queries():
+    return [
+        "SELECT v.visit_id FROM visits v WHERE v.visit_date > '2021-01-01';",
+        "SELECT p.name AS visits FROM patients p;",
+        "SELECT 'visits' FROM patients -- visits\n;",
+        "SELECT * FROM labs WHERE visit_id IN (SELECT visit_id FROM public.Visits);",
+        "SELECT COUNT(*) FROM providers;"
+    ]
+
+
+def test_lexical_pass_skips_literals_and_comments():
+    hashes = query_name_hashes("SELECT 'visits' FROM \"Patients\" -- visits\n")
+    assert name_hash("patients") in hashes
+    assert name_hash("visits") not in hashes
+    assert hashes == sorted(set(hashes))
+
+
+def test_candidates_are_a_superset_of_matches(setup_queries):
+    index = PrefilterIndex.build(setup_queries)
+    assert index.candidates(["visits"]) == [0, 1, 3]
+    assert index.candidates(["labs", "visits"], match="all") == [3]
+    assert index.mentions(4, "PROVIDERS")
+
+    matches, stats = find_references(setup_queries, tables=["visits"], index=index)
+    assert matches == [0, 3]
+    assert stats["candidates"] == 3
+    assert stats["false_positive_rate"] == pytest.approx(1 / 3)
+
+
+def test_confirm_tables_and_columns(setup_queries):
+    assert confirm(setup_queries[0], columns=["visit_date"])
+    assert not confirm(setup_queries[1], tables=["visits"])
+    assert confirm(setup_queries[3], tables=["labs", "visits"], match="all")
+    assert not confirm(setup_queries[4], tables=["labs", "providers"], match="all")
+
+
+def test_save_and_load(setup_queries, tmp_path):
+    index = PrefilterIndex.build(setup_queries)
+    loaded = PrefilterIndex.load(index.save(tmp_path / "queries.prefilter"))
+    assert len(loaded) == len(setup_queries)
+    assert loaded.candidates(["patients"]) == index.candidates(["patients"])
@@ -0,0 +1,84 @@
+import pytest
+from sqlparse.sql import Token
+from sqlparse.tokens import Keyword
+from sqlflow.context import ParsingContext
+from sqlflow.handlers.base import HandlerType, KeywordHandler
+from sqlflow.nodes import SQLNode
+from sqlflow.parser import parse_sql
+from sqlflow.profiles import ExtractionProfile, get_profile
+
+
+@pytest.fixture
+def setup_query():
+    return """
+    WITH recent AS (SELECT v.patient_id FROM visits v JOIN labs l ON v.visit_id = l.visit_id WHERE v.cost > 10),
+    active AS (SELECT patient_id FROM encounters)
+    SELECT p.name, COUNT(*) AS n
+    FROM patients p
+    JOIN recent r ON p.patient_id = r.patient_id
+    JOIN active a ON a.patient_id = p.patient_id
+    WHERE p.age > 30 AND p.id = (SELECT MAX(id) FROM providers)
+    GROUP BY p.name
+    """
+
+
+def node_types(root):
+    types, stack = [], [root]
+    while stack:
+        node = stack.pop()
+        types.append(node.type)
+        stack.extend(node.children)
+    return types
+
+
+def table_names(root):
+    stack, names = [root], []
+    while stack:
+        node = stack.pop()
+        if node.type == "SQLTable":
+            names.append(node.name)
+        stack.extend(node.children)
+    return sorted(names)
+
+
+def test_get_profile_resolves_names_and_sets():
+    assert get_profile() is None
+    assert get_profile("full", max_depth=2).max_depth == 2
+    assert get_profile("tables-only").handler_types == {HandlerType.TABLE}
+    assert get_profile({HandlerType.COLUMN}).name == "custom"
+    with pytest.raises(ValueError):
+        get_profile("everything")
+
+
+def test_tables_only_keeps_every_table(setup_query):
+    [(full, _)] = parse_sql(setup_query)
+    [(tables, context)] = parse_sql(setup_query, profile="tables-only")
+
+    assert set(node_types(tables.root)) == {"SQLQuery", "SQLTable"}
+    assert table_names(tables.root) == table_names(full.root)
+    assert all(predicate == "has_SQLTable" for _, predicate, _ in context.triples)
+
+
+def test_lineage_keeps_ctes_and_relationships(setup_query):
+    [(tree, _)] = parse_sql(setup_query, profile="lineage")
+    types = set(node_types(tree.root))
+
+    assert {"SQLCTE", "SQLRelationship", "SQLTable"} <= types
+    assert not types & {"SQLKeyword", "SQLColumn", "SQLLiteral", "SQLOperator"}
+
+
+def test_custom_profile_and_max_depth(setup_query):
+    [(columns, _)] = parse_sql(setup_query, profile={HandlerType.COLUMN})
+    assert set(node_types(columns.root)) == {"SQLQuery", "SQLColumn"}
+
+    [(shallow, _)] = parse_sql(setup_query, profile="tables-only", max_depth=0)
+    assert table_names(shallow.root) == ["active a", "patients p", "recent r"]
+
+
+def test_excluded_keyword_still_tracks_context():
+    context = ParsingContext(profile=ExtractionProfile({HandlerType.TABLE}))
+    parent = SQLNode(Token(Keyword, "ROOT"))
+    KeywordHandler().handle(Token(Keyword, "FROM"), parent, None, context)
+
+    assert parent.children == []
+    assert context.last_keyword.value == "FROM"
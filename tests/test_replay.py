@@ -0,0 +1,77 @@
+import json
+import asyncio
+import pytest
+from sqlflow.server import ParseServer
+from sqlflow.replay import (
+    HttpTarget,
+    InProcessTarget,
+    load_log,
+    percentile,
+    replay,
+    run_replay,
+    synthetic_arrivals
+)
+
+
+@pytest.fixture
+def setup_log(tmp_path):
+    path = tmp_path / "queries.jsonl"
+    records = [
+        {"ts": "2024-01-01T00:00:02", "sql": "SELECT b FROM t"},
+        {"ts": "2024-01-01T00:00:00", "sql": "SELECT a FROM t"},
+        {"ts": "2024-01-01T00:00:04", "sql": "SELECT c FROM t"}
+    ]
+    path.write_text("\n".join(json.dumps(record) for record in records))
+    return path
+
+
+def test_percentile():
+    assert percentile([], 0.5) is None
+    assert percentile(list(range(1, 101)), 0.99) == 99
+    assert percentile([5.0], 0.5) == 5.0
+
+
+def test_load_log_sorts_and_rescales(setup_log):
+    arrivals = load_log(setup_log)
+    assert [sql for _, sql in arrivals] == ["SELECT a FROM t", "SELECT b FROM t", "SELECT c FROM t"]
+    assert [offset for offset, _ in arrivals] == [0.0, 2.0, 4.0]
+
+    assert [offset for offset, _ in load_log(setup_log, speed=4.0)] == [0.0, 0.5, 1.0]
+    assert load_log(setup_log, target_qps=10)[-1][0] == pytest.approx(0.2)
+
+
+def test_load_log_rejects_records_without_timestamp(setup_log):
+    setup_log.write_text(setup_log.read_text() + "\n\n" + json.dumps({"sql": "SELECT d FROM t"}))
+    with pytest.raises(ValueError, match=r"queries.jsonl:5"):
+        load_log(setup_log)
+
+
+def test_synthetic_arrivals_are_deterministic():
+    first = synthetic_arrivals(["SELECT 1", "SELECT 2"], qps=100, count=50, seed=3)
+    assert first == synthetic_arrivals(["SELECT 1", "SELECT 2"], qps=100, count=50, seed=3)
+    assert [offset for offset, _ in synthetic_arrivals(["SELECT 1"], 10, 3, process="uniform")] == pytest.approx([0.0, 0.1, 0.2])
+
+
+def test_replay_in_process_reports_percentiles():
+    arrivals = synthetic_arrivals(["SELECT a FROM t WHERE b = 1"], qps=200, count=20)
+    report = run_replay(arrivals, InProcessTarget(concurrency=2), sample_interval=0.01)
+
+    assert report["completed"] == 20 and report["errors"] == 0
+    assert report["latency_ms"]["p50"] <= report["latency_ms"]["p99"] <= report["latency_ms"]["max"]
+    assert report["timeline"] and report["max_in_flight"] >= 1
+
+
+def test_replay_against_local_endpoint():
+    async def scenario():
+        server = ParseServer(port=0, workers=1)
+        await server.start()
+        try:
+            host, port = server.address
+            arrivals = synthetic_arrivals(["SELECT a FROM t", "SELECT b FROM u"], qps=100, count=10)
+            return await replay(arrivals, HttpTarget(host=host, port=port), sample_interval=0.01)
+        finally:
+            await server.close()
+
+    report = asyncio.run(scenario())
+    assert report["completed"] == 10
+    assert report["errors"] == 0
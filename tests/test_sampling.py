@@ -0,0 +1,61 @@
+import random
+
+import pytest
+from sqlflow.sampling import METRICS, Metric, reservoir_sample, sample_analysis, size_bucket
+
+
+WINDOW = "SELECT patient_id, ROW_NUMBER() OVER (PARTITION BY patient_id ORDER BY visit_date) AS n FROM visits"
+JOIN = "SELECT p.patient_id FROM patients p JOIN visits v ON v.patient_id = p.patient_id"
+PLAIN = "SELECT patient_id FROM patients"
+
+
+@pytest.fixture
+def setup_queries():
+    queries = [WINDOW] * 30 + [JOIN] * 50 + [PLAIN] * 120
+    random.Random(3).shuffle(queries)
+    return queries
+
+
+def test_reservoir_sample_is_bounded_and_counts_strata():
+    reservoirs, counts = reservoir_sample(range(1000), 10, random.Random(1), key=lambda position, item: item % 2)
+    assert counts == {0: 500, 1: 500}
+    assert all(len(items) == 10 for items in reservoirs.values())
+    assert all(item % 2 == stratum for stratum, items in reservoirs.items() for _, item in items)
+    assert len({item for items in reservoirs.values() for _, item in items}) == 20
+
+
+def test_size_buckets_grow_by_four():
+    assert [size_bucket(size) for size in (1, 3, 4, 15, 16, 10 ** 9)] == [0, 0, 1, 1, 2, 7]
+
+
+def test_estimates_cover_true_values(setup_queries):
+    covered = 0
+    for seed in range(20):
+        report = sample_analysis(setup_queries, precision=0.1, batch_size=20, min_sample=40, seed=seed)
+        assert report.precise
+        assert report.parsed < len(setup_queries)
+        window, joins = report["uses_window"], report["join_count"]
+        covered += window.low <= 30 / 200 <= window.high and joins.low <= 50 / 200 <= joins.high
+    assert covered >= 15  # two 95% intervals each time
+
+
+def test_exhausted_population_is_exact(setup_queries):
+    metrics = [Metric("uses_window", METRICS[0].function, "proportion")]
+    report = sample_analysis(setup_queries, metrics, strata="size", precision=0.0, batch_size=50, seed=2)
+    assert report.parsed == 200
+    assert report["uses_window"].value == pytest.approx(30 / 200)
+    assert report["uses_window"].half_width == pytest.approx(0, abs=1e-12)
+    assert sum(stratum["population"] for stratum in report.strata.values()) == 200
+
+
+def test_stream_source_uses_reservoir(setup_queries):
+    report = sample_analysis(iter(setup_queries), strata=lambda position, sql: "JOIN" in sql, max_sample=40, seed=4)
+    assert report.population == 200
+    assert {name: stratum["population"] for name, stratum in report.strata.items()} == {"False": 150, "True": 50}
+    assert all(stratum["sampled"] <= 40 for stratum in report.strata.values())
+    assert report.parsed == sum(stratum["sampled"] for stratum in report.strata.values())
+
+
+def test_file_strata_need_an_index(setup_queries):
+    with pytest.raises(ValueError):
+        sample_analysis(setup_queries, strata="file")
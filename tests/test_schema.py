@@ -0,0 +1,50 @@
+import pytest
+from sqlflow.schema import parse_schema, load_schema, infer_foreign_keys
+
+
+@pytest.fixture
+def setup_schema_sql():
+    return """
+    -- Table: patients
+    CREATE TABLE patients (
+        patient_id UUID PRIMARY KEY,
+        first_name TEXT,
+        score NUMERIC(5, 2)
+    );
+
+    CREATE TABLE visits (
+        visit_id UUID PRIMARY KEY,
+        patient_id UUID,
+        visit_date DATE
+    );
+
+    CREATE TABLE patient_visit (
+        patient_id UUID,
+        visit_id UUID,
+        PRIMARY KEY (patient_id, visit_id)
+    );
+    """
+
+
+def test_parse_schema(setup_schema_sql):
+    tables = parse_schema(setup_schema_sql)
+
+    assert list(tables) == ["patients", "visits", "patient_visit"]
+    assert tables["patients"].columns == {"patient_id": "UUID", "first_name": "TEXT", "score": "NUMERIC"}
+    assert tables["patients"].primary_key == ("patient_id",)
+    assert tables["patient_visit"].primary_key == ("patient_id", "visit_id")
+    assert "primary" not in tables["patient_visit"].columns
+
+
+def test_infer_foreign_keys(setup_schema_sql):
+    edges = infer_foreign_keys(parse_schema(setup_schema_sql))
+
+    assert ("visits", "patient_id", "patients") in edges
+    assert ("patient_visit", "visit_id", "visits") in edges
+    assert not any(table == referenced for table, _, referenced in edges)
+
+
+def test_load_packaged_schema():
+    tables = load_schema()
+    assert "patients" in tables
+    assert tables["visits"].columns["visit_date"] == "DATE"
@@ -0,0 +1,129 @@
+import os
+import json
+import signal
+import asyncio
+from sqlflow.server import ParseServer, parse_query, parse_batch
+
+
+async def http_request(address, method, path, payload=None):
+    host, port = address
+    reader, writer = await asyncio.open_connection(host, port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+        + body
+    )
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, response_body = raw.partition(b"\r\n\r\n")
+    status = int(head.split(b" ")[1])
+    return status, json.loads(response_body)
+
+
+def run_with_server(scenario, **kwargs):
+    async def runner():
+        server = ParseServer(port=0, workers=1, **kwargs)
+        await server.start()
+        try:
+            return await scenario(server)
+        finally:
+            await server.close()
+    return asyncio.run(runner())
+
+
+def test_parse_query_returns_tree_and_triples():
+    result = parse_query("SELECT a FROM my_table")
+    assert result["error"] is None
+    assert len(result["statements"]) == 1
+    assert result["statements"][0]["tree"]["type"] == "SQLQuery"
+    assert len(result["statements"][0]["triples"]) > 0
+
+
+def test_parse_query_reports_errors():
+    result = parse_query(None)
+    assert result["statements"] == []
+    assert result["error"] is not None
+
+
+def test_parse_batch_preserves_order():
+    results = parse_batch([("SELECT a FROM t1", False, True), ("SELECT b FROM t2", True, False)])
+    assert "tree" not in results[0]["statements"][0]
+    assert "triples" not in results[1]["statements"][0]
+
+
+def test_health_and_metrics_endpoints():
+    async def scenario(server):
+        submitted = []
+        server.pool.submit = lambda *args, **kwargs: submitted.append(args)  # health checks must not queue work
+        health = await http_request(server.address, "GET", "/health")
+        metrics = await http_request(server.address, "GET", "/metrics")
+        del server.pool.submit
+        assert submitted == []
+        return health, metrics
+
+    (health_status, health), (metrics_status, metrics) = run_with_server(scenario)
+    assert health_status == 200 and health["status"] == "ok"
+    assert metrics_status == 200 and metrics["queue_depth"] == 0
+
+
+def test_parse_endpoint_micro_batches_queries():
+    queries = [f"SELECT col_{i} FROM table_{i}" for i in range(8)]
+
+    async def scenario(server):
+        response = await http_request(server.address, "POST", "/parse", {"queries": queries, "tree": False})
+        _, metrics = await http_request(server.address, "GET", "/metrics")
+        return response, metrics
+
+    (status, payload), metrics = run_with_server(scenario, batch_size=8, batch_timeout=0.05)
+    assert status == 200
+    assert len(payload["results"]) == len(queries)
+    assert all(result["error"] is None for result in payload["results"])
+    assert metrics["queries_total"] == len(queries)
+    assert metrics["batches_total"] < len(queries)
+
+
+def test_parse_endpoint_applies_backpressure():
+    async def scenario(server):
+        for batcher in server.batchers:  # nothing drains the queue
+            batcher.cancel()
+        server.enqueue("SELECT 1")
+        saturated = await http_request(server.address, "POST", "/parse", {"queries": ["SELECT 1"] * 2})
+        oversized = await http_request(server.address, "POST", "/parse", {"queries": ["SELECT 1"] * 3})
+        return saturated, oversized
+
+    (saturated_status, saturated), (oversized_status, oversized) = run_with_server(scenario, queue_size=2)
+    assert saturated_status == 503 and saturated["queue_depth"] == 1
+    assert oversized_status == 413 and "error" in oversized
+
+
+def test_parse_endpoint_rejects_bad_requests():
+    async def scenario(server):
+        bad_body = await http_request(server.address, "POST", "/parse", {"query": "SELECT 1"})
+        bad_path = await http_request(server.address, "GET", "/nope")
+        return bad_body, bad_path
+
+    (bad_body_status, _), (bad_path_status, _) = run_with_server(scenario)
+    assert bad_body_status == 400
+    assert bad_path_status == 404
+
+
+def test_health_reports_broken_pool_until_restarted():
+    async def scenario(server):
+        os.kill(next(iter(server.pool._processes)), signal.SIGKILL)
+        statuses = []
+        for _ in range(200):
+            status, health = await http_request(server.address, "GET", "/health")
+            statuses.append((status, health["status"]))
+            if status == 200 and len(statuses) > 1:
+                break
+            await asyncio.sleep(0.05)
+        response = await http_request(server.address, "POST", "/parse", {"sql": "SELECT a FROM t"})
+        _, metrics = await http_request(server.address, "GET", "/metrics")
+        return statuses, response, metrics
+
+    statuses, (status, payload), metrics = run_with_server(scenario)
+    assert (503, "restarting") in statuses
+    assert statuses[-1] == (200, "ok")
+    assert status == 200 and payload["results"][0]["error"] is None
+    assert metrics["pool_restarts_total"] == 1
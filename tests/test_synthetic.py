@@ -0,0 +1,46 @@
+import sqlite3
+import pytest
+from sqlflow import utils as u
+from sqlflow.parser import parse_sql
+from sqlflow.synthetic import TemplateQueryGenerator
+
+
+@pytest.fixture
+def setup_generator():
+    return TemplateQueryGenerator(seed=42)
+
+
+@pytest.fixture
+def setup_database():
+    connection = sqlite3.connect(":memory:")
+    connection.executescript(u.get_package_file("data/healthcare/schema.sql").read_text())
+    return connection
+
+
+def test_generate_is_deterministic(setup_generator):
+    assert setup_generator.generate(3) == TemplateQueryGenerator(seed=42).generate(3)
+    assert setup_generator.generate(3) != TemplateQueryGenerator(seed=43).generate(3)
+    assert setup_generator.generate(3) != setup_generator.generate(4)
+
+
+def test_size_parameters_control_shape(setup_generator):
+    sql = setup_generator.generate(0, joins=3, ctes=2, depth=2, width=5, in_list=7, unions=1)
+
+    assert sql.count("UNION ALL") == 1
+    assert sql.startswith("WITH cte_0 AS (") and "cte_1 AS (" in sql
+    assert sql.count(" ON ") >= 2 * (3 + 2)
+    assert sql.count("(SELECT ") == 2 * 2
+
+
+def test_wide_select_lists(setup_generator):
+    sql = setup_generator.generate(0, joins=0, width=500)
+    assert "AS col_499" in sql
+
+
+def test_generated_queries_are_valid(setup_generator, setup_database):
+    queries = setup_generator.generate_many(
+        100, joins=(0, 4), ctes=(0, 3), depth=(0, 3), width=(1, 30), in_list=(0, 10), unions=(0, 2)
+    )
+    for sql in queries:
+        setup_database.execute("EXPLAIN " + sql)
+        assert len(parse_sql(sql)) == 1
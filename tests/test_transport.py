@@ -0,0 +1,54 @@
+import pickle
+import pytest
+from multiprocessing import shared_memory
+from sqlflow.parser import parse_sql
+from sqlflow.transport import SharedParseResult, parse_to_segment, parse_many_shared
+
+
+@pytest.fixture
+def setup_queries():
+    return [
+        "SELECT a, b FROM t1 JOIN t2 ON t1.id = t2.id WHERE a > 1",
+        "SELECT c FROM t3; SELECT d FROM t4",
+        None
+    ]
+
+
+def test_segment_round_trip_matches_parse(setup_queries):
+    descriptor = pickle.loads(pickle.dumps(parse_to_segment(setup_queries)))
+
+    with SharedParseResult(descriptor) as result:
+        statements = result.materialize()
+
+    tree, context = parse_sql(setup_queries[0])[0]
+    assert [statement["query"] for statement in statements] == [0, 1, 1]
+    assert len(statements[0]["triples"]) == len(context.triples)
+    assert statements[0]["nodes"][0][:3] == ("SQLQuery", -1, 0)
+    assert [row[0] for row in statements[0]["nodes"][1:3]] == [child.type for child in tree.root.children[:2]]
+    assert 2 in descriptor.errors
+
+
+def test_views_are_zero_copy(setup_queries):
+    descriptor = parse_to_segment(setup_queries)
+    with SharedParseResult(descriptor) as result:
+        assert isinstance(result.nodes, memoryview)
+        assert result.nodes.obj is result.triples.obj
+        assert len(result.nodes) == 5 * descriptor.n_nodes
+
+
+def test_close_unlinks_segment(setup_queries):
+    descriptor = parse_to_segment(setup_queries)
+    SharedParseResult(descriptor).close()
+
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=descriptor.name)
+
+
+def test_parse_many_shared_preserves_order():
+    queries = [f"SELECT col_{i} FROM table_{i}" for i in range(6)]
+    columns = []
+    for result in parse_many_shared(queries, processes=1, chunk_size=4):
+        for statement in range(len(result)):
+            columns.extend(row[3] for row in result.statement_node_rows(statement) if row[0] == "SQLColumn")
+
+    assert columns == [f"col_{i}" for i in range(6)]
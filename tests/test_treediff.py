@@ -0,0 +1,68 @@
+import pytest
+from sqlflow.parser import parse_sql
+from sqlflow.treediff import UUID_PATTERN, diff_sql, diff_trees, merkle_hashes
+
+
+QUERY = """WITH RecentVisits AS (
+    SELECT v.patient_id, v.visit_date FROM visits v
+    JOIN patients p ON v.patient_id = p.patient_id
+    WHERE v.visit_date > '2020-01-01'
+),
+Labs AS (SELECT patient_id FROM lab_results)
+SELECT r.patient_id, d.n
+FROM RecentVisits r
+JOIN (SELECT patient_id, COUNT(*) AS n FROM diagnoses GROUP BY patient_id) d ON r.patient_id = d.patient_id
+WHERE r.patient_id IN (SELECT patient_id FROM Labs)"""
+
+
+@pytest.fixture
+def setup_trees():
+    return parse_sql(QUERY)[0], parse_sql(QUERY)[0]
+
+
+def test_identical_trees_have_equal_hashes_and_no_changes(setup_trees):
+    (old, old_context), (new, new_context) = setup_trees
+    assert merkle_hashes(old.root)[id(old.root)] == merkle_hashes(new.root)[id(new.root)]
+    diff = diff_trees(old, new, old_context.triples, new_context.triples)
+    assert not diff
+    assert diff.visited == 1
+    assert diff.skipped == len(merkle_hashes(old.root))
+
+
+def test_changes_are_located_by_node_class_and_scope():
+    new = QUERY.replace("v.patient_id = p.patient_id", "v.patient_id = p.id").replace("FROM diagnoses", "FROM procedures")
+    diff = diff_sql(QUERY, new)
+    assert [str(change) for change in diff.changes] == [
+        "SQLRelationship changed in CTE RecentVisits: v.patient_id = p.patient_id -> v.patient_id = p.id",
+        "SQLTable changed in subquery d: diagnoses -> procedures",
+    ]
+    assert diff.summary() == {"changed SQLRelationship": 1, "changed SQLTable": 1}
+    assert diff.triples_added and diff.triples_removed
+    assert not any(UUID_PATTERN.search(part) for triple in diff.triples_added + diff.triples_removed for part in triple)
+
+
+def test_reordered_added_and_moved_nodes():
+    new = QUERY.replace("Labs AS (SELECT patient_id FROM lab_results)", "Labs AS (SELECT patient_id FROM lab_results),\nDoctors AS (SELECT doctor_id FROM doctors)")
+    assert [str(change) for change in diff_sql(QUERY, new).changes] == ["SQLCTE added: Doctors AS (SELECT doctor_id FROM doctors)"]
+
+    old = "SELECT a.id FROM a JOIN (SELECT id FROM b WHERE y = 2) d ON a.id = d.id WHERE a.z = 1"
+    new = "SELECT a.id FROM a JOIN (SELECT id FROM b WHERE a.z = 1) d ON a.id = d.id WHERE y = 2"
+    assert sorted(str(change) for change in diff_sql(old, new).changes) == [
+        "SQLSegment moved from subquery d to top level: y = 2",
+        "SQLSegment moved from top level to subquery d: a.z = 1",
+    ]
+
+    old = "WITH A AS (SELECT id FROM visits), B AS (SELECT id FROM labs) SELECT * FROM A JOIN B ON A.id = B.id"
+    new = "WITH B AS (SELECT id FROM labs), A AS (SELECT id FROM visits) SELECT * FROM A JOIN B ON A.id = B.id"
+    diff = diff_sql(old, new)
+    assert [change.kind for change in diff.changes] == ["moved"]
+    assert diff.changes[0].type == "SQLCTE"
+
+
+def test_statements_are_diffed_in_order():
+    diff = diff_sql("SELECT a FROM t; SELECT b FROM u", "SELECT a FROM t2; SELECT b FROM u; SELECT c FROM v")
+    assert [str(change) for change in diff.changes] == [
+        "SQLTable changed in statement 1: t -> t2",
+        "SQLQuery added in statement 3: SELECT c FROM v",
+    ]
+    assert diff.to_dict()["summary"] == {"changed SQLTable": 1, "added SQLQuery": 1}
@@ -0,0 +1,92 @@
+import json
+
+import pytest
+from sqlflow.triplestore import MANIFEST_NAME, BloomFilter, Segment, TripleStore, write_segment
+
+
+def batch(start, size=20):
+    return [(f"sqlquery://q{i}", "has_SQLTable", f"sqltable:////t{i % 7}") for i in range(start, start + size)] + [
+        (f"sqlquery://q{i}", "has_SQLColumn", f"sqlcolumn:////c{i % 3}") for i in range(start, start + size)
+    ]
+
+
+@pytest.fixture
+def setup_store(tmp_path):
+    store = TripleStore(tmp_path / "triples", fanout=2, background=False)
+    for start in range(0, 50, 10):
+        store.add(batch(start))
+    yield store
+    store.close()
+
+
+def test_bloom_filter_has_no_false_negatives():
+    keys = [f"key{i}" for i in range(1000)]
+    bloom = BloomFilter.build(keys)
+    assert all(key in bloom for key in keys)
+    assert sum(f"other{i}" in bloom for i in range(1000)) < 50
+
+
+def test_lookups_merge_and_deduplicate_segments(setup_store):
+    expected = set()
+    for start in range(0, 50, 10):
+        expected |= set(batch(start))
+    assert list(setup_store) == sorted(expected)
+    assert setup_store.by_subject("sqlquery://q15") == [
+        ("sqlquery://q15", "has_SQLColumn", "sqlcolumn:////c0"),
+        ("sqlquery://q15", "has_SQLTable", "sqltable:////t1"),
+    ]
+    assert setup_store.by_predicate("has_SQLTable") == sorted(t for t in expected if t[1] == "has_SQLTable")
+    assert setup_store.by_subject("sqlquery://missing") == []
+    assert ("sqlquery://q0", "has_SQLTable", "sqltable:////t0") in setup_store
+
+
+def test_compaction_merges_levels(setup_store):
+    # five batches, fanout 2: 0+0 -> 1, 0+0 -> 1, 1+1 -> 2, one batch left at level 0
+    assert setup_store.stats()["levels"] == {"0": 1, "2": 1}
+    assert setup_store.compact(full=True) == 1
+    [segment] = setup_store.snapshot()
+    assert len(segment) == len(list(setup_store)) == 120
+    assert segment.verify()
+
+
+def test_reopen_recovers_from_interrupted_writes(setup_store, tmp_path):
+    directory = setup_store.directory
+    before = list(setup_store)
+    setup_store.close()
+    write_segment(directory / "segment_99999999.seg", sorted(batch(1000)))  # flushed, but never recorded
+    (directory / (MANIFEST_NAME + ".tmp")).write_text("{\"version\": 1, \"segm")  # torn manifest write
+
+    with TripleStore(directory, background=False) as store:
+        assert list(store) == before
+        assert store.by_subject("sqlquery://q1000") == []
+        names = sorted(path.name for path in directory.iterdir())
+        assert names == sorted([MANIFEST_NAME] + [entry["name"] for entry in json.loads((directory / MANIFEST_NAME).read_text())["segments"]])
+
+
+def test_background_compaction(tmp_path):
+    with TripleStore(tmp_path, fanout=4) as store:
+        for start in range(0, 160, 10):
+            store.add(batch(start))
+        store.wait()
+        assert store.stats()["segments"] == 1
+        assert len(list(store)) == len(set().union(*(batch(start) for start in range(0, 160, 10))))
+    assert all(Segment(path).verify() for path in tmp_path.glob("*.seg"))
+
+
+def test_add_queries_stores_parsed_triples(tmp_path):
+    with TripleStore(tmp_path, background=False) as store:
+        added, errors = store.add_queries(["SELECT p.patient_id FROM patients p JOIN visits v ON v.patient_id = p.patient_id"])
+        assert added and errors == 0
+        tables = store.by_predicate("has_SQLTable")
+        assert {obj for _, _, obj in tables} == {"sqltable:////patients_p", "sqltable:////visits_v"}
+
+
+def test_merged_segments_are_closed_after_their_last_reader(setup_store):
+    before = setup_store.snapshot()
+    reading = iter(setup_store)
+    first = next(reading)
+    setup_store.compact(full=True)
+    assert all(segment.path.exists() for segment in before)  # still being read
+    assert [first, *reading] == list(setup_store)
+    assert not any(segment.path.exists() for segment in before)
+    assert all(segment._map is None for segment in before)
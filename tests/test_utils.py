@@ -1,3 +1,5 @@
+import logging
+
 import pytest
 import hashlib
 from sqlflow.utils import (
@@ -9,6 +11,7 @@ from sqlflow.utils import (
     normalize_sql,
     clean_tokens
 )
+from sqlflow.parser import parse_sql
 from sqlparse.sql import Token
 from sqlparse.tokens import Keyword
 
@@ -19,10 +22,16 @@ def setup_token():
 
 
 def test_log_parsing_step(caplog, setup_token):
+    caplog.set_level(logging.DEBUG, logger="sqlflow")
     log_parsing_step("Test log", setup_token, level=2)
     assert "Test log: SQLKeyword -> None SELECT [UID: sqlkeyword://None/SELECT/None]" in caplog.text
 
 
+def test_no_debug_records_by_default(caplog):
+    parse_sql("SELECT p.patient_id FROM patients p WHERE p.age > 30")
+    assert not [record for record in caplog.records if record.levelno < logging.INFO]
+
+
 def test_get_node_parent(setup_token):
     class MockNode:
         pass
@@ -0,0 +1,123 @@
+import json
+import numpy as np
+import pytest
+from sqlflow.parser import parse_sql
+from sqlflow.vectorize import (
+    SequenceEncoder,
+    SequenceShards,
+    SequenceShardWriter,
+    TreeVectorizer,
+    count_token_features,
+    export_sequences
+)
+
+
+SQL = """
+SELECT v.patient_id, MAX(v.visit_date) AS last_visit,
+       CASE WHEN COUNT(d.diagnosis_id) > 2 THEN 'High' ELSE 'Low' END AS risk,
+       ROW_NUMBER() OVER (PARTITION BY v.patient_id ORDER BY v.visit_date) AS rn
+FROM visits v
+JOIN diagnoses d ON v.visit_id = d.visit_id
+WHERE v.patient_id IN (SELECT patient_id FROM patients)
+GROUP BY v.patient_id
+"""
+
+
+@pytest.fixture
+def setup_trees():
+    return [tree for tree, _ in parse_sql(SQL + ";\nSELECT a FROM t")]
+
+
+@pytest.fixture
+def setup_vectorizer():
+    return TreeVectorizer(n_buckets=16)
+
+
+def test_feature_names_are_stable(setup_vectorizer):
+    names = setup_vectorizer.feature_names
+    assert len(names) == setup_vectorizer.n_features
+    assert names == TreeVectorizer(n_buckets=16).feature_names
+    assert names[0] == "count_SQLNode"
+    assert "table_hash_15" in names and "column_hash_0" in names
+
+
+def test_later_node_types_are_appended(setup_vectorizer):
+    names = setup_vectorizer.feature_names
+    # columns as first released: counts of the original node classes, then structural features and hashes
+    assert names.index("n_nodes") == 12 and names.index("column_hash_15") == 12 + 9 + 2 * 16 - 1
+    assert names[-1] == "count_SQLLiteralList"
+    sql = "SELECT a FROM t WHERE id IN (" + ", ".join(str(i) for i in range(20)) + ")"
+    row = dict(zip(names, setup_vectorizer.transform([parse_sql(sql, fast=True)[0][0]])[0]))
+    assert row["count_SQLLiteralList"] == 1
+
+
+def test_transform_shape_and_counts(setup_trees, setup_vectorizer):
+    matrix = setup_vectorizer.transform(setup_trees)
+    names = setup_vectorizer.feature_names
+    row = dict(zip(names, matrix[0]))
+
+    assert matrix.shape == (2, setup_vectorizer.n_features)
+    assert row["count_SQLQuery"] == 1
+    assert row["n_joins"] == 1
+    assert row["n_windows"] == 1
+    assert row["n_case"] == 1
+    assert row["n_aggregates"] == 2
+    assert row["n_distinct_tables"] == 2
+    assert sum(matrix[0, names.index("table_hash_0"):names.index("column_hash_0")]) == 2
+
+
+def test_transform_is_deterministic(setup_trees, setup_vectorizer):
+    first = setup_vectorizer.transform(setup_trees)
+    second = TreeVectorizer(n_buckets=16).transform(setup_trees)
+    assert np.array_equal(first, second)
+
+
+def test_count_token_features(setup_trees):
+    assert count_token_features(setup_trees[1].root.token) == (0, 0, 0)
+
+
+def test_save_writes_npy_and_columns(tmp_path, setup_trees, setup_vectorizer):
+    matrix = setup_vectorizer.transform(setup_trees)
+    setup_vectorizer.save(matrix, tmp_path / "features.npy")
+
+    assert np.array_equal(np.load(tmp_path / "features.npy"), matrix)
+    with open(tmp_path / "features.columns.json") as f:
+        assert json.load(f) == setup_vectorizer.feature_names
+    loaded, names = TreeVectorizer.load(tmp_path / "features.npy")
+    assert np.array_equal(loaded, matrix) and names == setup_vectorizer.feature_names
+
+
+def test_sequence_encoding_is_pre_order(setup_trees):
+    encoder = SequenceEncoder(n_names=64)
+    sequence = encoder.encode(setup_trees[1])
+    root = setup_trees[1].root
+
+    assert sequence.dtype == np.int32 and sequence.shape[1] == 3
+    assert list(sequence[0]) == [encoder.type_index["SQLQuery"], 0, 0]
+    assert list(sequence[:, 1]) == [0, 1, 1, 1, 1]
+    assert sequence[1, 0] == encoder.type_index[root.children[0].type]
+    assert 0 < sequence[2, 2] <= 64
+    assert np.array_equal(sequence, SequenceEncoder(n_names=64).encode(setup_trees[1]))
+
+
+def test_shards_round_trip_with_mmap(tmp_path, setup_trees):
+    encoder = SequenceEncoder()
+    sequences = [encoder.encode(tree) for tree in setup_trees]
+    with SequenceShardWriter(tmp_path, shard_size=len(sequences[0])) as writer:
+        for tree in setup_trees:
+            writer.add(tree)
+
+    shards = SequenceShards(tmp_path)
+    assert len(shards) == 2
+    assert shards.manifest["shards"] == ["shard_00000.npy", "shard_00001.npy"]
+    assert isinstance(shards.shard(0), np.memmap)
+    for i, sequence in enumerate(sequences):
+        assert np.array_equal(shards[i], sequence)
+    assert len(shards.sample(5, seed=0)) == 2
+
+
+def test_export_sequences_tags_statements_with_queries(tmp_path):
+    export_sequences(["SELECT a FROM t; SELECT b FROM u", "SELECT c FROM v"], tmp_path, shard_size=1000)
+    shards = SequenceShards(tmp_path)
+    assert [shards.query(i) for i in range(len(shards))] == [0, 0, 1]
+    assert len(shards.manifest["shards"]) == 1
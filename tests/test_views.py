@@ -0,0 +1,63 @@
+import pytest
+from sqlflow.advisor import ColumnResolver
+from sqlflow.parser import parse_sql
+from sqlflow.schema import load_schema
+from sqlflow.views import JoinGraphMiner, join_graph
+
+
+THREE_WAY = """
+SELECT p.gender, d.diagnosis_code
+FROM patients p
+JOIN visits v ON v.patient_id = p.patient_id
+JOIN diagnoses d ON d.visit_id = v.visit_id
+WHERE v.visit_date > '2020-01-01'
+"""
+TWO_WAY = "SELECT p.gender, v.visit_date FROM visits v JOIN patients p ON p.patient_id = v.patient_id"
+OTHER = "SELECT c.claim_id FROM claims c JOIN visits v ON v.visit_id = c.visit_id"
+
+
+@pytest.fixture
+def setup_miner():
+    miner = JoinGraphMiner()
+    miner.add_many([THREE_WAY, THREE_WAY.replace("2020", "2021"), (TWO_WAY, 2), OTHER])
+    return miner
+
+
+def test_join_graph_edges_and_columns():
+    [(tree, _)] = parse_sql(THREE_WAY)
+    edges, columns = join_graph(tree, ColumnResolver(load_schema()))
+    assert edges == {
+        (("patients", "patient_id"), ("visits", "patient_id")),
+        (("diagnoses", "visit_id"), ("visits", "visit_id")),
+    }
+    assert {("patients", "gender"), ("visits", "visit_date")} <= columns
+
+
+def test_identical_graphs_are_merged(setup_miner):
+    assert setup_miner.queries == 4
+    assert len(setup_miner.graphs) == 3
+    assert len(setup_miner._shapes) == 3
+
+
+def test_mining_supports(setup_miner):
+    supports = {tuple(pattern.tables): pattern.support for pattern in setup_miner.mine(min_support=1)}
+    assert supports == {
+        ("patients", "visits"): 4,
+        ("diagnoses", "visits"): 2,
+        ("diagnoses", "patients", "visits"): 2,
+        ("claims", "visits"): 1,
+    }
+    assert [pattern.tables for pattern in setup_miner.mine(min_support=3)] == [["patients", "visits"]]
+
+
+def test_view_candidates(setup_miner):
+    candidates = setup_miner.candidates(min_support=2)
+    # equal scores (support x joins): 4 x 1 and 2 x 2
+    assert [candidate.name for candidate in candidates] == ["mv_diagnoses_patients_visits", "mv_patients_visits"]
+    three_way, two_way = candidates
+    assert (two_way.support, two_way.n_queries, two_way.queries) == (4, 3, [0, 1, 2])
+    assert three_way.queries == [0, 1]
+    assert "JOIN visits ON diagnoses.visit_id = visits.visit_id" in three_way.sql
+    assert "JOIN patients ON patients.patient_id = visits.patient_id" in three_way.sql
+    assert "diagnoses.diagnosis_code AS diagnoses__diagnosis_code" in three_way.sql
+    assert "claims" not in three_way.sql